@@ -0,0 +1,219 @@
+"""
+Excel Benchmark
+Measures how writing, reloading and status-updating output workbooks scale with
+the number of rows. Runs headless (no Outlook, browser or Excel needed).
+
+Usage:
+    python benchmarks/bench_excel.py                      # 1k, 10k and 100k rows
+    python benchmarks/bench_excel.py --sizes 1000 5000
+    python benchmarks/bench_excel.py --compare benchmarks/results/<earlier>.json
+    python benchmarks/bench_excel.py --sizes 1000 --openpyxl-load   # also time a full openpyxl load
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import openpyxl
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extractor import workbook_reader  # noqa: E402
+from extractor.excel_writer import (  # noqa: E402
+    ExcelWriter, MOVE_TO_FOLDER_OPTIONS, TAKE_ACTION_REVIEW, TAKE_ACTION_VALIDATION,
+)
+from extractor.parser import FIELDS, RESOLVED_LINK_COLUMNS  # noqa: E402
+from extractor.workbook_reader import WorkbookReader  # noqa: E402
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+# Share of rows in the Review sheet (the rest go to Validation)
+REVIEW_SHARE = 0.3
+
+WORDS = ("power", "sensor", "automotive", "module", "design", "controller", "industrial",
+         "solutions", "systems", "electronics", "motor", "drive", "battery", "charging")
+COMPANIES = ("Robert Bosch GmbH", "Acme Industrial Ltd", "Nordic Drives AB", "Müller Elektronik KG",
+             "Shenzhen Power Tech Co", "TU München", "Freelancer", "Continental AG")
+STATUSES = ("Not Started", "University Contact", "Excluded Domain", "Freemail", "Mass Market")
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def _link(rng: random.Random, host: str) -> str:
+    token = "".join(rng.choice("abcdef0123456789") for _ in range(32))
+    return f"https://{host}/e/er?s=1&lid={rng.randint(1000, 99999)}&elqTrackId={token}"
+
+
+def make_frames(rows: int, seed: int = 42):
+    """Synthetic Validation and Review DataFrames shaped like parser output."""
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 5, 8, 0, 0)
+    records = []
+    for i in range(rows):
+        company = rng.choice(COMPANIES)
+        domain = company.split()[0].lower().replace("ü", "ue") + ".com"
+        record = {field: "" for field in FIELDS}
+        record.update({
+            "Subject": "Pre-MQL ready for " + ("review" if i < rows * REVIEW_SHARE else "validation"),
+            "Sender": "noreply@marketing.example.com",
+            "ReceivedTime": (start + timedelta(minutes=7 * i)).strftime("%Y-%m-%d %H:%M:%S"),
+            "EntryID": f"{i:0>140X}",
+            "First Name": rng.choice(("Anna", "Luca", "Wei", "Sara", "Jonas")),
+            "Last Name": rng.choice(("Schmidt", "Rossi", "Chen", "Novak", "Berg")),
+            "Email Address": f"user{i}@{domain}",
+            "Company": company,
+            "Pages Viewed": _sentence(rng, 25),
+            "Country": rng.choice(("Germany", "Italy", "China", "Sweden", "United States")),
+            "Lead Triggering Activities": _sentence(rng, 12),
+            "Lead Lifecycle ID": f"{rng.getrandbits(80):020X}-{rng.randint(1, 6)}",
+            "PreMQL review/validation link": _link(rng, "s1234.t.eloqua.com"),
+            "Eloqua Profiler": _link(rng, "profiler.eloqua.com"),
+            "URL Of Form": f"https://www.example.com/forms/{rng.randint(1, 50)}",
+            "Initial Call Notes": _sentence(rng, 40),
+            "Status": rng.choice(STATUSES),
+            "Company Domain Validation": rng.choice(("Match", "Mismatch", "Freemail")),
+            "Domain Resolvable": rng.choice(("Yes", "Yes", "No", "Unknown")),
+            "Sold-to-Party Name": rng.choice(("", company.upper())),
+        })
+        for col, final_col in RESOLVED_LINK_COLUMNS.items():
+            record[final_col] = record[col].replace("/e/er", "/landing")
+        records.append(record)
+
+    df = pd.DataFrame(records)
+    is_review = df["Subject"].str.contains("review")
+    df_validation, df_review = df[~is_review].copy(), df[is_review].copy()
+    df_validation["Take Action"] = [rng.choice(TAKE_ACTION_VALIDATION + [""]) for _ in range(len(df_validation))]
+    df_review["Take Action"] = [rng.choice(TAKE_ACTION_REVIEW + [""]) for _ in range(len(df_review))]
+    for frame in (df_validation, df_review):
+        frame["Move to Folder"] = [rng.choice(MOVE_TO_FOLDER_OPTIONS + [""]) for _ in range(len(frame))]
+    return df_validation, df_review
+
+
+def _timed(func):
+    gc.collect()
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def _peak_memory(func):
+    """Peak traced allocation (bytes) while running func (timed separately, untraced)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_size(rows: int, directory: str, load_workbook: bool = False) -> dict:
+    df_validation, df_review = make_frames(rows)
+    path = os.path.join(directory, f"bench_{rows}.xlsx")
+    writer = ExcelWriter()
+
+    def write():
+        writer.write_workbook(df_validation.copy(), df_review.copy(), path)
+
+    _, write_s = _timed(write)
+    write_peak = _peak_memory(write)
+    result = {
+        "rows": rows,
+        "write_s": write_s,
+        "write_peak_mb": round(write_peak / 2**20, 1),
+        "file_mb": round(os.path.getsize(path) / 2**20, 2),
+    }
+
+    # Reload both sheets the way the automation tools do (cold cache)
+    def reload():
+        workbook_reader._CACHE.clear()
+        return WorkbookReader(path).sheets()
+
+    _, result["reload_s"] = _timed(reload)
+    _, result["reload_cached_s"] = _timed(lambda: WorkbookReader(path).sheets())
+
+    # Form/move status for every row of both sheets, written in one pass
+    def update_status():
+        reader = WorkbookReader(path)
+        status = reader.status_writer()
+        status.set_many("Validation", "Form Submission Status", {i: "✓ Success" for i in range(len(df_validation))})
+        status.set_many("Review", "Email Move Status", {i: "✓ Moved" for i in range(len(df_review))})
+        return reader.save_status(status)
+
+    _, result["status_update_s"] = _timed(update_status)
+
+    # Full openpyxl load, as the tools did before status patching (slow: ~90 s at 10k rows)
+    if load_workbook:
+        _, result["openpyxl_load_s"] = _timed(lambda: openpyxl.load_workbook(path).close())
+
+    for key in ("write_s", "reload_s", "reload_cached_s", "status_update_s", "openpyxl_load_s"):
+        if key in result:
+            result[key] = round(result[key], 4)
+    os.remove(path)
+    return result
+
+
+def print_table(results, baseline=None):
+    columns = ["rows", "write_s", "write_peak_mb", "file_mb", "reload_s", "reload_cached_s",
+               "status_update_s", "openpyxl_load_s"]
+    base = {r["rows"]: r for r in (baseline or [])}
+    print("\n" + "  ".join(f"{c:>16}" for c in columns))
+    for result in results:
+        cells = []
+        for c in columns:
+            value = result.get(c, "")
+            previous = base.get(result["rows"], {}).get(c)
+            if c != "rows" and previous and value != "":
+                value = f"{value} ({value / previous:.2f}x)"
+            cells.append(f"{value:>16}")
+        print("  ".join(cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Excel output writing and status updates.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Row counts to benchmark")
+    parser.add_argument("--output", help="Results JSON file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", help="Earlier results JSON to compare against")
+    parser.add_argument("--openpyxl-load", action="store_true", help="Also time a full openpyxl load")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in args.sizes:
+            print(f"Benchmarking {rows} rows...")
+            results.append(bench_size(rows, directory, load_workbook=args.openpyxl_load))
+
+    print_table(results, baseline)
+
+    output = args.output or os.path.join(RESULTS_DIR, datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "openpyxl": openpyxl.__version__,
+            "platform": platform.platform(),
+            "results": results,
+        }, f, indent=2)
+    print(f"\n✓ Results saved to: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+SAP Search Plan Benchmark
+Counts the SAP queries SearchPlan needs per company for the company names of
+past output workbooks, against one query per candidate search. Runs offline:
+SAP answers are simulated, each query returning its complete result list.
+
+Usage:
+    python benchmarks/bench_sap_plan.py                  # companies in output/
+    python benchmarks/bench_sap_plan.py --output <dir>
+    python benchmarks/bench_sap_plan.py --show 20        # also list the 20 costliest companies
+"""
+import argparse
+import os
+import sys
+from collections import Counter
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extractor.lead_history import output_workbooks, read_history_sheets  # noqa: E402
+from extractor.sap_http import ResultPage, ResultRow  # noqa: E402
+from extractor.sap_search_plan import SearchPlan, matches  # noqa: E402
+
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "output")
+
+
+def company_names(output_dir: str) -> list:
+    """Distinct Company values of the output workbooks, in first-seen order."""
+    names = {}
+    for path in output_workbooks(output_dir):
+        try:
+            frames = read_history_sheets(path, ["Company"])
+        except Exception as e:
+            print(f"  ⚠ Skipping {os.path.basename(path)}: {e}")
+            continue
+        for frame in frames.values():
+            if "Company" in frame.columns:
+                for name in frame["Company"].dropna():
+                    names.setdefault(str(name).strip(), None)
+    return [name for name in names if name]
+
+
+def round_trips(plan: SearchPlan, registered: str = None) -> int:
+    """Queries plan.resolve() sends when SAP holds one Approved registration for the
+    End Customer Name registered (None: no registration at all)."""
+    rows = [ResultRow(datetime(2024, 1, 1), "Approved", "SOLD-TO", registered)] if registered else []
+    count = 0
+
+    def fetch_rows(query):
+        nonlocal count
+        count += 1
+        return ResultPage([row for row in rows if matches(query, row.customer)], False)
+
+    def search_one(search):
+        nonlocal count
+        count += 1
+        return "SOLD-TO" if any(matches(search, row.customer) for row in rows) else None
+
+    plan.resolve(fetch_rows, search_one)
+    return count
+
+
+def summarize(label: str, counts: list) -> None:
+    counts = sorted(counts)
+    mean = sum(counts) / len(counts)
+    print(f"  {label:<34} mean {mean:5.2f}   median {counts[len(counts) // 2]:3d}   max {counts[-1]:3d}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count SAP queries per company for the search plan.")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT_DIR, help="Folder with past output workbooks")
+    parser.add_argument("--show", type=int, default=0, help="List the N companies needing the most queries")
+    args = parser.parse_args()
+
+    names = company_names(args.output)
+    plans = [(name, SearchPlan(name)) for name in names]
+    plans = [(name, plan) for name, plan in plans if plan.searches]
+    if not plans:
+        print("No company names found")
+        return
+    print(f"{len(plans)} distinct company names from {args.output}\n")
+
+    misses = [round_trips(plan) for _, plan in plans]
+    print("No registration (every candidate is tried):")
+    summarize("one query per candidate", [len(plan.searches) for _, plan in plans])
+    summarize("search plan", misses)
+    print("Registered under the full name:")
+    summarize("one query per candidate", [1 for _ in plans])
+    summarize("search plan", [round_trips(plan, plan.searches[0].term) for _, plan in plans])
+
+    broad = Counter(len(plan.broad) for _, plan in plans)
+    print("\nBroad queries per company: " + ", ".join(f"{n}: {broad[n]}" for n in sorted(broad)))
+
+    if args.show:
+        print("\nMost queries without a registration:")
+        ranked = sorted(zip(misses, plans), key=lambda item: -item[0])[:args.show]
+        for count, (name, plan) in ranked:
+            print(f"  {count:3d}  {name[:45]:<45} broad: {[q.term for q in plan.broad]}")
+
+
+if __name__ == "__main__":
+    main()
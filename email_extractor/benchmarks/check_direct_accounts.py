@@ -0,0 +1,57 @@
+"""
+Direct Account Matching Check
+Runs lead validation against a small direct-account list and checks which
+company spellings are rejected (exact match), flagged for the reviewer
+(containment or typo) or left valid.
+
+Usage:
+    python benchmarks/check_direct_accounts.py
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extractor.validation_data import ValidationDataLoader  # noqa: E402
+
+ACCOUNTS = ["bosch", "siemens", "infineon technologies", "continental", "delta electronics"]
+
+REJECTED, FLAGGED, VALID = "Direct Account", "Possible Direct Account", "Valid"
+
+CASES = [
+    ("Bosch", REJECTED),
+    ("Bosch GmbH", REJECTED),
+    ("Infineon Technologies AG", REJECTED),
+    ("Robert Bosch", FLAGGED),
+    ("Robert Bosch GmbH", FLAGGED),
+    ("Bosch Rexroth AG", FLAGGED),
+    ("Siemns AG", FLAGGED),
+    ("Infinion Technologies", FLAGGED),
+    ("Continetal AG", FLAGGED),
+    ("Acme Industrial Solutions", VALID),
+    ("Ford Foundation", VALID),
+]
+
+
+def run_checks() -> bool:
+    failures = 0
+    with tempfile.TemporaryDirectory() as folder:
+        with open(os.path.join(folder, "direct_accounts.csv"), "w", encoding="utf-8") as f:
+            f.write("Option Values\n" + "\n".join(ACCOUNTS) + "\n")
+        loader = ValidationDataLoader(folder)
+
+        print("\nDirect accounts:")
+        for company, expected in CASES:
+            result = loader.validate_lead(company, "Germany", "lead@example.com")
+            ok = result["validation_type"] == expected
+            failures += 0 if ok else 1
+            detail = "" if ok else f": expected {expected}, got {result['validation_type']} ({result['reason']})"
+            print(f"  {'✓' if ok else '✗'} {company} -> {expected}{detail}")
+
+    print(f"\n{'✓ All checks passed' if not failures else f'✗ {failures} check(s) failed'}")
+    return not failures
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_checks() else 1)
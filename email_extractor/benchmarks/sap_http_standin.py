@@ -0,0 +1,190 @@
+"""
+SAP CRM HTTP Stand-in
+Serves recorded Design Registration pages (benchmarks/sap_pages) from a local
+server that answers like the CRM search form, and checks SAPHttpSearch and
+parse_result_page against it. Run before enabling SAP_HTTP_SEARCH in main.py.
+
+Usage:
+    python benchmarks/sap_http_standin.py                   # run the checks
+    python benchmarks/sap_http_standin.py --pages <folder>  # checks against other recordings
+    python benchmarks/sap_http_standin.py --serve 8765      # only serve the pages
+
+Pages saved from the real CRM (e.g. the sap_results.html written by SAPCRMLookup)
+can replace the files in the pages folder as long as the names are kept:
+    result_one_page.html                       one page of results for "Acme Industrial Solutions"
+    result_pages_1/2/3.html                    three pages for "Bosch" (Forward link on 1 and 2)
+    result_pages_sorted_1.html                 first page for "Bosch" sorted by Registration Date, newest first
+    no_result.html                             any other search term
+    session_expired.html                       answer to requests without the SSO ticket
+"""
+import argparse
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extractor.sap_http import SAPHttpSearch, SearchTemplate, latest_approved, parse_result_page  # noqa: E402
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sap_pages")
+
+SSO_COOKIE = "MYSAPSSO2"
+
+# Search form as SAPCRMLookup.capture_search_template() returns it for the Design Registration search
+VALUE_FIELD = "C17_W58_V59_V61_search_parameters[1].VALUE1"
+OPERATOR_FIELD = "C17_W58_V59_V61_search_parameters[1].OPERATOR__key"
+SEARCH_ONCLICK = ("return htmlbSubmitLib('htmlb',this,'thtmlb:link:click:0','myFormId',"
+                  "'C17_W58_V59_V61_Searchbtn','SEARCH_BTN',0);")
+
+
+def search_template(base_url: str) -> SearchTemplate:
+    fields = [
+        ("crmFrwScrollXPos", "0"),
+        ("crmFrwScrollYPos", "0"),
+        ("C17_W58_V59_V61_search_parameters[1].FIELD", "END_CUSTOMER_NAME"),
+        (OPERATOR_FIELD, "EQ"),
+        (VALUE_FIELD, ""),
+        ("thtmlbKeyboardFocusId", ""),
+    ]
+    return SearchTemplate(base_url + "/sap(bD1lbiZjPTEwMCZkPW1pbg==)/bc/bsp/sap/crm_ui_frame/BSPWDApplication.do",
+                          fields, VALUE_FIELD, OPERATOR_FIELD, SEARCH_ONCLICK)
+
+
+class StandinServer:
+    """Answers search, sort and Forward events with the recorded pages (one search state per server)."""
+
+    def __init__(self, pages_dir: str = PAGES_DIR, port: int = 0):
+        self.pages_dir = pages_dir
+        self.posts = []
+        self._state = {"term": "", "page": 1, "sorted": False}
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                form = dict(parse_qsl(self.rfile.read(length).decode("utf-8"), keep_blank_values=True))
+                standin.posts.append((form, self.headers.get("Cookie", "")))
+                body = standin.respond(form, self.headers.get("Cookie", ""))
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.end_headers()
+                self.wfile.write(body.encode("utf-8"))
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def page(self, name: str) -> str:
+        with open(os.path.join(self.pages_dir, name + ".html"), encoding="utf-8") as f:
+            return f.read()
+
+    def respond(self, form: dict, cookie: str) -> str:
+        if f"{SSO_COOKIE}=" not in cookie:
+            return self.page("session_expired")
+        state = self._state
+        event = form.get("htmlbevt_id", "")
+        if event == "SEARCH_BTN":
+            state.update(term=form.get(VALUE_FIELD, "").lower(), page=1, sorted=False)
+        elif event == "SORT_REGDATE":
+            state.update(page=1, sorted=True)
+        elif event == "PAGE_FORWARD":
+            state["page"] += 1
+
+        if state["term"] == "acme industrial solutions":
+            return self.page("result_one_page")
+        if state["term"] == "bosch":
+            if state["sorted"] and state["page"] == 1:
+                return self.page("result_pages_sorted_1")
+            return self.page(f"result_pages_{min(state['page'], 3)}")
+        return self.page("no_result")
+
+    def start(self) -> None:
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def run_checks(pages_dir: str) -> bool:
+    standin = StandinServer(pages_dir)
+    standin.start()
+    failures = 0
+
+    def check(label: str, ok: bool, detail="") -> None:
+        nonlocal failures
+        print(f"  {'✓' if ok else '✗'} {label}" + (f": {detail}" if not ok and detail != "" else ""))
+        failures += 0 if ok else 1
+
+    try:
+        ticket = [{"name": SSO_COOKIE, "value": "standin-ticket", "domain": "127.0.0.1", "path": "/"}]
+        search = SAPHttpSearch(search_template(standin.url), ticket, timeout=5)
+
+        print("One page:")
+        page = search.search("Acme Industrial Solutions", "CP")
+        form, cookie = standin.posts[-1]
+        check("search value and operator posted", form.get(VALUE_FIELD) == "Acme Industrial Solutions"
+              and form.get(OPERATOR_FIELD) == "CP", form)
+        check("Search event posted", form.get("htmlbevt_id") == "SEARCH_BTN" and form.get("htmlbevt_oid")
+              == "C17_W58_V59_V61_Searchbtn" and form.get("htmlbevt_frm") == "myFormId", form)
+        check("other form fields kept", form.get("C17_W58_V59_V61_search_parameters[1].FIELD") == "END_CUSTOMER_NAME")
+        check("SSO ticket sent", f"{SSO_COOKIE}=standin-ticket" in cookie, cookie)
+        check("result list parsed", page is not None and len(page.rows) == 3 and not page.has_next_page, page)
+        check("End Customer Name read", page is not None and page.rows[0].customer == "Acme Industrial Solutions GmbH")
+        check("latest Approved", page is not None and latest_approved(page.rows) == "ARROW CENTRAL EUROPE GMBH",
+              page and latest_approved(page.rows))
+
+        print("Several pages:")
+        page = search.search("Bosch", "CP")
+        check("Forward link seen", page is not None and page.has_next_page and "PAGE_FORWARD" in page.next_event, page)
+        check("sort event on Registration Date", page is not None and "SORT_REGDATE" in page.sort_event)
+        following = search.next_page("Bosch", "CP", page) if page else None
+        check("next page read", following is not None and following.has_next_page
+              and following.rows[0].registration_date.year == 2022, following)
+        last = search.next_page("Bosch", "CP", following) if following else None
+        check("disabled Forward link on last page", last is not None and not last.has_next_page, last)
+        newest = search.search_newest_first("Bosch", "CP")
+        check("sorted newest first", newest is not None and newest.newest_first, newest)
+        check("latest Approved from sorted page", newest is not None and latest_approved(newest.rows)
+              == "ROBERT BOSCH GMBH", newest and latest_approved(newest.rows))
+
+        print("No result:")
+        page = search.search("Nonexistent Company", "SW")
+        check("empty result list", page is not None and page.rows == [] and not page.has_next_page, page)
+        check("starts with operator posted", standin.posts[-1][0].get(OPERATOR_FIELD) == "SW")
+
+        print("Expired session:")
+        expired = SAPHttpSearch(search_template(standin.url), [], timeout=5)
+        check("logon page is not a result list", expired.search("Acme Industrial Solutions") is None)
+        check("logon page parses as None", parse_result_page(standin.page("session_expired")) is None)
+    finally:
+        standin.stop()
+
+    print(f"\n{'✓ All checks passed' if not failures else f'✗ {failures} check(s) failed'}")
+    return not failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the SAP HTTP search against recorded CRM pages.")
+    parser.add_argument("--pages", default=PAGES_DIR, help="Folder with the recorded pages")
+    parser.add_argument("--serve", type=int, metavar="PORT", help="Only serve the pages on this port")
+    args = parser.parse_args()
+
+    if args.serve is not None:
+        standin = StandinServer(args.pages, args.serve)
+        print(f"Serving recorded SAP pages at {standin.url} (Ctrl+C to stop)")
+        try:
+            standin.server.serve_forever()
+        except KeyboardInterrupt:
+            standin.server.server_close()
+        return
+
+    sys.exit(0 if run_checks(args.pages) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Batch Helpers
+Evaluate per-lead checks once per distinct key and broadcast the results back to rows.
+"""
+from typing import Callable, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+
+def text_column(values: Iterable, index: Optional[pd.Index] = None) -> pd.Series:
+    """Coerce a column-like input to a string Series ('' for missing values)."""
+    if isinstance(values, pd.Series):
+        series = values
+    else:
+        series = pd.Series(list(values), index=index, dtype=object)
+    return series.fillna("").astype(str)
+
+
+def evaluate_unique(keys: pd.DataFrame, func: Callable[..., Dict], columns: List[str]) -> pd.DataFrame:
+    """Call func(*key) once per distinct row of keys and broadcast the result dicts.
+
+    Args:
+        keys: One column per func argument, one row per lead.
+        func: Scalar check returning a dict with (at least) the given columns.
+        columns: Result keys to keep.
+
+    Returns:
+        DataFrame aligned with keys.index, one column per result key.
+    """
+    if keys.empty:
+        return pd.DataFrame(columns=columns, index=keys.index)
+
+    unique = keys.drop_duplicates().reset_index(drop=True)
+    results = [func(*key) for key in unique.itertuples(index=False, name=None)]
+    unique_results = pd.concat(
+        [unique, pd.DataFrame(results, columns=columns)],
+        axis=1,
+    )
+
+    merged = keys.merge(unique_results, on=list(keys.columns), how="left")
+    merged.index = keys.index
+    return merged[columns]
@@ -0,0 +1,82 @@
+"""
+Company Name Canonicalizer
+Produces every normalized form of a company name in one pass, behind an LRU cache.
+"""
+import functools
+import re
+import unicodedata
+from typing import NamedTuple, Tuple
+
+# Legal-form and filler words stripped from company names
+COMPANY_SUFFIXES = (
+    "gmbh", "ag", "se", "ltd", "limited", "inc", "corp", "corporation",
+    "llc", "plc", "sa", "srl", "bv", "nv", "kg", "ohg", "gbr",
+    "co", "company", "group", "holding", "holdings", "international",
+)
+COMPANY_SUFFIX_SET = frozenset(COMPANY_SUFFIXES)
+
+# Words that say nothing about which company is meant (SAP cache seeding, SAP broad searches)
+GENERIC_COMPANY_WORDS = frozenset({
+    "university", "universitat", "universita", "universidad", "universite", "college", "school", "student",
+    "private", "privat", "personal", "person", "individual", "self", "employed", "myown", "own", "home",
+    "freelance", "freelancer", "libero", "professionista", "consultant", "consulting", "none", "na", "test",
+    "unknown", "company", "electronic", "electronics", "engineering", "technology", "technologies",
+    "industry", "industries", "systems", "services", "solutions", "design", "research", "development",
+})
+
+CANONICAL_CACHE_SIZE = 8192
+
+_SUFFIX_RE = re.compile(r"\b(?:" + "|".join(COMPANY_SUFFIXES) + r")\b")
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+
+# German characters transliterated before accent stripping (ß would otherwise be dropped)
+_TRANSLITERATE = str.maketrans({
+    "ä": "a", "ö": "o", "ü": "u",
+    "Ä": "A", "Ö": "O", "Ü": "U",
+    "ß": "ss",
+})
+
+# Punctuation treated as word separators in SAP search terms
+_SEARCH_SEPARATORS = str.maketrans({ch: " " for ch in "()[]{},."})
+
+
+class CompanyForms(NamedTuple):
+    """Normalized forms of one company (or domain label) string."""
+    text: str                # ASCII lowercase words, single-spaced ("robert bosch gmbh")
+    compact: str             # text without legal suffixes and separators ("robertbosch")
+    tokens: Tuple[str, ...]  # words of text without legal suffixes
+    key: str                 # " ".join(tokens); stable key for indexes and caches
+    search: str              # original casing/accents without suffixes, for SAP searches
+
+
+def canonicalize(name) -> CompanyForms:
+    """Return all normalized forms of name (cached; None/NaN give empty forms)."""
+    if name is None or name != name:  # None or NaN
+        name = ""
+    return _canonicalize(str(name))
+
+
+@functools.lru_cache(maxsize=CANONICAL_CACHE_SIZE)
+def _canonicalize(name: str) -> CompanyForms:
+    ascii_text = unicodedata.normalize("NFKD", name.translate(_TRANSLITERATE))
+    ascii_text = ascii_text.encode("ascii", "ignore").decode("ascii").lower()
+    words = _NON_ALNUM_RE.sub(" ", ascii_text).split()
+    tokens = tuple(w for w in words if w not in COMPANY_SUFFIX_SET)
+
+    search_words = [
+        w for w in name.translate(_SEARCH_SEPARATORS).split()
+        if w.lower() not in COMPANY_SUFFIX_SET
+    ]
+
+    return CompanyForms(
+        text=" ".join(words),
+        compact=_NON_ALNUM_RE.sub("", _SUFFIX_RE.sub("", ascii_text)),
+        tokens=tokens,
+        key=" ".join(tokens),
+        search=" ".join(search_words),
+    )
+
+
+def cache_info():
+    """LRU statistics of the shared canonicalization cache."""
+    return _canonicalize.cache_info()
@@ -0,0 +1,263 @@
+"""
+Decision Index
+Recalls the reviewer decisions made for a company or email domain in past output
+workbooks, to prefill the input columns of new leads.
+"""
+import json
+import os
+import sqlite3
+import threading
+from collections import Counter
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+from .canonical import canonicalize
+from .domain_facts import domain_facts, email_domain
+from .lead_history import file_signature, output_workbooks, read_history_sheets
+
+# extractor/ -> email_extractor/cache/decision_index.sqlite3
+DEFAULT_DECISION_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "cache", "decision_index.sqlite3")
+
+# Input columns that make up a decision, per sheet
+DECISION_COLUMNS = {
+    "Validation": ["Take Action", "Valid Company → Reject Reason", "Invalid Company Reason",
+                   "Move to Folder", "Send to"],
+    "Review": ["Take Action", "Reject Reason", "Move to Folder", "Send to"],
+}
+
+# Marker written next to prefilled decisions; such rows are indexed only if the
+# reviewer changed the prefilled decision (see DecisionIndex.record_prefills)
+CONFIDENCE_COLUMN = "Prefill Confidence"
+
+# Rejections for these reasons are about the company, not the person, and can be reused
+COMPANY_REJECT_REASONS = {"University Contact", "Distribution Partner"}
+LEAD_REJECT_ACTIONS = {"Valid Company → Reject", "Reject"}
+
+# A decision is recalled when it is at least this share of the key's past decisions
+MIN_AGREEMENT = 0.75
+HIGH_CONFIDENCE_COUNT = 3
+
+INDEX_COLUMNS = (["EntryID", "ReceivedTime", "Company", "Email Address", CONFIDENCE_COLUMN]
+                 + sorted({c for cols in DECISION_COLUMNS.values() for c in cols}))
+
+# SQLite limits the number of bound parameters per statement
+_BATCH_SIZE = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    source    TEXT PRIMARY KEY,
+    signature TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS decisions (
+    source        TEXT NOT NULL,
+    source_mtime  INTEGER NOT NULL,
+    sheet         TEXT NOT NULL,
+    entry_id      TEXT,
+    company_key   TEXT,
+    domain        TEXT,
+    received_time TEXT,
+    decision      TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS decisions_source ON decisions(source);
+CREATE INDEX IF NOT EXISTS decisions_company ON decisions(sheet, company_key);
+CREATE INDEX IF NOT EXISTS decisions_domain ON decisions(sheet, domain);
+CREATE TABLE IF NOT EXISTS prefills (
+    sheet    TEXT NOT NULL,
+    entry_id TEXT NOT NULL,
+    decision TEXT NOT NULL,
+    PRIMARY KEY (sheet, entry_id)
+);
+"""
+
+
+class Recall(NamedTuple):
+    """Most common past decision for a lead's company or domain."""
+    decision: Dict[str, str]   # input column -> value
+    count: int                 # past leads with this decision
+    total: int                 # past decided leads for the key
+    key: str                   # "domain" or "company"
+    value: str                 # the domain or canonical company
+    last_seen: str             # ReceivedTime of the latest such lead
+
+    @property
+    def marker(self) -> str:
+        level = "High" if self.count >= HIGH_CONFIDENCE_COUNT else "Low"
+        when = f", last {self.last_seen[:10]}" if self.last_seen else ""
+        return f"{level} - {self.count}/{self.total} past decisions for {self.key} {self.value}{when}"
+
+
+def _text(value) -> str:
+    if value is None or (isinstance(value, float) and value != value):
+        return ""
+    return str(value).strip()
+
+
+def is_recallable(decision: Dict[str, str]) -> bool:
+    """True for company-level decisions (not rejections of one person's lead)."""
+    action = decision.get("Take Action", "")
+    if not action:
+        return False
+    if action in LEAD_REJECT_ACTIONS:
+        reason = decision.get("Valid Company → Reject Reason") or decision.get("Reject Reason") or ""
+        return reason in COMPANY_REJECT_REASONS
+    return True
+
+
+def decision_domain(email) -> str:
+    """Registered domain of an email address ('' if none)."""
+    domain = email_domain(email)
+    return domain_facts(domain).registered_domain if domain else ""
+
+
+class DecisionIndex:
+    """Past reviewer decisions by canonical company and email domain, per sheet.
+
+    refresh() indexes new or changed output workbooks. Copies of a workbook
+    ("... (2).xlsx") hold the same leads; each EntryID counts once, with the
+    decision from the most recently saved workbook.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: SQLite file; None uses DEFAULT_DECISION_PATH, ":memory:" for a throwaway index.
+        """
+        self.path = path or DEFAULT_DECISION_PATH
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    # Indexing
+    def refresh(self, output_dir: str) -> int:
+        """Index new or changed workbooks in output_dir; returns the number indexed."""
+        with self._lock:
+            known = dict(self._conn.execute("SELECT source, signature FROM sources"))
+
+        indexed = 0
+        for path in output_workbooks(output_dir):
+            source = os.path.basename(path)
+            signature = file_signature(path)
+            if known.get(source) == signature:
+                continue
+            try:
+                frames = read_history_sheets(path, INDEX_COLUMNS, DECISION_COLUMNS)
+            except Exception as e:
+                print(f"⚠ Could not index {source}: {e}")
+                continue
+            self._replace_source(source, signature, os.stat(path).st_mtime_ns, frames)
+            indexed += 1
+        return indexed
+
+    def _replace_source(self, source: str, signature: str, mtime: int, frames: Dict[str, pd.DataFrame]) -> None:
+        rows = []
+        for sheet, frame in frames.items():
+            columns = DECISION_COLUMNS[sheet]
+            prefills = self._prefills(sheet)
+            for record in frame.reindex(columns=INDEX_COLUMNS).to_dict("records"):
+                decision = {col: _text(record[col]) for col in columns if _text(record[col])}
+                # Prefilled by this index: only a reviewer's correction is a new decision
+                if _text(record[CONFIDENCE_COLUMN]) and prefills.get(_text(record["EntryID"]), decision) == decision:
+                    continue
+                if not is_recallable(decision):
+                    continue
+                rows.append((source, mtime, sheet, _text(record["EntryID"]),
+                             canonicalize(record["Company"]).key, decision_domain(record["Email Address"]),
+                             _text(record["ReceivedTime"]), json.dumps(decision, ensure_ascii=False)))
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM decisions WHERE source = ?", (source,))
+            self._conn.executemany(
+                "INSERT INTO decisions (source, source_mtime, sheet, entry_id, company_key, domain,"
+                " received_time, decision) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows,
+            )
+            self._conn.execute("INSERT OR REPLACE INTO sources (source, signature) VALUES (?, ?)",
+                               (source, signature))
+
+    # Prefills
+    def record_prefills(self, sheet: str, prefills: Dict[str, Dict[str, str]]) -> None:
+        """Remember the decisions prefilled per EntryID, so reviewer changes to them can be told apart."""
+        rows = [(sheet, entry_id, json.dumps(decision, ensure_ascii=False))
+                for entry_id, decision in prefills.items() if entry_id]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO prefills (sheet, entry_id, decision) VALUES (?, ?, ?)", rows)
+
+    def _prefills(self, sheet: str) -> Dict[str, Dict[str, str]]:
+        with self._lock:
+            return {entry_id: json.loads(decision) for entry_id, decision in self._conn.execute(
+                "SELECT entry_id, decision FROM prefills WHERE sheet = ?", (sheet,))}
+
+    # Recall
+    def _decisions(self, sheet: str, column: str, values: List[str]) -> Dict[str, List[Tuple[str, str]]]:
+        """value -> [(decision json, received_time)] with one entry per past lead."""
+        values = [v for v in dict.fromkeys(values) if v]
+        latest: Dict[Tuple[str, str], Tuple[int, str, str]] = {}
+        with self._lock:
+            for start in range(0, len(values), _BATCH_SIZE):
+                batch = values[start:start + _BATCH_SIZE]
+                marks = ",".join("?" * len(batch))
+                for value, entry_id, mtime, received, decision in self._conn.execute(
+                    f"SELECT {column}, entry_id, source_mtime, received_time, decision FROM decisions"
+                    f" WHERE sheet = ? AND {column} IN ({marks})", [sheet] + batch,
+                ):
+                    lead = (value, entry_id or f"{received}|{decision}")
+                    if lead not in latest or mtime > latest[lead][0]:
+                        latest[lead] = (mtime, decision, received)
+
+        found: Dict[str, List[Tuple[str, str]]] = {}
+        for (value, _), (_, decision, received) in latest.items():
+            found.setdefault(value, []).append((decision, received))
+        return found
+
+    def recall(self, df: pd.DataFrame, sheet: str,
+               skip_domain: Optional[Callable[[str], bool]] = None) -> List[Optional[Recall]]:
+        """Recalled decision per row of a sheet (None where there is no clear precedent).
+
+        The email domain is tried first, then the canonical company name. Domains
+        for which skip_domain returns True (e.g. freemail) are not used.
+        """
+        empty = pd.Series([""] * len(df))
+        domains = [decision_domain(e) for e in df.get("Email Address", empty)]
+        if skip_domain is not None:
+            domains = [d if d and not skip_domain(d) else "" for d in domains]
+        companies = [canonicalize(c).key for c in df.get("Company", empty)]
+
+        by_key = {
+            "domain": self._decisions(sheet, "domain", domains),
+            "company": self._decisions(sheet, "company_key", companies),
+        }
+        results: List[Optional[Recall]] = []
+        for domain, company in zip(domains, companies):
+            recall = None
+            for key, value in (("domain", domain), ("company", company)):
+                recall = self._best(key, value, by_key[key].get(value, []))
+                if recall is not None:
+                    break
+            results.append(recall)
+        return results
+
+    @staticmethod
+    def _best(key: str, value: str, decisions: List[Tuple[str, str]]) -> Optional[Recall]:
+        if not value or not decisions:
+            return None
+        counts = Counter(decision for decision, _ in decisions)
+        last_seen: Dict[str, str] = {}
+        for decision, received in decisions:
+            last_seen[decision] = max(last_seen.get(decision, ""), received)
+        # Most common decision; ties go to the most recent one
+        decision, count = max(counts.items(), key=lambda item: (item[1], last_seen[item[0]]))
+        if count / len(decisions) < MIN_AGREEMENT:
+            return None
+        return Recall(json.loads(decision), count, len(decisions), key, value, last_seen[decision])
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            sources, decisions = self._conn.execute(
+                "SELECT (SELECT COUNT(*) FROM sources), (SELECT COUNT(*) FROM decisions)").fetchone()
+        return {"sources": sources, "decisions": decisions}
+
+    def close(self) -> None:
+        self._conn.close()
@@ -0,0 +1,98 @@
+"""
+Disk Cache
+Small persistent key/value cache with per-entry expiry, backed by SQLite.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+# extractor/ -> email_extractor/cache/lookups.sqlite3
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "cache", "lookups.sqlite3")
+
+# SQLite limits the number of bound parameters per statement
+_BATCH_SIZE = 500
+
+
+class DiskCache:
+    """JSON values stored per (namespace, key) with a time-to-live.
+
+    Several caches (web checks, DNS, redirects, ...) can share one file through
+    different namespaces. Expired entries read as missing and are overwritten on
+    the next set(). Safe to use from several threads.
+    """
+
+    def __init__(self, namespace: str, ttl: float, path: Optional[str] = None):
+        """
+        Args:
+            namespace: Separates this cache's keys from other users of the file.
+            ttl: Default lifetime of an entry in seconds.
+            path: SQLite file; None uses DEFAULT_CACHE_PATH, ":memory:" keeps
+                  the cache in process only.
+        """
+        self.namespace = namespace
+        self.ttl = ttl
+        self.path = path or DEFAULT_CACHE_PATH
+        self._lock = threading.Lock()
+
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                " namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,"
+                " expires_at REAL NOT NULL, PRIMARY KEY (namespace, key))"
+            )
+
+    def get(self, key: str, default=None):
+        """Cached value for key, or default if missing or expired."""
+        return self.get_many([key]).get(key, default)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, object]:
+        """Unexpired cached values for the given keys (missing keys are left out)."""
+        keys = list(dict.fromkeys(keys))
+        found: Dict[str, object] = {}
+        now = time.time()
+        with self._lock:
+            for start in range(0, len(keys), _BATCH_SIZE):
+                chunk = keys[start:start + _BATCH_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM cache WHERE namespace = ? AND expires_at > ? AND key IN ({placeholders})",
+                    [self.namespace, now, *chunk],
+                ).fetchall()
+                for key, value in rows:
+                    found[key] = json.loads(value)
+        return found
+
+    def set(self, key: str, value, ttl: Optional[float] = None) -> None:
+        """Store value for key; ttl overrides the default lifetime."""
+        self.set_many({key: value}, ttl)
+
+    def set_many(self, values: Dict[str, object], ttl: Optional[float] = None) -> None:
+        """Store several values with the same lifetime in one transaction."""
+        if not values:
+            return
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        rows = [(self.namespace, key, json.dumps(value), expires_at) for key, value in values.items()]
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)", rows)
+
+    def purge_expired(self) -> int:
+        """Delete expired entries of this namespace; returns how many were removed."""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM cache WHERE namespace = ? AND expires_at <= ?", (self.namespace, time.time())
+            )
+        return cursor.rowcount
+
+    def clear(self) -> None:
+        """Delete every entry of this namespace."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM cache WHERE namespace = ?", (self.namespace,))
+
+    def close(self) -> None:
+        self._conn.close()
@@ -0,0 +1,150 @@
+"""
+Domain Resolver
+Checks concurrently whether lead email domains have MX/A records, with a persistent
+cache of the answers.
+"""
+import math
+import socket
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, Optional, Sequence
+
+from .disk_cache import DiskCache
+
+# Optional: dnspython for MX lookups (falls back to A/AAAA via getaddrinfo)
+try:
+    import dns.exception
+    import dns.resolver
+    HAS_DNS = True
+except Exception:
+    HAS_DNS = False
+
+DAY = 24 * 60 * 60
+
+DNS_NAMESPACE = "dns"
+
+# Existing domains rarely disappear; missing ones are retried sooner; failures are not cached
+RESOLVABLE_TTL = 30 * DAY
+UNRESOLVABLE_TTL = 3 * DAY
+
+DEFAULT_TIMEOUT = 2.0
+DEFAULT_WORKERS = 16
+
+# Queries one lookup may need (MX, A, AAAA), each allowed the full timeout
+QUERIES_PER_LOOKUP = 3
+
+# A resolver answers True (has records), False (no such domain / no records) or None (unknown)
+Resolver = Callable[[str], Optional[bool]]
+
+
+def socket_resolver(domain: str) -> Optional[bool]:
+    """A/AAAA lookup through the system resolver (no MX support)."""
+    try:
+        return bool(socket.getaddrinfo(domain, None))
+    except socket.gaierror as e:
+        not_found = {socket.EAI_NONAME, getattr(socket, "EAI_NODATA", socket.EAI_NONAME)}
+        return False if e.errno in not_found else None
+    except Exception:
+        return None
+
+
+def dns_resolver(nameservers: Optional[Sequence[str]] = None, port: int = 53,
+                 timeout: float = DEFAULT_TIMEOUT) -> Resolver:
+    """MX, then A/AAAA lookups with dnspython.
+
+    Args:
+        nameservers: Servers to ask; None uses the system configuration.
+        port: DNS port of the given nameservers.
+        timeout: Overall time allowed per query.
+    """
+    resolver = dns.resolver.Resolver(configure=nameservers is None)
+    if nameservers is not None:
+        resolver.nameservers = list(nameservers)
+        resolver.port = port
+    resolver.lifetime = timeout
+
+    def resolve(domain: str) -> Optional[bool]:
+        for rdtype in ("MX", "A", "AAAA"):
+            try:
+                resolver.resolve(domain, rdtype)
+                return True
+            except dns.resolver.NXDOMAIN:
+                return False
+            except dns.resolver.NoAnswer:
+                continue
+            except (dns.resolver.NoNameservers, dns.exception.Timeout):
+                return None
+            except Exception:
+                return None
+        return False
+
+    return resolve
+
+
+class DomainResolver:
+    """Resolvability of email domains: concurrent lookups behind a disk cache."""
+
+    def __init__(self, resolve: Optional[Resolver] = None, cache: Optional[DiskCache] = None,
+                 max_workers: int = DEFAULT_WORKERS, timeout: float = DEFAULT_TIMEOUT):
+        """
+        Args:
+            resolve: Lookup function; None uses dnspython (MX) if installed,
+                     otherwise the system resolver.
+            cache: Answer cache; None uses the default on-disk cache.
+            max_workers: Maximum number of concurrent lookups.
+            timeout: Time allowed per DNS query. A batch waits as long as its
+                     lookups can take on max_workers threads (see batch_timeout);
+                     domains still pending afterwards are reported as unknown.
+        """
+        if resolve is None:
+            resolve = dns_resolver(timeout=timeout) if HAS_DNS else socket_resolver
+        self.resolve = resolve
+        self.cache = cache if cache is not None else DiskCache(DNS_NAMESPACE, RESOLVABLE_TTL)
+        self.max_workers = max_workers
+        self.timeout = timeout
+
+    def batch_timeout(self, lookups: int) -> float:
+        """Time to wait for `lookups` lookups: one full lookup per round of workers."""
+        rounds = math.ceil(lookups / max(1, self.max_workers))
+        return rounds * QUERIES_PER_LOOKUP * self.timeout + self.timeout
+
+    def check(self, domain: str) -> Optional[bool]:
+        """True/False if the domain does/doesn't resolve, None if unknown."""
+        return self.check_many([domain]).get(domain)
+
+    def check_many(self, domains: Iterable[str]) -> Dict[str, Optional[bool]]:
+        """Answers for several domains; uncached ones are looked up concurrently."""
+        domains = [d for d in dict.fromkeys(domains) if d]
+        answers: Dict[str, Optional[bool]] = dict(self.cache.get_many(domains))
+        missing = [d for d in domains if d not in answers]
+        if not missing:
+            return answers
+
+        pool = ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(missing))),
+                                  thread_name_prefix="dns-check")
+        futures = {pool.submit(self._resolve, domain): domain for domain in missing}
+        # The system resolver has no timeout of its own: stop waiting once every lookup could have finished
+        _, pending = wait(futures, timeout=self.batch_timeout(len(missing)))
+        for future in pending:
+            future.cancel()   # queued lookups never start (cancel_futures needs Python 3.9)
+        pool.shutdown(wait=False)
+
+        resolvable, unresolvable = {}, {}
+        for future, domain in futures.items():
+            answer = future.result() if future.done() and not future.cancelled() else None
+            answers[domain] = answer
+            if answer is True:
+                resolvable[domain] = True
+            elif answer is False:
+                unresolvable[domain] = False
+        try:
+            self.cache.set_many(resolvable, RESOLVABLE_TTL)
+            self.cache.set_many(unresolvable, UNRESOLVABLE_TTL)
+        except Exception as e:
+            print(f"⚠ Could not store DNS results: {e}")
+        return answers
+
+    def _resolve(self, domain: str) -> Optional[bool]:
+        try:
+            return self.resolve(domain)
+        except Exception:
+            return None
@@ -0,0 +1,95 @@
+"""
+Domain Facts
+Parses each email domain once against an offline Public Suffix List snapshot.
+"""
+import functools
+import re
+from typing import NamedTuple
+
+import pandas as pd
+import tldextract
+
+EMAIL_DOMAIN_PATTERN = r'@([A-Za-z0-9.-]+)$'
+_EMAIL_DOMAIN_RE = re.compile(EMAIL_DOMAIN_PATTERN)
+
+ACADEMIC_TLD_HINTS = {".edu"}  # direct .edu
+ACADEMIC_2LD_HINTS = {"ac", "edu", "uni"}  # e.g., ac.uk, edu.eg, uni.rostock.de (heuristic)
+
+# Service subdomains skipped when guessing the main label without a known suffix
+SERVICE_SUBDOMAINS = {"mail", "email", "webmail", "smtp", "pop", "imap", "www"}
+
+DOMAIN_FACTS_CACHE_SIZE = 8192
+
+# Bundled PSL snapshot only: no download on first use, no on-disk cache
+_PSL = tldextract.TLDExtract(suffix_list_urls=(), cache_dir=None, fallback_to_snapshot=True)
+
+
+class DomainFacts(NamedTuple):
+    """Everything the validators need to know about one email domain."""
+    domain: str             # full domain, lowercased (mail.cs.ox.ac.uk)
+    registered_domain: str  # label + public suffix (ox.ac.uk); '' if suffix unknown
+    public_suffix: str      # ac.uk; '' if unknown
+    main_label: str         # ox
+    is_academic_2ld: bool   # .edu, ac.xx / edu.xx suffixes, uni.xx heuristic
+
+
+def email_domain(email) -> str:
+    """Lowercased domain of an email address, or '' if there is none."""
+    if not email:
+        return ""
+    match = _EMAIL_DOMAIN_RE.search(str(email).strip())
+    return match.group(1).lower() if match else ""
+
+
+def email_domains(emails: pd.Series) -> pd.Series:
+    """Vectorized email_domain over a string Series."""
+    return emails.str.strip().str.extract(EMAIL_DOMAIN_PATTERN, expand=False).fillna("").str.lower()
+
+
+def domain_facts(domain) -> DomainFacts:
+    """Return the (cached) DomainFacts for a domain."""
+    return _domain_facts((domain or "").strip().lower())
+
+
+@functools.lru_cache(maxsize=DOMAIN_FACTS_CACHE_SIZE)
+def _domain_facts(domain: str) -> DomainFacts:
+    if not domain:
+        return DomainFacts("", "", "", "", False)
+
+    ext = _PSL(domain)
+    suffix = ext.suffix.lower()
+    registered = f"{ext.domain}.{suffix}".lower() if ext.domain and suffix else ""
+    main_label = ext.domain.lower() if registered else _guess_main_label(domain)
+
+    return DomainFacts(
+        domain=domain,
+        registered_domain=registered,
+        public_suffix=suffix,
+        main_label=main_label,
+        is_academic_2ld=_is_academic(domain, suffix),
+    )
+
+
+def _is_academic(domain: str, suffix: str) -> bool:
+    if any(domain.endswith(t) for t in ACADEMIC_TLD_HINTS):
+        return True
+    if suffix and suffix.split(".")[0] in ACADEMIC_2LD_HINTS and "." in suffix:
+        return True
+    # second-level patterns outside the PSL, e.g. uni.xx
+    parts = domain.split(".")
+    return len(parts) >= 3 and parts[-2] in ACADEMIC_2LD_HINTS
+
+
+def _guess_main_label(domain: str) -> str:
+    """Main label for domains with no known public suffix."""
+    parts = domain.split(".")
+    if len(parts) >= 2 and parts[0] in SERVICE_SUBDOMAINS:
+        parts = parts[1:]
+    if len(parts) >= 2:
+        return parts[-2]
+    return parts[0] if parts else ""
+
+
+def cache_info():
+    """LRU statistics of the shared domain cache."""
+    return _domain_facts.cache_info()
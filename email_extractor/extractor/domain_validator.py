@@ -3,9 +3,20 @@ Domain Validator
 Validates if email domain matches company name.
 """
 
-import re
-import socket
-from typing import Dict
+from typing import Dict, Optional
+
+import pandas as pd
+
+from .batch import text_column
+from .canonical import canonicalize
+from .dns_check import DomainResolver
+from .domain_facts import domain_facts, email_domain, email_domains
+from .rules import Rule, RulePipeline
+
+DOMAIN_RESULT_COLUMNS = ["status", "details", "confidence"]
+
+# "Domain Resolvable" column values for resolver answers
+RESOLVABLE_LABELS = {True: "Yes", False: "No", None: "Unknown"}
 
 # Free email domains (fallback if validation data not loaded)
 FREE_MAILERS = {
@@ -18,62 +29,30 @@ FREE_MAILERS = {
 class DomainValidator:
     """Validate if email domain matches company name."""
     
-    def __init__(self, validation_loader=None):
+    def __init__(self, validation_loader=None, domain_resolver: Optional[DomainResolver] = None):
         """Initialize validator.
         
         Args:
             validation_loader: Optional ValidationDataLoader instance
+            domain_resolver: Optional DomainResolver; when given, domains without
+                             MX/A records are reported as unresolvable
         """
         self.validation_loader = validation_loader
+        self.domain_resolver = domain_resolver
+        self._resolvable: Dict[str, Optional[bool]] = {}
+        self.rules = self._build_rules()
     
     def extract_domain(self, email: str) -> str:
         """Extract domain from email address."""
-        if not email:
-            return ""
-        match = re.search(r'@([A-Za-z0-9.-]+)$', str(email).strip())
-        return match.group(1).lower() if match else ""
+        return email_domain(email)
     
     def normalize_name(self, text: str) -> str:
         """Normalize company/domain name for comparison."""
-        if not text:
-            return ""
-        
-        text = str(text).lower()
-        
-        # Remove common company suffixes
-        suffixes = [
-            "gmbh", "ag", "se", "ltd", "limited", "inc", "corp", "corporation",
-            "llc", "plc", "sa", "srl", "bv", "nv", "kg", "ohg", "gbr",
-            "co", "company", "group", "holding", "holdings", "international"
-        ]
-        
-        for suffix in suffixes:
-            text = re.sub(rf'\b{suffix}\b', '', text)
-        
-        # Remove special characters, keep only alphanumeric
-        text = re.sub(r'[^a-z0-9]+', '', text)
-        
-        return text.strip()
+        return canonicalize(text).compact
     
     def extract_main_domain(self, domain: str) -> str:
-        """Extract main domain without subdomains and TLD."""
-        if not domain:
-            return ""
-        
-        parts = domain.split('.')
-        
-        # Skip common subdomains
-        if len(parts) >= 2:
-            if parts[0] in ['mail', 'email', 'webmail', 'smtp', 'pop', 'imap', 'www']:
-                parts = parts[1:]
-        
-        # Get the domain name
-        if len(parts) >= 2:
-            if len(parts) >= 3 and len(parts[-2]) <= 3:
-                return parts[-3]  # For .co.uk, .com.au, etc.
-            return parts[-2]  # For .com, .de, .org, etc.
-        
-        return parts[0] if parts else ""
+        """Extract main domain without subdomains and public suffix."""
+        return domain_facts(domain).main_label
     
     def is_free_mailer(self, domain: str) -> bool:
         """Check if domain is a free email provider."""
@@ -84,6 +63,14 @@ class DomainValidator:
         # Fallback to hardcoded list
         return domain.lower() in FREE_MAILERS
     
+    def is_resolvable(self, domain: str) -> Optional[bool]:
+        """Resolver answer for domain (None if unknown or no resolver is configured)."""
+        if self.domain_resolver is None or not domain:
+            return None
+        if domain not in self._resolvable:
+            self._resolvable[domain] = self.domain_resolver.check(domain)
+        return self._resolvable[domain]
+    
     def calculate_similarity(self, str1: str, str2: str) -> float:
         """Calculate similarity score between two strings (0.0 to 1.0)."""
         if not str1 or not str2:
@@ -101,6 +88,42 @@ class DomainValidator:
         
         return matches / max_len if max_len > 0 else 0.0
     
+    def validate_many(self, companies, emails) -> pd.DataFrame:
+        """Batched validate_domain over DataFrame columns.
+        
+        Each distinct (company, email domain) pair is validated once; with a
+        domain resolver, the domains that reach the DNS rule are looked up
+        together first.
+        
+        Returns:
+            DataFrame aligned with the input index with columns
+            status, details, confidence, rule and resolvable
+            (Yes/No/Unknown; empty if the domain was not looked up).
+        """
+        companies = text_column(companies)
+        emails = text_column(emails, index=companies.index)
+        keys = pd.DataFrame({
+            "company": companies,
+            "domain": email_domains(emails),
+        })
+        if self.domain_resolver is not None:
+            self._prefetch_resolvable(keys)
+        results = self.rules.evaluate_many(keys, DOMAIN_RESULT_COLUMNS)
+        looked_up = {d: RESOLVABLE_LABELS[answer] for d, answer in self._resolvable.items()}
+        results["resolvable"] = keys["domain"].map(looked_up).fillna("")
+        return results
+    
+    def _prefetch_resolvable(self, keys: pd.DataFrame) -> None:
+        """Resolve, concurrently, the domains the DNS rule will ask about."""
+        domains = set()
+        for company, domain in keys.drop_duplicates().itertuples(index=False, name=None):
+            if domain not in self._resolvable and \
+                    self.rules.reaches("unresolvable_domain", company=company, domain=domain) is not None:
+                domains.add(domain)
+        if domains:
+            print(f"Resolving {len(domains)} email domains...")
+            self._resolvable.update(self.domain_resolver.check_many(domains))
+    
     def validate_domain(self, company: str, email: str) -> Dict[str, str]:
         """Validate if email domain matches company name.
         
@@ -109,66 +132,61 @@ class DomainValidator:
                 - status: str
                 - details: str
                 - confidence: str
+                - rule: name of the deciding rule
         """
-        domain = self.extract_domain(email)
-        
-        if not domain:
-            return {
+        return self.rules.evaluate(company=company, domain=self.extract_domain(email))
+    
+    def _build_rules(self) -> RulePipeline:
+        """Domain validation rules, first match wins."""
+        def similarity(ctx) -> float:
+            company_normalized = self.normalize_name(ctx["company"])
+            domain_normalized = self.normalize_name(self.extract_main_domain(ctx["domain"]))
+            return self.calculate_similarity(company_normalized, domain_normalized)
+        
+        return RulePipeline("domain_validation", [
+            Rule("no_email_domain", lambda c: not c["domain"], {
                 "status": "No Email Domain",
                 "details": "Email address is empty or invalid",
                 "confidence": "high"
-            }
-        
-        if not company:
-            return {
+            }),
+            Rule("no_company_name", lambda c: not c["company"], {
                 "status": "No Company Name",
                 "details": "Company name is empty",
                 "confidence": "high"
-            }
-        
-        # Check if free mailer
-        if self.is_free_mailer(domain):
-            return {
+            }),
+            Rule("free_mailer", lambda c: self.is_free_mailer(c["domain"]), {
                 "status": "Free Mailer",
-                "details": f"Using free email provider: {domain}",
+                "details": "Using free email provider: {domain}",
                 "confidence": "high"
-            }
-        
-        # Check if excluded domain
-        if self.validation_loader and self.validation_loader.is_excluded_domain(domain):
-            return {
+            }),
+            Rule("excluded_domain",
+                 lambda c: bool(self.validation_loader) and self.validation_loader.is_excluded_domain(c["domain"]), {
                 "status": "Excluded Domain",
-                "details": f"Domain is in excluded list: {domain}",
+                "details": "Domain is in excluded list: {domain}",
                 "confidence": "high"
-            }
-        
-        # Normalize and compare
-        company_normalized = self.normalize_name(company)
-        domain_main = self.extract_main_domain(domain)
-        domain_normalized = self.normalize_name(domain_main)
-        
-        similarity = self.calculate_similarity(company_normalized, domain_normalized)
-        
-        # High similarity
-        if similarity >= 0.8:
-            return {
+            }),
+            # Dead or mistyped domains (only with a domain resolver)
+            Rule("unresolvable_domain", lambda c: self.is_resolvable(c["domain"]) is False, {
+                "status": "Unresolvable Domain",
+                "details": "No MX or A records for {domain}",
+                "confidence": "high"
+            }),
+            # High similarity
+            Rule("high_similarity", lambda c: c["similarity"] >= 0.8, {
                 "status": "Valid Company Domain",
-                "details": f"Domain matches company: {company} → {domain}",
+                "details": "Domain matches company: {company} → {domain}",
                 "confidence": "high"
-            }
-        
-        # Medium similarity
-        elif similarity >= 0.5:
-            return {
+            }),
+            # Medium similarity
+            Rule("medium_similarity", lambda c: c["similarity"] >= 0.5, {
                 "status": "Possible Domain Match",
-                "details": f"Partial match: {company} ≈ {domain}",
+                "details": "Partial match: {company} ≈ {domain}",
                 "confidence": "medium"
-            }
-        
-        # Low similarity
-        else:
-            return {
+            }),
+            # Low similarity
+            Rule("domain_mismatch", None, {
                 "status": "Domain Mismatch",
-                "details": f"Company and domain don't match: {company} ≠ {domain}",
+                "details": "Company and domain don't match: {company} ≠ {domain}",
                 "confidence": "high"
-            }
\ No newline at end of file
+            }),
+        ], derived={"similarity": similarity})
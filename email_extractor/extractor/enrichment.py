@@ -0,0 +1,108 @@
+"""
+Background Enrichment
+Fills slow enrichment columns (e.g. SAP Sold-to-Party Name) into an already
+published workbook while reviewers work on it.
+"""
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from .workbook_reader import WorkbookReader
+
+PENDING_MARKER = "⏳ Pending lookup"
+
+# Runs the lookups for the given keys and reports each result as report(key, value)
+LookupRunner = Callable[[List[str], Callable[[str, str], None]], None]
+
+DEFAULT_FLUSH_EVERY = 10
+SAVE_RETRIES = 3
+SAVE_RETRY_DELAY = 5.0
+
+
+class BackgroundEnrichment:
+    """Look up values for one column in a background thread and patch them into the workbook.
+
+    Cells waiting for a lookup should be written as PENDING_MARKER. Results are
+    staged as they arrive and saved every flush_every results (and at the end),
+    through WorkbookReader so the run store sees them too. If the file cannot be
+    written (e.g. open in Excel), the results stay staged for the next save.
+    """
+
+    def __init__(self, workbook_path: str, column: str, targets: Dict[str, Dict[str, List[int]]],
+                 run_lookups: LookupRunner, flush_every: int = DEFAULT_FLUSH_EVERY, label: str = "Enrichment"):
+        """
+        Args:
+            workbook_path: Published workbook to patch.
+            column: Column receiving the looked-up values.
+            targets: sheet -> lookup key -> data row indexes that take the key's value.
+            run_lookups: Performs the lookups (see LookupRunner).
+            flush_every: Number of results between saves.
+            label: Prefix of progress messages.
+        """
+        self.reader = WorkbookReader(workbook_path)
+        self.column = column
+        self.targets = targets
+        self.run_lookups = run_lookups
+        self.flush_every = max(1, flush_every)
+        self.label = label
+        self.keys = sorted({key for rows_by_key in targets.values() for key in rows_by_key})
+        self.results: Dict[str, str] = {}
+        self.error: Optional[Exception] = None
+        self._writer = self.reader.status_writer()
+        self._lock = threading.Lock()
+        self._unsaved = 0
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="enrichment", daemon=False)
+        self._thread.start()
+
+    def join(self) -> bool:
+        """Wait for the lookups; True if every result was saved to the workbook."""
+        if self._thread is not None:
+            self._thread.join()
+        return self._writer.pending() == 0
+
+    def save(self) -> bool:
+        """Save the staged results now; False if the workbook could not be written."""
+        with self._lock:
+            if not self._writer.pending():
+                return True
+            try:
+                self.reader.save_status(self._writer)
+            except Exception as e:
+                print(f"⚠ {self.label}: could not update the workbook yet ({e})")
+                return False
+            self._unsaved = 0
+            return True
+
+    def _run(self) -> None:
+        try:
+            self.run_lookups(self.keys, self._report)
+        except Exception as e:
+            self.error = e
+            print(f"\n{self.label} failed (continuing without it): {e}")
+
+        # Keys without a result are cleared rather than left pending
+        for key in self.keys:
+            if key not in self.results:
+                self._stage(key, "")
+        for _ in range(SAVE_RETRIES):
+            if self.save():
+                print(f"✓ {self.label}: {len(self.results)}/{len(self.keys)} lookups written to the workbook")
+                return
+            time.sleep(SAVE_RETRY_DELAY)
+
+    def _report(self, key: str, value: str) -> None:
+        self.results[key] = value or ""
+        self._stage(key, value or "")
+        if self._unsaved >= self.flush_every:
+            self.save()
+
+    def _stage(self, key: str, value: str) -> None:
+        with self._lock:
+            for sheet_name, rows_by_key in self.targets.items():
+                rows = rows_by_key.get(key)
+                if rows:
+                    self._writer.set_many(sheet_name, self.column, {row: value for row in rows})
+            self._unsaved += 1
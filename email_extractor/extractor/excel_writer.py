@@ -5,6 +5,7 @@ Writes DataFrames to Excel with formatting and dropdowns.
 
 import pandas as pd
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.worksheet.datavalidation import DataValidation
 from openpyxl.utils import get_column_letter
 from openpyxl.styles import PatternFill, Font, Alignment
@@ -19,9 +20,11 @@ STATUS_TRACKING_COLOR = "C6EFCE"     # Light Green
 VALIDATION_FILTER_COLUMNS = [
     "Has Contact Sales Form",
     "Company Domain Validation",
+    "Domain Resolvable",
     "Validation Status",
     "Status",
     "Sold-to-Party Name",   # <-- added
+    "Prefill Confidence",
 ]
 
 VALIDATION_INPUT_COLUMNS = [
@@ -43,9 +46,11 @@ VALIDATION_STATUS_COLUMNS = [
 REVIEW_FILTER_COLUMNS = [
     "Has Contact Sales Form",
     "Company Domain Validation",
+    "Domain Resolvable",
     "Validation Status",
     "Status",
     "Sold-to-Party Name",   # <-- added
+    "Prefill Confidence",
 ]
 
 REVIEW_INPUT_COLUMNS = [
@@ -127,15 +132,27 @@ FOLDER_COLORS = {
     "Rejected Marketing": "F8CBAD"
 }
 
+# Columns whose http(s) values are written as hyperlinks
+LINK_COLUMNS = [
+    "PreMQL review/validation link",
+    "Eloqua Profiler",
+    "URL Of Form",
+    "PreMQL Final URL",
+    "Eloqua Profiler Final URL",
+]
+
+MAX_COLUMN_WIDTH = 50
+
 class ExcelWriter:
     """Write DataFrames to Excel with separate sheets and dropdowns."""
     
     def write_workbook(self, df_validation: pd.DataFrame, df_review: pd.DataFrame, filepath: str):
-        """Write two DataFrames to Excel with separate sheets."""
-        wb = Workbook()
+        """Write two DataFrames to Excel with separate sheets.
         
-        if "Sheet" in wb.sheetnames:
-            wb.remove(wb["Sheet"])
+        Uses openpyxl's write-only mode: rows are streamed to the file with their
+        styles and hyperlinks, so memory use does not grow with the row count.
+        """
+        wb = Workbook(write_only=True)
         
         if not df_validation.empty:
             ws_val = wb.create_sheet("Validation")
@@ -146,7 +163,14 @@ class ExcelWriter:
             self._write_review_sheet(ws_rev, df_review)
         
         wb.save(filepath)
-    
+
+    def export_run(self, store, run_id: str, filepath: str):
+        """Write the workbook of a stored run (see RunStore) and link the run to the file."""
+        df_validation = store.load_sheet(run_id, "Validation")
+        df_review = store.load_sheet(run_id, "Review")
+        self.write_workbook(df_validation, df_review, filepath)
+        store.finish_run(run_id, filepath)
+
     def _write_validation_sheet(self, worksheet, df: pd.DataFrame):
         """Write Validation sheet with dropdowns."""
         all_workflow = VALIDATION_FILTER_COLUMNS + VALIDATION_INPUT_COLUMNS + VALIDATION_STATUS_COLUMNS
@@ -166,21 +190,19 @@ class ExcelWriter:
         df = df[ordered_columns]
         
         headers = list(df.columns)
-        worksheet.append(headers)
-        
-        for _, row in df.iterrows():
-            worksheet.append([row[col] for col in headers])
-        
-        self._color_headers(worksheet, headers, "Validation")
-        
         take_action_idx = headers.index("Take Action") + 1
         valid_reject_idx = headers.index("Valid Company → Reject Reason") + 1
         invalid_idx = headers.index("Invalid Company Reason") + 1
         move_to_folder_idx = headers.index("Move to Folder") + 1
         
-        last_row = worksheet.max_row
+        last_row = len(df) + 1
         total_cols = len(headers)
         
+        # Sheet-level settings must be in place before rows are streamed
+        self._set_column_widths(worksheet, df)
+        worksheet.freeze_panes = "A2"
+        worksheet.row_dimensions[1].height = 35
+        
         # Add dropdowns
         self._add_dropdown(worksheet, take_action_idx, last_row, TAKE_ACTION_VALIDATION)
         self._add_dropdown(worksheet, valid_reject_idx, last_row, VALID_REJECT_REASONS_VALIDATION)
@@ -193,13 +215,8 @@ class ExcelWriter:
         # Add row coloring
         self._add_row_coloring(worksheet, move_to_folder_idx, last_row, total_cols)
         
-        # Make links clickable
-        self._make_links_clickable(worksheet, "PreMQL review/validation link")
-        self._make_links_clickable(worksheet, "Eloqua Profiler")
-        self._make_links_clickable(worksheet, "URL Of Form")
-        
-        worksheet.freeze_panes = "A2"
-        self._adjust_column_widths(worksheet)
+        worksheet.append(self._header_cells(worksheet, headers, "Validation"))
+        self._stream_rows(worksheet, df)
     
     def _write_review_sheet(self, worksheet, df: pd.DataFrame):
         """Write Review sheet with dropdowns."""
@@ -223,20 +240,18 @@ class ExcelWriter:
         df = df[ordered_columns]
         
         headers = list(df.columns)
-        worksheet.append(headers)
-        
-        for _, row in df.iterrows():
-            worksheet.append([row[col] for col in headers])
-        
-        self._color_headers(worksheet, headers, "Review")
-        
         take_action_idx = headers.index("Take Action") + 1
         reject_reason_idx = headers.index("Reject Reason") + 1
         move_to_folder_idx = headers.index("Move to Folder") + 1
         
-        last_row = worksheet.max_row
+        last_row = len(df) + 1
         total_cols = len(headers)
         
+        # Sheet-level settings must be in place before rows are streamed
+        self._set_column_widths(worksheet, df)
+        worksheet.freeze_panes = "A2"
+        worksheet.row_dimensions[1].height = 35
+        
         # Add dropdowns
         self._add_dropdown(worksheet, take_action_idx, last_row, TAKE_ACTION_REVIEW)
         self._add_dropdown(worksheet, reject_reason_idx, last_row, REJECT_REASONS_REVIEW)
@@ -248,13 +263,26 @@ class ExcelWriter:
         # Add row coloring
         self._add_row_coloring(worksheet, move_to_folder_idx, last_row, total_cols)
         
-        # Make links clickable
-        self._make_links_clickable(worksheet, "PreMQL review/validation link")
-        self._make_links_clickable(worksheet, "Eloqua Profiler")
-        self._make_links_clickable(worksheet, "URL Of Form")
-        
-        worksheet.freeze_panes = "A2"
-        self._adjust_column_widths(worksheet)
+        worksheet.append(self._header_cells(worksheet, headers, "Review"))
+        self._stream_rows(worksheet, df)
+    
+    def _stream_rows(self, worksheet, df: pd.DataFrame):
+        """Append data rows; link columns get hyperlink cells as they are written."""
+        link_positions = [i for i, col in enumerate(df.columns) if col in LINK_COLUMNS]
+        # Missing and empty values become blank cells (nothing is written for them)
+        values = df.astype(object)
+        values = values.where(values.notna() & (values != ""), None)
+        
+        for row in values.itertuples(index=False, name=None):
+            row = list(row)
+            for i in link_positions:
+                url = row[i]
+                if url and isinstance(url, str) and url.startswith("http"):
+                    cell = WriteOnlyCell(worksheet, value=url)
+                    cell.hyperlink = url
+                    cell.style = "Hyperlink"
+                    row[i] = cell
+            worksheet.append(row)
     
     def _add_dropdown(self, worksheet, col_idx: int, last_row: int, options: list):
         """Add dropdown validation to a column."""
@@ -264,7 +292,7 @@ class ExcelWriter:
             formula1=f'"' + ','.join(options) + '"',
             allow_blank=True
         )
-        worksheet.add_data_validation(dv)
+        worksheet.data_validations.append(dv)
         dv.add(f"{col_letter}2:{col_letter}{last_row}")
     
     def _add_row_coloring(self, worksheet, move_to_folder_col: int, last_row: int, total_cols: int):
@@ -283,8 +311,8 @@ class ExcelWriter:
             
             worksheet.conditional_formatting.add(range_to_format, rule)
     
-    def _color_headers(self, worksheet, headers: list, sheet_type: str):
-        """Color-code headers based on column groups."""
+    def _header_cells(self, worksheet, headers: list, sheet_type: str) -> list:
+        """Header row cells, color-coded by column group."""
         if sheet_type == "Validation":
             filter_cols = VALIDATION_FILTER_COLUMNS
             input_cols = VALIDATION_INPUT_COLUMNS
@@ -303,8 +331,9 @@ class ExcelWriter:
         header_font_black = Font(bold=True, color="000000")
         header_alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
         
-        for col_idx, col_name in enumerate(headers, start=1):
-            cell = worksheet.cell(row=1, column=col_idx)
+        cells = []
+        for col_name in headers:
+            cell = WriteOnlyCell(worksheet, value=col_name)
             cell.alignment = header_alignment
             
             if col_name in filter_cols:
@@ -319,122 +348,61 @@ class ExcelWriter:
             else:
                 cell.fill = default_fill
                 cell.font = header_font_white
+            cells.append(cell)
         
-        worksheet.row_dimensions[1].height = 35
-    
-    def _make_links_clickable(self, worksheet, column_name: str):
-        """Make URLs in a specific column clickable."""
-        link_col = None
-        
-        for col in range(1, worksheet.max_column + 1):
-            cell_value = worksheet.cell(row=1, column=col).value
-            if cell_value == column_name:
-                link_col = col
-                break
-        
-        if link_col is None:
-            return
-        
-        link_font = Font(color="0000FF", underline="single")
-        
-        for row in range(2, worksheet.max_row + 1):
-            cell = worksheet.cell(row=row, column=link_col)
-            url = cell.value
-            
-            if url and isinstance(url, str) and url.startswith("http"):
-                cell.hyperlink = url
-                cell.value = url
-                cell.font = link_font
-                cell.style = "Hyperlink"
+        return cells
     
     def _add_conditional_formatting_validation(self, worksheet, headers: list, last_row: int):
         """Add conditional formatting for Validation sheet."""
         highlight_yellow = PatternFill(start_color="FFFF99", end_color="FFFF99", fill_type="solid")
         highlight_green = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
         
-        take_action_idx = headers.index("Take Action") + 1
-        valid_reject_idx = headers.index("Valid Company → Reject Reason") + 1
-        invalid_idx = headers.index("Invalid Company Reason") + 1
-        additional_idx = headers.index("Additional Scoring Information") + 1
-        send_to_idx = headers.index("Send to") + 1
-        
-        take_action_letter = get_column_letter(take_action_idx)
-        valid_reject_letter = get_column_letter(valid_reject_idx)
-        invalid_letter = get_column_letter(invalid_idx)
-        additional_letter = get_column_letter(additional_idx)
-        send_to_letter = get_column_letter(send_to_idx)
-        
-        for row in range(2, last_row + 1):
-            # Highlight Valid Company → Reject Reason
-            rule1 = FormulaRule(
-                formula=[f'${take_action_letter}{row}="Valid Company → Reject"'],
-                stopIfTrue=False,
-                fill=highlight_yellow
-            )
-            worksheet.conditional_formatting.add(f"{valid_reject_letter}{row}", rule1)
-            
-            # Highlight Invalid Company Reason
-            rule2 = FormulaRule(
-                formula=[f'${take_action_letter}{row}="Invalid Company"'],
-                stopIfTrue=False,
-                fill=highlight_yellow
-            )
-            worksheet.conditional_formatting.add(f"{invalid_letter}{row}", rule2)
-            
-            # Highlight Additional Scoring Info and Send to
-            rule3 = FormulaRule(
-                formula=[f'${take_action_letter}{row}="Valid Company → MQL"'],
-                stopIfTrue=False,
-                fill=highlight_green
-            )
-            worksheet.conditional_formatting.add(f"{additional_letter}{row}", rule3)
-            worksheet.conditional_formatting.add(f"{send_to_letter}{row}", rule3)
+        take_action_letter = get_column_letter(headers.index("Take Action") + 1)
+        valid_reject_letter = get_column_letter(headers.index("Valid Company → Reject Reason") + 1)
+        invalid_letter = get_column_letter(headers.index("Invalid Company Reason") + 1)
+        additional_letter = get_column_letter(headers.index("Additional Scoring Information") + 1)
+        send_to_letter = get_column_letter(headers.index("Send to") + 1)
+        
+        # Highlight Valid Company → Reject Reason
+        self._add_column_rule(worksheet, [valid_reject_letter], last_row,
+                              f'${take_action_letter}2="Valid Company → Reject"', highlight_yellow)
+        # Highlight Invalid Company Reason
+        self._add_column_rule(worksheet, [invalid_letter], last_row,
+                              f'${take_action_letter}2="Invalid Company"', highlight_yellow)
+        # Highlight Additional Scoring Info and Send to
+        self._add_column_rule(worksheet, [additional_letter, send_to_letter], last_row,
+                              f'${take_action_letter}2="Valid Company → MQL"', highlight_green)
     
     def _add_conditional_formatting_review(self, worksheet, headers: list, last_row: int):
         """Add conditional formatting for Review sheet."""
         highlight_yellow = PatternFill(start_color="FFFF99", end_color="FFFF99", fill_type="solid")
         highlight_green = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
         
-        take_action_idx = headers.index("Take Action") + 1
-        reject_reason_idx = headers.index("Reject Reason") + 1
-        additional_idx = headers.index("Additional Scoring Information") + 1
-        send_to_idx = headers.index("Send to") + 1
-        
-        take_action_letter = get_column_letter(take_action_idx)
-        reject_reason_letter = get_column_letter(reject_reason_idx)
-        additional_letter = get_column_letter(additional_idx)
-        send_to_letter = get_column_letter(send_to_idx)
-        
-        for row in range(2, last_row + 1):
-            # Highlight Reject Reason
-            rule1 = FormulaRule(
-                formula=[f'${take_action_letter}{row}="Reject"'],
-                stopIfTrue=False,
-                fill=highlight_yellow
-            )
-            worksheet.conditional_formatting.add(f"{reject_reason_letter}{row}", rule1)
-            
-            # Highlight Additional Scoring Info and Send to
-            rule2 = FormulaRule(
-                formula=[f'${take_action_letter}{row}="MQL - Send to Sales"'],
-                stopIfTrue=False,
-                fill=highlight_green
-            )
-            worksheet.conditional_formatting.add(f"{additional_letter}{row}", rule2)
-            worksheet.conditional_formatting.add(f"{send_to_letter}{row}", rule2)
+        take_action_letter = get_column_letter(headers.index("Take Action") + 1)
+        reject_reason_letter = get_column_letter(headers.index("Reject Reason") + 1)
+        additional_letter = get_column_letter(headers.index("Additional Scoring Information") + 1)
+        send_to_letter = get_column_letter(headers.index("Send to") + 1)
+        
+        # Highlight Reject Reason
+        self._add_column_rule(worksheet, [reject_reason_letter], last_row,
+                              f'${take_action_letter}2="Reject"', highlight_yellow)
+        # Highlight Additional Scoring Info and Send to
+        self._add_column_rule(worksheet, [additional_letter, send_to_letter], last_row,
+                              f'${take_action_letter}2="MQL - Send to Sales"', highlight_green)
     
-    def _adjust_column_widths(self, worksheet):
-        """Auto-adjust column widths."""
-        for column in worksheet.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            
-            for cell in column:
-                try:
-                    if cell.value:
-                        max_length = max(max_length, len(str(cell.value)))
-                except:
-                    pass
-            
-            adjusted_width = min(max_length + 3, 50)
-            worksheet.column_dimensions[column_letter].width = adjusted_width
\ No newline at end of file
+    def _add_column_rule(self, worksheet, column_letters: list, last_row: int, formula: str, fill: PatternFill):
+        """Add one formula rule covering rows 2..last_row of the given columns.
+        
+        The formula is written for row 2 with a relative row reference, so Excel
+        evaluates it against each row of the range.
+        """
+        ranges = " ".join(f"{letter}2:{letter}{last_row}" for letter in column_letters)
+        rule = FormulaRule(formula=[formula], stopIfTrue=False, fill=fill)
+        worksheet.conditional_formatting.add(ranges, rule)
+    
+    def _set_column_widths(self, worksheet, df: pd.DataFrame):
+        """Size columns to their longest value (header included), capped at MAX_COLUMN_WIDTH."""
+        for col_idx, col in enumerate(df.columns, start=1):
+            lengths = df[col].dropna().astype(str).str.len()
+            max_length = max(len(str(col)), int(lengths.max()) if not lengths.empty else 0)
+            worksheet.column_dimensions[get_column_letter(col_idx)].width = min(max_length + 3, MAX_COLUMN_WIDTH)
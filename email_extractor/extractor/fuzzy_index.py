@@ -0,0 +1,163 @@
+"""
+Fuzzy Name Index
+Character-trigram and token inverted index for approximate company-name matching.
+"""
+import heapq
+from collections import defaultdict
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .canonical import canonicalize
+
+# Score given when every token of an indexed name appears in the query
+TOKEN_CONTAINMENT_SCORE = 0.9
+
+# Edit similarity of a name against only part of the query is discounted
+PARTIAL_MATCH_FACTOR = 0.95
+
+# Names shorter than this (without spaces) only match exactly or by token containment
+MIN_FUZZY_LENGTH = 5
+
+# Trigram candidates re-scored by edit similarity per query
+RERANK_CANDIDATES = 20
+
+# Trigrams occurring in more than this share of names are too common to rank by
+MAX_GRAM_SHARE = 0.05
+
+
+def normalize_name(text: str) -> str:
+    """Lowercase ASCII words without punctuation or legal-form suffixes."""
+    return canonicalize(text).key
+
+
+def trigrams(text: str) -> Set[str]:
+    """Padded character trigrams of a normalized name (spaces removed)."""
+    compact = text.replace(" ", "")
+    if not compact:
+        return set()
+    padded = f"  {compact} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NGramIndex:
+    """Inverted index over names, queried by token containment and trigram overlap.
+
+    Only names sharing a token or trigram with the query are considered, and only
+    the best trigram candidates are re-scored by edit similarity, so lookup cost
+    depends on posting-list sizes rather than on the number of indexed names.
+    """
+
+    def __init__(self, names: Iterable[str], min_token_length: int = 3):
+        """
+        Args:
+            names: Names to index (duplicates after normalization are merged).
+            min_token_length: Shortest indexed name that can match by token
+                              containment (shorter names need a trigram match).
+        """
+        self.min_token_length = min_token_length
+        self.names: List[str] = []
+        self._keys: List[str] = []
+        self._token_sets: List[Set[str]] = []
+        self._by_key: Dict[str, int] = {}
+        self._gram_postings: Dict[str, List[int]] = defaultdict(list)
+        self._token_postings: Dict[str, List[int]] = defaultdict(list)
+
+        for name in names:
+            key = normalize_name(name)
+            if not key or key in self._by_key:
+                continue
+            idx = len(self.names)
+            grams = trigrams(key)
+            tokens = set(key.split())
+            self.names.append(name)
+            self._keys.append(key)
+            self._token_sets.append(tokens)
+            self._by_key[key] = idx
+            for gram in grams:
+                self._gram_postings[gram].append(idx)
+            for token in tokens:
+                self._token_postings[token].append(idx)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def search(self, text: str, limit: int = 5, threshold: float = 0.0) -> List[Tuple[str, float]]:
+        """Return up to `limit` (name, score) pairs with score >= threshold, best first.
+
+        Scores: 1.0 for an exact normalized match; TOKEN_CONTAINMENT_SCORE when all
+        tokens of a name occur in the query ("bosch" in "Robert Bosch"); otherwise the
+        edit similarity of the name against the whole query or (discounted) its
+        best-matching run of words. Edit similarity is only computed for the names
+        sharing most trigrams.
+        """
+        key = normalize_name(text)
+        if not key:
+            return []
+
+        scores: Dict[int, float] = {}
+        exact = self._by_key.get(key)
+        if exact is not None:
+            scores[exact] = 1.0
+            if limit == 1:
+                return [(self.names[exact], 1.0)]
+
+        # Token containment: every token of the indexed name is in the query
+        query_tokens = key.split()
+        query_token_set = set(query_tokens)
+        for token in query_token_set:
+            for idx in self._token_postings.get(token, ()):
+                if idx not in scores and len(self._keys[idx]) >= self.min_token_length \
+                        and self._token_sets[idx] <= query_token_set:
+                    scores[idx] = TOKEN_CONTAINMENT_SCORE
+
+        # Trigram overlap counts via posting lists select the rerank candidates
+        max_postings = max(50, int(len(self.names) * MAX_GRAM_SHARE))
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in trigrams(key):
+            postings = self._gram_postings.get(gram, ())
+            if len(postings) > max_postings:
+                continue
+            for idx in postings:
+                shared[idx] += 1
+        candidates = heapq.nlargest(RERANK_CANDIDATES, shared, key=shared.__getitem__)
+
+        # With a single result wanted, candidates must beat the best score so far
+        floor = threshold
+        if limit == 1 and scores:
+            floor = max(floor, max(scores.values()))
+
+        compact_query = key.replace(" ", "")
+        for idx in candidates:
+            if idx in scores:
+                continue
+            compact_name = self._keys[idx].replace(" ", "")
+            if len(compact_name) < MIN_FUZZY_LENGTH:
+                continue
+            score = self._edit_similarity(compact_name, compact_query, floor)
+            width = len(self._token_sets[idx])
+            if len(query_tokens) > width:
+                for start in range(len(query_tokens) - width + 1):
+                    window = "".join(query_tokens[start:start + width])
+                    score = max(score, PARTIAL_MATCH_FACTOR * self._edit_similarity(
+                        compact_name, window, floor / PARTIAL_MATCH_FACTOR))
+            if score > 0.0:
+                scores[idx] = score
+
+        ranked = sorted(
+            ((self.names[idx], score) for idx, score in scores.items() if score >= threshold),
+            key=lambda item: (-item[1], item[0]),
+        )
+        return ranked[:limit]
+
+    @staticmethod
+    def _edit_similarity(a: str, b: str, threshold: float) -> float:
+        """SequenceMatcher ratio, skipping the full computation when it cannot reach threshold."""
+        matcher = SequenceMatcher(None, a, b, autojunk=False)
+        if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+            return 0.0
+        return matcher.ratio()
+
+    def best_match(self, text: str, threshold: float) -> Optional[Tuple[str, float]]:
+        """Best (name, score) at or above threshold, or None."""
+        hits = self.search(text, limit=1, threshold=threshold)
+        return hits[0] if hits else None
@@ -0,0 +1,100 @@
+"""
+Keyword Matcher
+Aho–Corasick automaton that finds many keywords in one pass over a normalized name.
+"""
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Tuple
+
+from .canonical import canonicalize
+
+# Match modes
+WORD = "word"      # keyword must be a whole word ("college")
+PREFIX = "prefix"  # keyword must start a word, compounds allowed ("universit" in "universitatsklinikum")
+
+MATCH_MODES = (WORD, PREFIX)
+
+
+class KeywordHit(NamedTuple):
+    """One keyword occurrence in the scanned text."""
+    keyword: str
+    category: str
+    start: int
+    end: int
+
+
+class KeywordMatcher:
+    """Precompiled multi-keyword matcher over canonical text (see canonicalize().text).
+
+    Scan cost depends on the length of the text and the number of hits, not on
+    the number of keywords, so keyword lists can grow per country for free.
+    """
+
+    def __init__(self, keywords: Iterable[Tuple[str, str, str]]):
+        """
+        Args:
+            keywords: (keyword, category, mode) triples; keywords are normalized
+                      like the scanned text, mode is WORD or PREFIX.
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, str, str, str]]] = [[]]
+        self.size = 0
+
+        for keyword, category, mode in keywords:
+            if mode not in MATCH_MODES:
+                raise ValueError(f"Unknown keyword match mode: {mode}")
+            normalized = canonicalize(keyword).text
+            if normalized:
+                self._add(normalized, category, mode)
+        self._build_failure_links()
+
+    def _add(self, keyword: str, category: str, mode: str) -> None:
+        state = 0
+        for ch in keyword:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        entry = (len(keyword), keyword, category, mode)
+        if entry not in self._out[state]:
+            self._out[state].append(entry)
+            self.size += 1
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                self._out[nxt].extend(self._out[self._fail[nxt]])
+
+    def find_all(self, text: str) -> List[KeywordHit]:
+        """Every keyword hit in text (already canonical: lowercase ASCII words, single spaces)."""
+        hits: List[KeywordHit] = []
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        last = len(text) - 1
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, keyword, category, mode in out[state]:
+                start = i - length + 1
+                if start > 0 and text[start - 1] != " ":
+                    continue
+                if mode == WORD and i < last and text[i + 1] != " ":
+                    continue
+                hits.append(KeywordHit(keyword, category, start, i + 1))
+        return hits
+
+    def categories(self, text: str) -> FrozenSet[str]:
+        """Categories with at least one hit in text."""
+        return frozenset(hit.category for hit in self.find_all(text))
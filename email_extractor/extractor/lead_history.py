@@ -0,0 +1,243 @@
+"""
+Lead History
+Persistent index of the leads in past output workbooks and stored runs, used to
+spot leads that were already handled and duplicates within a run.
+"""
+import glob
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+from .run_store import DEFAULT_STORE_PATH
+
+# extractor/ -> email_extractor/cache/lead_history.sqlite3
+DEFAULT_HISTORY_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "cache", "lead_history.sqlite3")
+
+HISTORY_SHEETS = ("Validation", "Review")
+
+# Lead identity columns: a lead is known if its email or lifecycle ID was seen on another email item
+KEY_COLUMNS = {"email": "Email Address", "lifecycle_id": "Lead Lifecycle ID"}
+INDEX_COLUMNS = ["EntryID", "ReceivedTime"] + list(KEY_COLUMNS.values())
+
+# SQLite limits the number of bound parameters per statement
+_BATCH_SIZE = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    source    TEXT PRIMARY KEY,
+    signature TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS leads (
+    source        TEXT NOT NULL,
+    entry_id      TEXT,
+    email         TEXT,
+    lifecycle_id  TEXT,
+    received_time TEXT
+);
+CREATE INDEX IF NOT EXISTS leads_source ON leads(source);
+CREATE INDEX IF NOT EXISTS leads_email ON leads(email);
+CREATE INDEX IF NOT EXISTS leads_lifecycle ON leads(lifecycle_id);
+"""
+
+
+class Sighting(NamedTuple):
+    """An earlier occurrence of a lead."""
+    key: str            # "email" or "lifecycle_id"
+    source: str         # workbook file name or "run:<run_id>"
+    received_time: str
+
+
+def _text(value) -> str:
+    if value is None or (isinstance(value, float) and value != value):
+        return ""
+    return str(value).strip()
+
+
+def _normalize(kind: str, value) -> str:
+    text = _text(value)
+    return text.lower() if kind == "email" else text
+
+
+def output_workbooks(directory: str) -> List[str]:
+    """Output workbooks in directory, oldest first (Excel lock files excluded)."""
+    paths = [p for p in glob.glob(os.path.join(directory, "*.xlsx"))
+             if not os.path.basename(p).startswith("~$")]
+    return sorted(paths, key=os.path.getmtime)
+
+
+def read_history_sheets(path: str, columns: Iterable[str],
+                        sheet_names: Iterable[str] = HISTORY_SHEETS) -> Dict[str, pd.DataFrame]:
+    """The given columns (those present) of each history sheet of a workbook, as text."""
+    wanted = set(columns)
+    frames = {}
+    with pd.ExcelFile(path) as workbook:
+        for name in sheet_names:
+            if name in workbook.sheet_names:
+                frames[name] = workbook.parse(name, usecols=lambda col: col in wanted, dtype=str)
+    return frames
+
+
+def file_signature(path: str) -> str:
+    stat = os.stat(path)
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+class LeadHistory:
+    """Index of past leads by email address and Lead Lifecycle ID (and their EntryID).
+
+    refresh() indexes workbooks and stored runs incrementally: a source is read again
+    only when it is new or its file changed. A lead counts as known when its email
+    or lifecycle ID was seen on a different email item (EntryID) received earlier, so
+    re-extracting the same mail never flags it.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: SQLite file; None uses DEFAULT_HISTORY_PATH, ":memory:" for a throwaway index.
+        """
+        self.path = path or DEFAULT_HISTORY_PATH
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    # Indexing
+    def refresh(self, output_dir: str, run_store_path: Optional[str] = DEFAULT_STORE_PATH) -> int:
+        """Index new or changed workbooks in output_dir and new runs of the run store.
+
+        Returns the number of sources (re)indexed. Unreadable sources are skipped with a warning.
+        """
+        with self._lock:
+            known = dict(self._conn.execute("SELECT source, signature FROM sources"))
+
+        indexed = 0
+        for path in output_workbooks(output_dir):
+            source = os.path.basename(path)
+            signature = file_signature(path)
+            if known.get(source) == signature:
+                continue
+            try:
+                frames = read_history_sheets(path, INDEX_COLUMNS)
+            except Exception as e:
+                print(f"⚠ Could not index {source}: {e}")
+                continue
+            self._replace_source(source, signature, pd.concat(list(frames.values()) or [pd.DataFrame()]))
+            indexed += 1
+
+        if run_store_path and os.path.exists(run_store_path):
+            indexed += self._index_runs(run_store_path, known)
+        return indexed
+
+    def _index_runs(self, run_store_path: str, known: Dict[str, str]) -> int:
+        """Index finished runs of the run store that are not indexed yet."""
+        try:
+            conn = sqlite3.connect(run_store_path, timeout=10)
+            try:
+                run_ids = [r for (r,) in conn.execute("SELECT run_id FROM runs WHERE finished_at IS NOT NULL")
+                           if f"run:{r}" not in known]
+                for run_id in run_ids:
+                    rows = conn.execute(
+                        "SELECT entry_id, email, json_extract(data, '$.\"Lead Lifecycle ID\"'), received_time"
+                        " FROM leads WHERE run_id = ?", (run_id,)
+                    ).fetchall()
+                    df = pd.DataFrame(rows, columns=["EntryID", "Email Address", "Lead Lifecycle ID", "ReceivedTime"])
+                    self._replace_source(f"run:{run_id}", "run", df)
+            finally:
+                conn.close()
+        except Exception as e:
+            print(f"⚠ Could not index the run store: {e}")
+            return 0
+        return len(run_ids)
+
+    def _replace_source(self, source: str, signature: str, df: pd.DataFrame) -> None:
+        rows = []
+        for row in df.reindex(columns=INDEX_COLUMNS).itertuples(index=False, name=None):
+            entry_id, received, email, lifecycle_id = row
+            email, lifecycle_id = _normalize("email", email), _normalize("lifecycle_id", lifecycle_id)
+            if email or lifecycle_id:
+                rows.append((source, _text(entry_id), email, lifecycle_id, _text(received)))
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM leads WHERE source = ?", (source,))
+            self._conn.executemany(
+                "INSERT INTO leads (source, entry_id, email, lifecycle_id, received_time) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.execute("INSERT OR REPLACE INTO sources (source, signature) VALUES (?, ?)",
+                               (source, signature))
+
+    # Lookups
+    def _sightings(self, kind: str, values: Iterable[str]) -> Dict[str, List[Tuple[str, str, str]]]:
+        """value -> [(entry_id, received_time, source)] for the given key values."""
+        values = [v for v in dict.fromkeys(values) if v]
+        found: Dict[str, List[Tuple[str, str, str]]] = {}
+        with self._lock:
+            for start in range(0, len(values), _BATCH_SIZE):
+                batch = values[start:start + _BATCH_SIZE]
+                marks = ",".join("?" * len(batch))
+                for value, entry_id, received, source in self._conn.execute(
+                    f"SELECT {kind}, entry_id, received_time, source FROM leads WHERE {kind} IN ({marks})", batch
+                ):
+                    found.setdefault(value, []).append((entry_id, received, source))
+        return found
+
+    def find_known(self, df: pd.DataFrame) -> List[Optional[Sighting]]:
+        """Latest earlier sighting of each row's lead on another email item, or None."""
+        keys = {kind: [_normalize(kind, v) for v in df.get(column, pd.Series([""] * len(df)))]
+                for kind, column in KEY_COLUMNS.items()}
+        sightings = {kind: self._sightings(kind, values) for kind, values in keys.items()}
+        entry_ids = [_text(v) for v in df.get("EntryID", pd.Series([""] * len(df)))]
+        received = [_text(v) for v in df.get("ReceivedTime", pd.Series([""] * len(df)))]
+
+        results: List[Optional[Sighting]] = []
+        for i in range(len(df)):
+            latest: Optional[Sighting] = None
+            for kind in KEY_COLUMNS:
+                for entry_id, seen_at, source in sightings[kind].get(keys[kind][i], ()):
+                    if entry_ids[i] and entry_id == entry_ids[i]:
+                        continue  # the same email item, extracted before
+                    if received[i] and seen_at and seen_at >= received[i]:
+                        continue  # seen only after this lead arrived
+                    if latest is None or seen_at > latest.received_time:
+                        latest = Sighting(kind, source, seen_at)
+            results.append(latest)
+        return results
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            sources, leads = self._conn.execute(
+                "SELECT (SELECT COUNT(*) FROM sources), (SELECT COUNT(*) FROM leads)").fetchone()
+        return {"sources": sources, "leads": leads}
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def find_duplicates(df: pd.DataFrame) -> List[Optional[int]]:
+    """Per row, the position of the earliest row of this run with the same email or
+    lifecycle ID (None for first occurrences). Rows are ordered by ReceivedTime."""
+    received = [_text(v) for v in df.get("ReceivedTime", pd.Series([""] * len(df)))]
+    order = sorted(range(len(df)), key=lambda i: (received[i] or "~", i))
+    first_seen: Dict[Tuple[str, str], int] = {}
+    duplicates: List[Optional[int]] = [None] * len(df)
+    for kind, column in KEY_COLUMNS.items():
+        values = [_normalize(kind, v) for v in df.get(column, pd.Series([""] * len(df)))]
+        for i in order:
+            if not values[i]:
+                continue
+            first = first_seen.setdefault((kind, values[i]), i)
+            if first != i and duplicates[i] is None:
+                duplicates[i] = first
+    return duplicates
+
+
+def describe(sighting: Sighting) -> str:
+    """Human readable note for the Action Taken column."""
+    key = "email address" if sighting.key == "email" else "Lead Lifecycle ID"
+    when = f" on {sighting.received_time}" if sighting.received_time else ""
+    return f"Lead already known - same {key} in {sighting.source}{when}"
@@ -3,8 +3,10 @@ Email Parser
 Parses Outlook email items into structured data.
 """
 import re
-from typing import Dict
+from typing import Dict, List
 from urllib.parse import urlparse, parse_qs, unquote
+
+import pandas as pd
 try:
     from bs4 import BeautifulSoup
     HAS_BS4 = True
@@ -47,21 +49,111 @@ FIELDS = [
 ]
 
 
+# Link columns and the columns holding their resolved (post-redirect) URLs
+RESOLVED_LINK_COLUMNS = {
+    "PreMQL review/validation link": "PreMQL Final URL",
+    "Eloqua Profiler": "Eloqua Profiler Final URL",
+}
+
+
 class EmailParser:
     """Parse Outlook email items into structured data."""
     
-    def __init__(self, university_detector=None, validation_loader=None):
+    def __init__(self, university_detector=None, validation_loader=None, redirect_resolver=None):
         """Initialize parser.
         
         Args:
             university_detector: UniversityDetector instance
             validation_loader: ValidationDataLoader instance
+            redirect_resolver: Optional RedirectResolver; parse_emails then adds
+                               the final URL of each tracking link
         """
         self.university_detector = university_detector
         self.validation_loader = validation_loader
+        self.redirect_resolver = redirect_resolver
     
     def parse_email(self, email_item) -> Dict[str, str]:
         """Parse Outlook email item into structured data."""
+        row = self._extract_row(email_item)
+        
+        # Get key fields for validation
+        company = row.get("Company", "")
+        country = row.get("Country", "")
+        email = row.get("Email Address", "")
+        
+        # Run validation checks
+        if self.validation_loader:
+            self._apply_validation(row, self.validation_loader.validate_lead(company, country, email))
+        
+        # Check for university (only if not already marked invalid)
+        if row.get("Status", "") == "" and self.university_detector:
+            self._apply_university(row, self.university_detector.is_university(company, country, email))
+        
+        self._apply_defaults(row)
+        return row
+    
+    def parse_emails(self, email_items) -> List[Dict[str, str]]:
+        """Parse many email items, validating each distinct lead key only once.
+        
+        Produces the same rows as calling parse_email on every item, but runs the
+        validation and university checks through their batched APIs.
+        """
+        rows = [self._extract_row(item) for item in email_items]
+        if not rows:
+            return rows
+        
+        self.apply_checks(rows)
+        for row in rows:
+            self._apply_defaults(row)
+        
+        if self.redirect_resolver:
+            self.resolve_links(rows)
+        return rows
+    
+    def apply_checks(self, rows: List[Dict[str, str]]) -> None:
+        """Run the validation and university checks on rows (in place), each distinct
+        lead key once. Sets Validation Status/Reason, and Status/Action Taken of the
+        rows a check flags."""
+        if not rows:
+            return
+        leads = pd.DataFrame(
+            [(r.get("Company", ""), r.get("Country", ""), r.get("Email Address", "")) for r in rows],
+            columns=["Company", "Country", "Email Address"],
+        )
+        
+        if self.validation_loader:
+            results = self.validation_loader.validate_many(
+                leads["Company"], leads["Country"], leads["Email Address"]
+            )
+            for row, result in zip(rows, results.to_dict("records")):
+                self._apply_validation(row, result)
+        
+        if self.university_detector:
+            pending = [i for i, row in enumerate(rows) if row.get("Status", "") == ""]
+            if pending:
+                subset = leads.iloc[pending]
+                results = self.university_detector.is_university_many(
+                    subset["Company"], subset["Country"], subset["Email Address"]
+                )
+                for i, result in zip(pending, results.to_dict("records")):
+                    self._apply_university(rows[i], result)
+    
+    def resolve_links(self, rows: List[Dict[str, str]]) -> None:
+        """Add the final URL of every tracking link (unique links resolved concurrently)."""
+        links = {row.get(col, "") for row in rows for col in RESOLVED_LINK_COLUMNS}
+        links = {link for link in links if link.startswith("http")}
+        if not links:
+            return
+        
+        print(f"Resolving {len(links)} tracking links...")
+        final_urls = self.redirect_resolver.resolve_many(links)
+        for row in rows:
+            for col, final_col in RESOLVED_LINK_COLUMNS.items():
+                link = row.get(col, "")
+                row[final_col] = final_urls.get(link, link)
+    
+    def _extract_row(self, email_item) -> Dict[str, str]:
+        """Extract raw fields from an email item (no validation)."""
         subject = getattr(email_item, "Subject", "") or ""
         sender = getattr(email_item, "SenderEmailAddress", "") or ""
         received = getattr(email_item, "ReceivedTime", None)
@@ -94,41 +186,30 @@ class EmailParser:
         row["Has Contact Sales Form"] = self._check_contact_sales_form(
             row.get("Lead Triggering Activities", "")
         )
-        
-        # Get key fields for validation
-        company = row.get("Company", "")
-        country = row.get("Country", "")
-        email = row.get("Email Address", "")
-        
-        # Run validation checks
-        if self.validation_loader:
-            validation_result = self.validation_loader.validate_lead(company, country, email)
-            
-            if not validation_result["is_valid"]:
-                row["Status"] = validation_result["validation_type"]
-                row["Action Taken"] = validation_result["reason"]
-                row["Validation Status"] = "Invalid"
-                row["Validation Reason"] = validation_result["reason"]
-            else:
-                row["Validation Status"] = "Valid"
-                row["Validation Reason"] = validation_result.get("reason", "")
-        
-        # Check for university (only if not already marked invalid)
-        if row.get("Status", "") == "" and self.university_detector:
-            university_result = self.university_detector.is_university(company, country, email)
-            
-            if university_result["is_university"]:
-                row["Status"] = "University Contact"
-                row["Action Taken"] = f"Identified as university - {university_result['reason']}"
-        
+        return row
+    
+    def _apply_validation(self, row: Dict[str, str], validation_result: Dict) -> None:
+        if not validation_result["is_valid"]:
+            row["Status"] = validation_result["validation_type"]
+            row["Action Taken"] = validation_result["reason"]
+            row["Validation Status"] = "Invalid"
+            row["Validation Reason"] = validation_result["reason"]
+        else:
+            row["Validation Status"] = "Valid"
+            row["Validation Reason"] = validation_result.get("reason", "")
+    
+    def _apply_university(self, row: Dict[str, str], university_result: Dict) -> None:
+        if university_result["is_university"]:
+            row["Status"] = "University Contact"
+            row["Action Taken"] = f"Identified as university - {university_result['reason']}"
+    
+    def _apply_defaults(self, row: Dict[str, str]) -> None:
         # Default status if still empty
         if not row.get("Status"):
             row["Status"] = "Not Started"
         
         if not row.get("Action Taken"):
             row["Action Taken"] = ""
-        
-        return row
     
     def _check_contact_sales_form(self, triggering_activities: str) -> str:
         """Check if Lead Triggering Activities contains contact_sales_forms."""
@@ -0,0 +1,131 @@
+"""
+Redirect Resolver
+Follows tracking-link redirect chains (Eloqua, safelinks, ...) without loading the
+target pages, concurrently and with a persistent cache of final URLs.
+"""
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional
+from urllib.parse import urljoin, urlparse
+
+from .disk_cache import DiskCache
+
+try:
+    import requests
+    HAS_WEB = True
+except Exception:
+    HAS_WEB = False
+
+DAY = 24 * 60 * 60
+
+REDIRECT_NAMESPACE = "redirects"
+REDIRECT_TTL = 30 * DAY
+
+DEFAULT_TIMEOUT = 3.0
+DEFAULT_WORKERS = 8
+MAX_HOPS = 10
+
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+
+# Servers that reject HEAD; the hop is retried as a GET whose body is never read
+HEAD_UNSUPPORTED = {403, 405, 501}
+
+# A redirect to a sign-in page is not followed: the browser must start from the
+# page that asked for it, or it would lose the target after logging in
+LOGIN_HINTS = ("login", "logon", "signin", "sso", "oauth", "saml", "adfs", "auth")
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def is_login_url(url: str) -> bool:
+    """True if a host label or path segment of url starts with a sign-in hint."""
+    parsed = urlparse(url)
+    words = _WORD_RE.findall(f"{parsed.netloc} {parsed.path}".lower())
+    return any(word.startswith(LOGIN_HINTS) for word in words)
+
+
+class RedirectResolver:
+    """Resolve URLs to the end of their redirect chain.
+
+    Each hop is a HEAD request (GET if HEAD is refused) with redirects disabled, so
+    only headers are transferred. Resolution stops at the first non-redirect
+    response, at a sign-in redirect, or after MAX_HOPS. If a URL cannot be
+    resolved, the original URL is returned and nothing is cached.
+    """
+
+    def __init__(self, cache: Optional[DiskCache] = None, max_workers: int = DEFAULT_WORKERS,
+                 timeout: float = DEFAULT_TIMEOUT, max_hops: int = MAX_HOPS):
+        """
+        Args:
+            cache: Final-URL cache; None uses the default on-disk cache.
+            max_workers: Maximum number of chains resolved concurrently.
+            timeout: Connect/read timeout per request in seconds.
+            max_hops: Longest redirect chain followed.
+        """
+        self.cache = cache if cache is not None else DiskCache(REDIRECT_NAMESPACE, REDIRECT_TTL)
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_hops = max_hops
+        self._local = threading.local()
+
+    def resolve(self, url: str) -> str:
+        """Final URL of one link (cached)."""
+        return self.resolve_many([url]).get(url, url)
+
+    def resolve_many(self, urls: Iterable[str]) -> Dict[str, str]:
+        """Final URLs for several links; uncached chains are followed concurrently."""
+        urls = [u for u in dict.fromkeys(urls) if u and u.startswith("http")]
+        final_urls: Dict[str, str] = dict(self.cache.get_many(urls))
+        missing = [u for u in urls if u not in final_urls]
+        if not missing or not HAS_WEB:
+            return final_urls
+
+        workers = max(1, min(self.max_workers, len(missing)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="redirects") as pool:
+            resolved = list(pool.map(self._follow, missing))
+
+        to_cache = {}
+        for url, final in zip(missing, resolved):
+            final_urls[url] = final or url
+            if final:
+                to_cache[url] = final
+        try:
+            self.cache.set_many(to_cache)
+        except Exception as e:
+            print(f"⚠ Could not store resolved links: {e}")
+        return final_urls
+
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def _follow(self, url: str) -> Optional[str]:
+        """End of the redirect chain starting at url, or None on failure."""
+        current = url
+        try:
+            for _ in range(self.max_hops):
+                location = self._redirect_location(current)
+                if location is None:
+                    return current
+                target = urljoin(current, location)
+                if is_login_url(target):
+                    return current
+                current = target
+            return None  # chain too long (or a loop)
+        except Exception:
+            return None
+
+    def _redirect_location(self, url: str) -> Optional[str]:
+        """Location header if url answers with a redirect, else None."""
+        session = self._session()
+        resp = session.head(url, allow_redirects=False, timeout=self.timeout)
+        resp.close()
+        if resp.status_code in HEAD_UNSUPPORTED:
+            with session.get(url, allow_redirects=False, timeout=self.timeout, stream=True) as resp:
+                pass
+        if resp.status_code in REDIRECT_STATUSES:
+            return resp.headers.get("Location") or None
+        return None
@@ -0,0 +1,170 @@
+"""
+Rule Engine
+Ordered, declarative rule pipelines for lead classification.
+
+A pipeline is a fixed sequence of rules evaluated against a lead context; the
+first rule whose condition holds decides the lead. Every rule records how often
+it was evaluated, how often it decided, and the time spent in it, so the order
+can be tuned (cheap, high-hit rules first).
+"""
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from .batch import evaluate_unique
+
+Outcome = Union[Dict, Callable[["RuleContext"], Dict]]
+
+
+class RuleContext(dict):
+    """Facts about one lead; derived facts are computed on first access and kept."""
+
+    def __init__(self, facts: Dict, derived: Dict[str, Callable[["RuleContext"], object]]):
+        super().__init__(facts)
+        self._derived = derived
+
+    def __missing__(self, key):
+        derive = self._derived.get(key)
+        if derive is None:
+            raise KeyError(key)
+        value = derive(self)
+        self[key] = value
+        return value
+
+
+class Rule:
+    """A named condition and the outcome it produces when it holds.
+
+    Args:
+        name: Identifier shown in statistics and explanations.
+        when: Predicate over the context; None matches every lead (default rule).
+        then: Result dict (string values are formatted with the context, e.g.
+              "Direct account: {company}") or a callable returning the result.
+    """
+
+    def __init__(self, name: str, when: Optional[Callable[[RuleContext], bool]], then: Outcome):
+        self.name = name
+        self.when = when
+        self.then = then
+        self.evaluated = 0
+        self.hits = 0
+        self.elapsed = 0.0
+
+    def matches(self, ctx: RuleContext) -> bool:
+        started = time.perf_counter()
+        try:
+            return self.when is None or bool(self.when(ctx))
+        finally:
+            self.evaluated += 1
+            self.elapsed += time.perf_counter() - started
+
+    def outcome(self, ctx: RuleContext) -> Dict:
+        if callable(self.then):
+            return dict(self.then(ctx))
+        return {
+            key: value.format_map(ctx) if isinstance(value, str) else value
+            for key, value in self.then.items()
+        }
+
+
+class RulePipeline:
+    """An ordered list of rules compiled once and evaluated per lead or per batch."""
+
+    def __init__(self, name: str, rules: Iterable[Rule],
+                 derived: Optional[Dict[str, Callable[[RuleContext], object]]] = None):
+        self.name = name
+        self.rules: Tuple[Rule, ...] = tuple(rules)
+        self.derived = dict(derived or {})
+        if not self.rules or self.rules[-1].when is not None:
+            raise ValueError(f"Rule pipeline '{name}' must end with a default rule (when=None)")
+        names = [rule.name for rule in self.rules]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Rule pipeline '{name}' has duplicate rule names")
+
+    def context(self, **facts) -> RuleContext:
+        return RuleContext(facts, self.derived)
+
+    def decide(self, **facts) -> Tuple[Rule, Dict]:
+        """Return the deciding rule and its outcome for one lead."""
+        ctx = self.context(**facts)
+        for rule in self.rules:
+            if rule.matches(ctx):
+                rule.hits += 1
+                return rule, rule.outcome(ctx)
+        raise AssertionError("unreachable: pipeline ends with a default rule")
+
+    def evaluate(self, **facts) -> Dict:
+        """Evaluate one lead; the result carries the deciding rule under 'rule'."""
+        rule, result = self.decide(**facts)
+        result["rule"] = rule.name
+        return result
+
+    def evaluate_many(self, keys: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+        """Evaluate each distinct row of keys once (columns are fact names).
+
+        Returns the requested result columns plus 'rule', aligned with keys.index.
+        """
+        fact_names = list(keys.columns)
+
+        def evaluate_key(*values):
+            return self.evaluate(**dict(zip(fact_names, values)))
+
+        return evaluate_unique(keys, evaluate_key, list(columns) + ["rule"])
+
+    def reaches(self, rule_name: str, **facts) -> Optional[RuleContext]:
+        """Context of a lead if no rule before rule_name decides it, else None.
+
+        Lets callers prepare expensive facts only for the leads that need them;
+        like explain(), it does not touch statistics.
+        """
+        ctx = self.context(**facts)
+        for rule in self.rules:
+            if rule.name == rule_name:
+                return ctx
+            if rule.when is None or rule.when(ctx):
+                return None
+        raise KeyError(f"Rule pipeline '{self.name}' has no rule '{rule_name}'")
+
+    def explain(self, **facts) -> str:
+        """Describe, rule by rule, how a lead was decided (does not touch statistics)."""
+        ctx = self.context(**facts)
+        lines = [f"{self.name}:"]
+        for rule in self.rules:
+            if rule.when is None or rule.when(ctx):
+                lines.append(f"  ✓ {rule.name} → {rule.outcome(ctx)}")
+                break
+            lines.append(f"  ⊘ {rule.name}")
+        return "\n".join(lines)
+
+    def stats(self) -> pd.DataFrame:
+        """Per-rule evaluation counts, hit counts and cumulative time."""
+        return pd.DataFrame(
+            [
+                {
+                    "pipeline": self.name,
+                    "rule": rule.name,
+                    "evaluated": rule.evaluated,
+                    "hits": rule.hits,
+                    "time_ms": round(rule.elapsed * 1000, 3),
+                    "avg_us": round(rule.elapsed * 1e6 / rule.evaluated, 1) if rule.evaluated else 0.0,
+                }
+                for rule in self.rules
+            ],
+            columns=["pipeline", "rule", "evaluated", "hits", "time_ms", "avg_us"],
+        )
+
+    def reset_stats(self) -> None:
+        for rule in self.rules:
+            rule.evaluated = 0
+            rule.hits = 0
+            rule.elapsed = 0.0
+
+
+def print_rule_stats(*pipelines: RulePipeline) -> None:
+    """Print hit counts and timings for the given pipelines."""
+    print("\nRule statistics:")
+    for pipeline in pipelines:
+        print(f"  {pipeline.name}")
+        for row in pipeline.stats().itertuples(index=False):
+            print(f"    {row.rule:<28} hits {row.hits:>6} / {row.evaluated:<6} {row.time_ms:>9.3f} ms")
@@ -0,0 +1,243 @@
+"""
+Run Store
+SQLite archive of every extraction run: the rows of each sheet, their validation
+and enrichment columns, and later status updates. Workbooks are exports of it.
+"""
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from .domain_facts import email_domain
+
+# extractor/ -> email_extractor/output/run_store.sqlite3 (next to the exported workbooks)
+DEFAULT_STORE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "output", "run_store.sqlite3")
+
+# Lead fields kept in their own indexed columns for fast queries (the rest lives in 'data')
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id        TEXT PRIMARY KEY,
+    label         TEXT,
+    started_at    TEXT NOT NULL,
+    finished_at   TEXT,
+    workbook_path TEXT,
+    sheets        TEXT NOT NULL DEFAULT '{}'
+);
+CREATE TABLE IF NOT EXISTS leads (
+    run_id        TEXT NOT NULL REFERENCES runs(run_id),
+    sheet         TEXT NOT NULL,
+    row_index     INTEGER NOT NULL,
+    entry_id      TEXT,
+    email         TEXT,
+    domain        TEXT,
+    company       TEXT,
+    received_time TEXT,
+    status        TEXT,
+    data          TEXT NOT NULL,
+    PRIMARY KEY (run_id, sheet, row_index)
+);
+CREATE INDEX IF NOT EXISTS leads_entry_id ON leads(entry_id);
+CREATE INDEX IF NOT EXISTS leads_domain ON leads(domain, received_time);
+CREATE INDEX IF NOT EXISTS leads_company ON leads(company);
+CREATE INDEX IF NOT EXISTS leads_received ON leads(received_time);
+CREATE INDEX IF NOT EXISTS runs_workbook ON runs(workbook_path);
+"""
+
+LEAD_COLUMNS = ["run_id", "sheet", "row_index", "entry_id", "email", "domain",
+                "company", "received_time", "status"]
+
+# Dates and times are stored as {"$datetime": "<ISO>"} so exports write them as dates again
+DATETIME_TAG = "$datetime"
+
+
+def _clean(value):
+    """JSON-safe cell value (NaN/NaT/None -> None, datetimes -> tagged ISO text)."""
+    if value is None or value is pd.NaT or (isinstance(value, float) and value != value):
+        return None
+    if isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, datetime):
+        return {DATETIME_TAG: value.isoformat()}
+    return str(value)
+
+
+def _restore(obj: dict):
+    """json object_hook undoing the datetime tagging of _clean."""
+    if len(obj) == 1 and DATETIME_TAG in obj:
+        return datetime.fromisoformat(obj[DATETIME_TAG])
+    return obj
+
+
+def _field(value) -> str:
+    """Text of a cleaned value for the indexed lead columns."""
+    if isinstance(value, dict):
+        return value.get(DATETIME_TAG, "")
+    return "" if value is None else str(value)
+
+
+class RunStore:
+    """Queryable history of extraction runs, keyed by run ID, sheet and row (and EntryID)."""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: SQLite file; None uses DEFAULT_STORE_PATH, ":memory:" for a throwaway store.
+        """
+        self.path = path or DEFAULT_STORE_PATH
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    # Writing
+    def start_run(self, label: str = "") -> str:
+        """Register a new run and return its ID."""
+        started = datetime.now()
+        run_id = f"{started.strftime('%Y%m%d-%H%M%S-%f')}"
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO runs (run_id, label, started_at) VALUES (?, ?, ?)",
+                (run_id, label, started.isoformat(timespec="seconds")),
+            )
+        return run_id
+
+    def save_sheet(self, run_id: str, sheet: str, df: pd.DataFrame) -> int:
+        """Store (or replace) all rows of one sheet of a run, in order."""
+        columns = [str(col) for col in df.columns]
+        rows = []
+        for row_index, values in enumerate(df.itertuples(index=False, name=None)):
+            record = {col: _clean(value) for col, value in zip(columns, values)}
+            email = record.get("Email Address") or ""
+            rows.append((
+                run_id, sheet, row_index,
+                _field(record.get("EntryID")),
+                str(email).strip().lower(),
+                email_domain(email),
+                _field(record.get("Company")),
+                _field(record.get("ReceivedTime")),
+                _field(record.get("Status")),
+                json.dumps(record, ensure_ascii=False),
+            ))
+
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM leads WHERE run_id = ? AND sheet = ?", (run_id, sheet))
+            self._conn.executemany(
+                f"INSERT INTO leads ({', '.join(LEAD_COLUMNS)}, data) VALUES ({', '.join('?' * 10)})", rows
+            )
+            sheets = json.loads(self._conn.execute(
+                "SELECT sheets FROM runs WHERE run_id = ?", (run_id,)).fetchone()[0])
+            sheets[sheet] = columns
+            self._conn.execute("UPDATE runs SET sheets = ? WHERE run_id = ?", (json.dumps(sheets), run_id))
+        return len(rows)
+
+    def finish_run(self, run_id: str, workbook_path: Optional[str] = None) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE runs SET finished_at = ?, workbook_path = ? WHERE run_id = ?",
+                (datetime.now().isoformat(timespec="seconds"),
+                 os.path.abspath(workbook_path) if workbook_path else None, run_id),
+            )
+
+    def update_statuses(self, run_id: str, sheet: str, column: str, updates: Dict[int, str]) -> int:
+        """Set one column for the given row indexes of a stored sheet."""
+        path = "$." + json.dumps(column)
+        params = [(path, value, run_id, sheet, row_index) for row_index, value in updates.items()]
+        with self._lock, self._conn:
+            cursor = self._conn.executemany(
+                "UPDATE leads SET data = json_set(data, ?, ?) WHERE run_id = ? AND sheet = ? AND row_index = ?",
+                params,
+            )
+            if column == "Status":
+                self._conn.executemany(
+                    "UPDATE leads SET status = ? WHERE run_id = ? AND sheet = ? AND row_index = ?",
+                    [(value, run_id, sheet, row_index) for row_index, value in updates.items()],
+                )
+            sheets = json.loads(self._conn.execute(
+                "SELECT sheets FROM runs WHERE run_id = ?", (run_id,)).fetchone()[0])
+            if sheet in sheets and column not in sheets[sheet]:
+                sheets[sheet].append(column)
+                self._conn.execute("UPDATE runs SET sheets = ? WHERE run_id = ?", (json.dumps(sheets), run_id))
+        return cursor.rowcount
+
+    # Reading
+    def run_for_workbook(self, workbook_path: str) -> Optional[str]:
+        """ID of the latest run exported to workbook_path, if any."""
+        row = self._conn.execute(
+            "SELECT run_id FROM runs WHERE workbook_path = ? ORDER BY started_at DESC LIMIT 1",
+            (os.path.abspath(workbook_path),),
+        ).fetchone()
+        return row[0] if row else None
+
+    def runs(self) -> pd.DataFrame:
+        return self.query("SELECT run_id, label, started_at, finished_at, workbook_path FROM runs ORDER BY started_at")
+
+    def load_sheet(self, run_id: str, sheet: str) -> pd.DataFrame:
+        """A stored sheet as a DataFrame, with its original column order."""
+        row = self._conn.execute("SELECT sheets FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        columns = json.loads(row[0]).get(sheet, []) if row else []
+        records = [
+            json.loads(data, object_hook=_restore) for (data,) in self._conn.execute(
+                "SELECT data FROM leads WHERE run_id = ? AND sheet = ? ORDER BY row_index", (run_id, sheet))
+        ]
+        return pd.DataFrame(records, columns=columns or None)
+
+    def leads(self, domain: Optional[str] = None, company: Optional[str] = None,
+              entry_id: Optional[str] = None, since: Optional[str] = None,
+              until: Optional[str] = None, with_data: bool = False) -> pd.DataFrame:
+        """Leads across all runs, filtered on the indexed fields.
+
+        since/until compare against ReceivedTime ("YYYY-MM-DD[ HH:MM:SS]"; until is exclusive).
+        Example: leads(domain="bosch.com", since="2025-01-01", until="2025-04-01").
+        """
+        where: List[str] = []
+        params: List = []
+        for column, value in (("domain", domain), ("company", company), ("entry_id", entry_id)):
+            if value:
+                where.append(f"{column} = ?")
+                params.append(value.lower() if column == "domain" else value)
+        if since:
+            where.append("received_time >= ?")
+            params.append(since)
+        if until:
+            where.append("received_time < ?")
+            params.append(until)
+
+        select = ", ".join(LEAD_COLUMNS + (["data"] if with_data else []))
+        sql = f"SELECT {select} FROM leads"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        return self.query(sql + " ORDER BY received_time, run_id, row_index", params)
+
+    def query(self, sql: str, params: Sequence = ()) -> pd.DataFrame:
+        """Run a read-only SQL query against the store."""
+        with self._lock:
+            return pd.read_sql_query(sql, self._conn, params=list(params))
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def record_workbook_statuses(workbook_path: str, staged: Dict[Tuple[str, str], Dict[int, str]],
+                             store_path: Optional[str] = None) -> int:
+    """Mirror status-column updates made to an exported workbook into its run (best effort).
+
+    Returns the number of stored rows updated (0 if the workbook is not from a stored run).
+    """
+    path = store_path or DEFAULT_STORE_PATH
+    if not os.path.exists(path):
+        return 0
+    store = RunStore(path)
+    try:
+        run_id = store.run_for_workbook(workbook_path)
+        if run_id is None:
+            return 0
+        return sum(store.update_statuses(run_id, sheet, column, values)
+                   for (sheet, column), values in staged.items())
+    finally:
+        store.close()
@@ -0,0 +1,128 @@
+"""
+SAP Sold-to Cache
+Persistent cache of SAP CRM Sold-to-Party lookups by canonical company name,
+seeded from the Sold-to-Party Name column of past output workbooks.
+"""
+import os
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+from .canonical import GENERIC_COMPANY_WORDS, canonicalize
+from .disk_cache import DiskCache
+from .lead_history import file_signature, output_workbooks, read_history_sheets
+
+DAY = 24 * 60 * 60
+
+SOLD_TO_NAMESPACE = "sap_sold_to"
+SEEDED_NAMESPACE = "sap_sold_to_seeded"
+
+# Sold-to assignments change rarely; companies without a registration may get one soon
+HIT_TTL = 90 * DAY
+MISS_TTL = 7 * DAY
+# Names copied from past workbooks were not checked against SAP; a real lookup replaces them soon
+SEEDED_TTL = 14 * DAY
+SEEDED_SOURCE_TTL = 365 * DAY
+
+# Single-word names this short are too ambiguous to seed ("art", "sbp")
+MIN_SEED_WORD_LENGTH = 4
+
+SEED_COLUMNS = ["Company", "Sold-to-Party Name"]
+
+
+def company_key(company) -> str:
+    """Cache key of a company name ('' if it has no usable words)."""
+    forms = canonicalize(company)
+    return forms.key or forms.text
+
+
+def is_seedable(key: str) -> bool:
+    """Whether a workbook's Sold-to name for this company key may be trusted as a cache entry."""
+    words = key.split()
+    if not words or all(word in GENERIC_COMPANY_WORDS for word in words):
+        return False
+    return len(words) > 1 or len(words[0]) >= MIN_SEED_WORD_LENGTH
+
+
+class SoldToCache:
+    """Sold-to-Party results per canonical company name.
+
+    Each entry holds the Sold-to-Party Name (None for a confirmed miss), the
+    search candidate that matched and when the lookup was made. Hits and misses
+    expire after HIT_TTL and MISS_TTL.
+    """
+
+    def __init__(self, cache: Optional[DiskCache] = None, seeded: Optional[DiskCache] = None):
+        """
+        Args:
+            cache: Result cache; None uses the default on-disk cache.
+            seeded: Record of the workbooks already used for seeding; None uses the default on-disk cache.
+        """
+        self.cache = cache if cache is not None else DiskCache(SOLD_TO_NAMESPACE, HIT_TTL)
+        self.seeded = seeded if seeded is not None else DiskCache(SEEDED_NAMESPACE, SEEDED_SOURCE_TTL)
+
+    def get(self, company: str) -> Optional[dict]:
+        """Cached entry for company, or None if it was never looked up (or expired)."""
+        key = company_key(company)
+        return self.cache.get(key) if key else None
+
+    def get_many(self, companies: Iterable[str]) -> Dict[str, Optional[str]]:
+        """company -> cached Sold-to-Party Name (None for a cached miss); uncached companies are left out."""
+        keys = {company: company_key(company) for company in companies}
+        entries = self.cache.get_many(k for k in keys.values() if k)
+        return {company: entries[key]["sold_to"] for company, key in keys.items() if key in entries}
+
+    def record(self, company: str, sold_to: Optional[str], candidate: Optional[str] = None) -> None:
+        """Store the result of a completed lookup."""
+        key = company_key(company)
+        if not key:
+            return
+        entry = {
+            "company": company,
+            "sold_to": sold_to or None,
+            "candidate": candidate,
+            "looked_up_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        self.cache.set(key, entry, HIT_TTL if sold_to else MISS_TTL)
+
+    def seed_from_workbooks(self, output_dir: str, skip_values: Iterable[str] = ()) -> int:
+        """Add the Sold-to names of past output workbooks for companies not cached yet.
+
+        Newer workbooks are read first, and existing entries are never overwritten.
+        Seeded entries expire after SEEDED_TTL, and generic or very short names
+        (see is_seedable) are skipped. Each workbook is read once (again only if
+        it changes). Returns the number of companies added.
+        """
+        skip = {""} | set(skip_values)
+        added = 0
+        for path in reversed(output_workbooks(output_dir)):
+            source = os.path.basename(path)
+            signature = file_signature(path)
+            if self.seeded.get(source) == signature:
+                continue
+            try:
+                frames = read_history_sheets(path, SEED_COLUMNS)
+            except Exception as e:
+                print(f"⚠ Could not read Sold-to names from {source}: {e}")
+                continue
+
+            found: Dict[str, dict] = {}
+            for frame in frames.values():
+                if not set(SEED_COLUMNS).issubset(frame.columns):
+                    continue
+                for company, sold_to in frame[SEED_COLUMNS].dropna().itertuples(index=False, name=None):
+                    sold_to = str(sold_to).strip()
+                    key = company_key(company)
+                    if is_seedable(key) and sold_to not in skip:
+                        found.setdefault(key, {
+                            "company": str(company).strip(),
+                            "sold_to": sold_to,
+                            "candidate": None,
+                            "looked_up_at": None,
+                            "seeded_from": source,
+                        })
+            cached = self.cache.get_many(found)
+            new = {key: entry for key, entry in found.items() if key not in cached}
+            self.cache.set_many(new, SEEDED_TTL)
+            self.seeded.set(source, signature)
+            added += len(new)
+        return added
@@ -3,16 +3,20 @@ SAP CRM Lookup helper
 - Open SAP CRM
 - Navigate to Design Registrations (outer CRMApplicationFrame)
 - For each company:
-  - Switch to search form frame, click Clear, operator='contains', fill End Customer Name
-  - Trigger Search (click + Enter)
-  - Switch to results frame and wait for table / 'No result found'
-  - Go to last page; pick most recent 'Approved' Sold-to-Party Name; if none, step back
+  - Run one broad 'contains' search and match the name candidates against its rows (SearchPlan)
+  - Per search: switch to search form frame, set operator (with Clear) only if it changed,
+    fill End Customer Name, trigger Search, wait for table / 'No result found'
+  - Candidates the broad search cannot answer are searched one by one: sort by Registration
+    Date (newest first) and pick the first 'Approved' Sold-to-Party Name; if sorting fails,
+    go to last page, pick most recent 'Approved', if none, step back
   - If nothing found across candidates, return None (Excel leaves cell empty)
 """
+import threading
 import time
 from pathlib import Path
-from typing import Optional, List, Dict, Tuple
+from typing import Optional, List, Dict, NamedTuple, Set
 from datetime import datetime
+from urllib.parse import urlparse
 
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
@@ -24,24 +28,96 @@ from selenium.webdriver.common.keys import Keys
 
 from webdriver_manager.chrome import ChromeDriverManager
 
+from .sap_cache import SoldToCache
+from .sap_http import (
+    CUSTOMER_HEADERS, SOLD_TO_HEADERS, ResultPage, ResultRow, SAPHttpSearch, SearchTemplate,
+    is_newest_first, latest_approved,
+)
+from .sap_search_plan import MAX_FIELD_LEN, OPERATOR_LABELS, Search, SearchPlan
+
 SAP_URL = "https://sappc1lb.eu.infineon.com/sap(bD1lbiZjPTEwMCZkPW1pbg==)/bc/bsp/sap/crm_ui_start/default.htm"
 
-MAX_FIELD_LEN = 40
 MAX_PAGES_BACKWARD = 3
+# Result pages read for a broad search that cannot be sorted before falling back to one search per candidate
+MAX_PLAN_PAGES = 3
+
+FORWARD_XPATH = "//a[normalize-space()='Forward' or normalize-space()='>' or contains(normalize-space(),'Forward')]"
 WAIT_SHORT = 3
 WAIT_MED = 12
 
-COMPANY_SUFFIXES = {
-    "gmbh", "ag", "se", "ltd", "limited", "inc", "corp", "corporation",
-    "llc", "plc", "sa", "srl", "bv", "nv", "kg", "ohg", "gbr",
-    "co", "company", "group", "holding", "holdings", "international"
+# Serializes the search form around the End Customer Name input (run in the search frame)
+CAPTURE_SEARCH_FORM_JS = """
+var find = function(xp) {
+    return document.evaluate(xp, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+};
+var input = find("//input[@title='Enter the value of criterion End Customer Name']");
+if (!input || !input.form) { return null; }
+var form = input.form;
+var fields = [];
+for (var i = 0; i < form.elements.length; i++) {
+    var el = form.elements[i];
+    if (!el.name || el.disabled || ['button', 'submit', 'file', 'reset'].indexOf(el.type) >= 0) { continue; }
+    if ((el.type === 'checkbox' || el.type === 'radio') && !el.checked) { continue; }
+    fields.push([el.name, el.value]);
 }
+var op = find("//input[@title='Choose the operator of criterion End Customer Name']");
+var key = (op && document.getElementById(op.id + '__key')) || find("//input[contains(@id,'OPERATOR__key') and @name]");
+var search = find("//a[.//b[normalize-space()='Search']]");
+return {action: form.action, fields: fields, value: input.name, operator: key ? key.name : '',
+        onclick: search ? (search.getAttribute('onclick') || '') : ''};
+"""
+
+# Fields accepted by WebDriver.add_cookie
+COOKIE_FIELDS = {"name", "value", "path", "domain", "secure", "httpOnly", "expiry", "sameSite"}
+
+# Cookies shared with the other browser sessions of a pool: the SSO logon ticket only.
+# Stateful WebUI session cookies stay with the session that created them.
+SSO_COOKIE_NAMES = {"MYSAPSSO2"}
+SERVER_SESSION_COOKIE_PREFIXES = ("SAP_SESSIONID", "sap-contextid")
+
+DEFAULT_POOL_SIZE = 3
+# Attempts per company when only one session is left (it is restarted in between)
+SINGLE_SESSION_ATTEMPTS = 2
+
+
+def sso_cookies(cookies: List[dict]) -> List[dict]:
+    return [c for c in cookies if c.get("name") in SSO_COOKIE_NAMES]
+
+
+def server_session_ids(cookies: List[dict]) -> Set[str]:
+    """Values of the cookies that identify a server-side WebUI session."""
+    return {c.get("value", "") for c in cookies
+            if str(c.get("name", "")).startswith(SERVER_SESSION_COOKIE_PREFIXES)}
+
+
+class LookupResult(NamedTuple):
+    sold_to: Optional[str]     # None if no Approved registration was found
+    candidate: Optional[str]   # search term that produced sold_to
+    completed: bool            # False if the search form could not be used (result not cached)
+
+
+class _SearchFormUnavailable(RuntimeError):
+    pass
 
 
 class SAPCRMLookup:
-    def __init__(self, headless: bool = False):
+    def __init__(self, headless: bool = False, sold_to_cache: Optional[SoldToCache] = None,
+                 http_mode: bool = False):
+        """
+        Args:
+            headless: Run Chrome headless.
+            sold_to_cache: Persistent result cache shared across runs.
+            http_mode: Run searches as direct HTTP requests with the browser's session
+                       (see SAPHttpSearch), falling back to the UI when that fails.
+        """
         self.headless = headless
         self.driver: Optional[WebDriver] = None
+        self.sold_to_cache = sold_to_cache
+        self.http_mode = http_mode
+        self.http: Optional[SAPHttpSearch] = None
+        self.round_trips = 0
+        # Operator the search form is known to be set to (None after navigation)
+        self._form_operator: Optional[str] = None
         self._cache: Dict[str, Optional[str]] = {}
 
     def start(self):
@@ -67,6 +143,26 @@ class SAPCRMLookup:
         except Exception:
             pass
 
+    def export_cookies(self) -> List[dict]:
+        """Cookies of the authenticated session, for other browser sessions."""
+        return self.driver.get_cookies() if self.driver else []
+
+    def import_cookies(self, cookies: List[dict]) -> None:
+        """Install another session's cookies (call after start(), before navigating)."""
+        d = self.driver
+        parsed = urlparse(SAP_URL)
+        d.get(f"{parsed.scheme}://{parsed.netloc}/")
+        for cookie in cookies:
+            cookie = {k: v for k, v in cookie.items() if k in COOKIE_FIELDS}
+            try:
+                d.add_cookie(cookie)
+            except Exception:
+                cookie.pop("domain", None)
+                try:
+                    d.add_cookie(cookie)
+                except Exception:
+                    pass
+
     def stop(self):
         if self.driver:
             try:
@@ -132,6 +228,30 @@ class SAPCRMLookup:
             self._dump_frame_tree("sap_frames.txt")
             raise RuntimeError("Could not locate 'End Customer Name' input")
 
+        self._form_operator = None
+        if self.http_mode:
+            self._enable_http_search()
+
+    def capture_search_template(self) -> Optional[SearchTemplate]:
+        """The search form of the current frame as submitted by the browser, or None."""
+        try:
+            form = self.driver.execute_script(CAPTURE_SEARCH_FORM_JS)
+        except Exception:
+            return None
+        if not form or not form.get("action") or not form.get("operator"):
+            return None
+        return SearchTemplate(form["action"], [tuple(f) for f in form["fields"]],
+                              form["value"], form["operator"], form.get("onclick", ""))
+
+    def _enable_http_search(self) -> None:
+        template = self.capture_search_template()
+        if template is None:
+            print("⚠ SAP CRM: search form not captured; using the browser for searches")
+            self.http = None
+            return
+        self.http = SAPHttpSearch(template, self.export_cookies())
+        print("SAP CRM: direct HTTP search enabled")
+
     # ---------------- Frame utilities ----------------
 
     def _switch_into_crm_root_frame(self, timeout: int = 30) -> bool:
@@ -296,66 +416,113 @@ class SAPCRMLookup:
     # ---------------- Lookup flow ----------------
 
     def lookup(self, company_name: str) -> Optional[str]:
+        return self.lookup_result(company_name).sold_to
+
+    def lookup_result(self, company_name: str) -> LookupResult:
+        """Like lookup(), but also tells whether the search could be completed."""
         key = (company_name or "").strip()
         if not key:
-            return None
+            return LookupResult(None, None, True)
         if key in self._cache:
-            return self._cache[key]
+            return LookupResult(self._cache[key], None, True)
+        if self.sold_to_cache is not None:
+            entry = self.sold_to_cache.get(key)
+            if entry is not None:
+                self._cache[key] = entry["sold_to"]
+                return LookupResult(entry["sold_to"], entry.get("candidate"), True)
 
         result = self._lookup_internal(company_name)
-        self._cache[key] = result
+        if result.completed:
+            self._cache[key] = result.sold_to
+            if self.sold_to_cache is not None:
+                try:
+                    self.sold_to_cache.record(key, result.sold_to, result.candidate)
+                except Exception as e:
+                    print(f"⚠ Could not store SAP result for '{key}': {e}")
         return result
 
-    def _lookup_internal(self, company_name: str) -> Optional[str]:
-        # Try contains with progressively shorter candidates
-        for cand in self._generate_candidates(company_name):
-            # Ensure we are in the search form frame
-            if not self._switch_to_frame_with_element_kept(
-                ["//input[@title='Enter the value of criterion End Customer Name']"], timeout=WAIT_MED
-            ):
-                return None
-            # Clear previous state and fill form
-            self._click_clear()
-            self._set_operator("contains", "CP")
-            self._fill_end_customer_name(cand)
-            # Trigger search (click + Enter fallback)
-            self._click_search()
-            self._press_enter_in_value_input()
-
-            # Switch to results frame
-            self._switch_to_results_frame()
-            # Wait for results
-            self._wait_for_results_ready(timeout=WAIT_MED)
-
-            # Find most recent Approved from last page
-            sold_to = self._find_latest_approved_from_last_page(max_pages_back=MAX_PAGES_BACKWARD)
-            if sold_to:
-                return sold_to
-            # If none found, try next shorter candidate
-            time.sleep(0.3)
+    def _lookup_internal(self, company_name: str) -> LookupResult:
+        plan = SearchPlan(company_name)
+        try:
+            sold_to, term = plan.resolve(self._fetch_rows, self._search_latest_approved)
+        except _SearchFormUnavailable:
+            return LookupResult(None, None, False)
+        # Not found: sold_to is None and the Excel cell stays empty
+        return LookupResult(sold_to, term, True)
+
+    def _fetch_rows(self, search: Search) -> Optional[ResultPage]:
+        """Result rows of search: all of them, or the first page sorted newest first."""
+        if self.http is not None:
+            page = self._http_search(search)
+            if page is not None:
+                return page
+
+        self._submit_search(search)
+        rows = self._get_rows_current_page()
+        if not self._has_next_page():
+            return ResultPage(rows, False)
+        if self._sort_newest_first(rows):
+            return ResultPage(self._get_rows_current_page(), True, newest_first=True)
+        rows = self._get_rows_current_page()   # the order may have changed
+        for _ in range(MAX_PLAN_PAGES - 1):
+            if not self._go_to_next_page():
+                return ResultPage(rows, False)
+            rows.extend(self._get_rows_current_page())
+        if not self._has_next_page():
+            return ResultPage(rows, False)   # exactly MAX_PLAN_PAGES pages
+        return None
 
-        # Fallback: starts with first 1–3 words
-        tokens = self._normalize_company_name(company_name).split()
-        for n in range(1, min(3, len(tokens)) + 1):
-            cand = " ".join(tokens[:n])[:MAX_FIELD_LEN]
-            if not self._switch_to_frame_with_element_kept(
-                ["//input[@title='Enter the value of criterion End Customer Name']"], timeout=WAIT_MED
-            ):
+    def _search_latest_approved(self, search: Search) -> Optional[str]:
+        """Sold-to-Party Name of the most recent Approved registration found by search."""
+        if self.http is not None:
+            page = self._http_search(search)
+            # Pages sorted newest first are read forward; other lists only if they fit on one page
+            for _ in range(MAX_PAGES_BACKWARD + 1):
+                if page is None or (page.has_next_page and not page.newest_first):
+                    break
+                sold_to = latest_approved(page.rows)
+                if sold_to or not page.has_next_page:
+                    return sold_to
+                self.round_trips += 1
+                page = self.http.next_page(search.term, search.operator_code, page)
+            else:
                 return None
+
+        self._submit_search(search)
+        return self._find_latest_approved()
+
+    def _http_search(self, search: Search) -> Optional[ResultPage]:
+        """First result page over HTTP. A response that is not a result list turns
+        HTTP mode off for this session."""
+        self.round_trips += 1
+        page = self.http.search_newest_first(search.term, search.operator_code)
+        if page is None:
+            print("⚠ SAP CRM: HTTP search did not return a result list; using the browser")
+            self.http = None
+        return page
+
+    def _submit_search(self, search: Search) -> None:
+        """Run search in the UI and switch to its results."""
+        value_xpath = "//input[@title='Enter the value of criterion End Customer Name']"
+        if not self._switch_to_frame_with_element_kept([value_xpath], timeout=WAIT_MED):
+            self._form_operator = None
+            raise _SearchFormUnavailable(search.term)
+        self.round_trips += 1
+        # The value is replaced on fill; Clear and the operator are only needed when it changes
+        if self._form_operator != search.operator_code:
             self._click_clear()
-            self._set_operator("starts with", "SW")
-            self._fill_end_customer_name(cand)
-            self._click_search()
+            self._set_operator(OPERATOR_LABELS[search.operator_code], search.operator_code)
+            self._form_operator = search.operator_code
+        self._fill_end_customer_name(search.term)
+        value_input = self.driver.find_element(By.XPATH, value_xpath)
+        # Trigger search (click + Enter fallback if the form did not reload)
+        self._click_search()
+        if not self._wait_for_reload(value_input):
             self._press_enter_in_value_input()
-            self._switch_to_results_frame()
-            self._wait_for_results_ready(timeout=WAIT_MED)
-            sold_to = self._find_latest_approved_from_last_page(max_pages_back=MAX_PAGES_BACKWARD)
-            if sold_to:
-                return sold_to
-            time.sleep(0.3)
 
-        # Not found; leave Excel cell empty
-        return None
+        # Switch to results frame and wait for results
+        self._switch_to_results_frame()
+        self._wait_for_results_ready(timeout=WAIT_MED)
 
     # ---------------- Page interaction helpers ----------------
 
@@ -422,6 +589,14 @@ class SAPCRMLookup:
         except Exception:
             d.execute_script("arguments[0].click();", search_btn)
 
+    def _wait_for_reload(self, element, timeout: int = WAIT_SHORT) -> bool:
+        """True once element is replaced (the search form was submitted)."""
+        try:
+            WebDriverWait(self.driver, timeout).until(EC.staleness_of(element))
+            return True
+        except Exception:
+            return False
+
     def _press_enter_in_value_input(self, timeout: int = 5) -> None:
         """
         Some SAP HTMLB pages trigger search on Enter. Use this as a secondary trigger.
@@ -547,7 +722,7 @@ class SAPCRMLookup:
                     return idx
         return None
 
-    def _get_rows_current_page(self) -> List[Tuple[Optional[datetime], str, str]]:
+    def _get_rows_current_page(self) -> List[ResultRow]:
         if self._no_result_present():
             return []
         try:
@@ -558,10 +733,11 @@ class SAPCRMLookup:
 
         date_col = self._get_header_index(table, ["Registration Date"])
         status_col = self._get_header_index(table, ["Registration Status", "Status"])
-        sold_col = self._get_header_index(table, ["Sold-to-Party Name", "Sold-To Party Name", "Sold-To Party", "Sold-to-Party"])
+        sold_col = self._get_header_index(table, SOLD_TO_HEADERS)
         if not (date_col and status_col and sold_col):
             self._save_current_frame_html("sap_results.html")
             return []
+        customer_col = self._get_header_index(table, CUSTOMER_HEADERS)
 
         rows = []
         for tr in table.find_elements(By.XPATH, ".//tbody/tr[td]"):
@@ -573,15 +749,38 @@ class SAPCRMLookup:
                 status_txt = self._cell_text_js(status_td)
                 sold_txt = self._cell_text_js(sold_td)
                 dt = self._parse_date(date_txt)
-                rows.append((dt, status_txt, sold_txt))
+                customer_txt = None
+                if customer_col:
+                    customer_txt = self._cell_text_js(tr.find_element(By.XPATH, f"./td[{customer_col}]"))
+                rows.append(ResultRow(dt, status_txt, sold_txt, customer_txt))
             except Exception:
                 continue
         return rows
 
+    @staticmethod
+    def _is_disabled(link) -> bool:
+        """Same test as the HTTP result parser: disabled attribute, aria-disabled or a disabled class."""
+        return (link.get_attribute("disabled") is not None
+                or (link.get_attribute("aria-disabled") or "").lower() == "true"
+                or "disabled" in (link.get_attribute("class") or "").lower())
+
+    def _forward_link(self):
+        """The enabled Forward link of the result list, or None on its last page."""
+        try:
+            return next((link for link in self.driver.find_elements(By.XPATH, FORWARD_XPATH)
+                         if not self._is_disabled(link)), None)
+        except Exception:
+            return None
+
+    def _has_next_page(self) -> bool:
+        return self._forward_link() is not None
+
     def _go_to_next_page(self) -> bool:
         d = self.driver
+        fwd = self._forward_link()
+        if fwd is None:
+            return False
         try:
-            fwd = d.find_element(By.XPATH, "//a[normalize-space()='Forward' or normalize-space()='>' or contains(normalize-space(),'Forward')]")
             d.execute_script("arguments[0].scrollIntoView({block:'center'});", fwd)
             try:
                 fwd.click()
@@ -606,6 +805,50 @@ class SAPCRMLookup:
         except Exception:
             return False
 
+    def _sort_newest_first(self, rows: List[ResultRow]) -> bool:
+        """Sort the result list by Registration Date, newest first, on the server.
+
+        rows is the current (unsorted) first page. Returns False if the list
+        could not be sorted that way.
+        """
+        newest = max((row.registration_date for row in rows if row.registration_date), default=None)
+        # The header toggles between ascending and descending (or opens a sort menu)
+        for _ in range(2):
+            try:
+                table = self._find_results_table(timeout=WAIT_SHORT)
+                date_col = self._get_header_index(table, ["Registration Date"])
+                if not date_col:
+                    return False
+                header = table.find_elements(By.XPATH, ".//th")[date_col - 1]
+                target = (header.find_elements(By.XPATH, ".//a") or [header])[0]
+                self.driver.execute_script("arguments[0].click();", target)
+                self._try_click_in_current_context(["//a[normalize-space()='Sort Descending']"], wait_seconds=1)
+                self._wait_for_reload(table)
+                self._wait_for_results_ready(timeout=WAIT_MED)
+            except Exception:
+                return False
+            if is_newest_first(self._get_rows_current_page(), newest):
+                return True
+        return False
+
+    def _find_latest_approved(self) -> Optional[str]:
+        """Most recent Approved Sold-to-Party Name of the current result list.
+
+        The list is sorted newest first so only its first pages are read; if that
+        fails, it is read backwards from the last page.
+        """
+        rows = self._get_rows_current_page()
+        if not self._has_next_page():
+            return latest_approved(rows)
+        if not self._sort_newest_first(rows):
+            return self._find_latest_approved_from_last_page(max_pages_back=MAX_PAGES_BACKWARD)
+
+        for _ in range(MAX_PAGES_BACKWARD + 1):
+            sold_to = latest_approved(self._get_rows_current_page())
+            if sold_to or not self._go_to_next_page():
+                return sold_to
+        return None
+
     def _paginate_to_last_page(self, max_forwards: int = 50) -> None:
         cnt = 0
         while cnt < max_forwards and self._go_to_next_page():
@@ -614,18 +857,12 @@ class SAPCRMLookup:
     def _find_latest_approved_from_last_page(self, max_pages_back: int = MAX_PAGES_BACKWARD) -> Optional[str]:
         self._paginate_to_last_page()
 
-        best_date = None
         best_sold = None
 
         pages_checked = 0
         while pages_checked <= max_pages_back:
             pages_checked += 1
-            rows = self._get_rows_current_page()
-            for dt, status, sold in rows:
-                if status.strip().lower() == "approved" and dt:
-                    if best_date is None or dt > best_date:
-                        best_date = dt
-                        best_sold = sold
+            best_sold = latest_approved(self._get_rows_current_page())
             if best_sold:
                 return best_sold
             if not self._go_to_prev_page():
@@ -633,31 +870,184 @@ class SAPCRMLookup:
 
         return best_sold
 
-    # ---------------- Candidate generation ----------------
-
-    def _normalize_company_name(self, name: str) -> str:
-        if not name:
-            return ""
-        s = str(name)
-        for ch in ("(", ")", "[", "]", "{", "}"):
-            s = s.replace(ch, " ")
-        s = s.strip()
-        tokens = [t for t in s.replace(",", " ").replace(".", " ").split()
-                  if t.lower() not in COMPANY_SUFFIXES]
-        s = " ".join(tokens)
-        s = " ".join(s.split())
-        return s
-
-    def _generate_candidates(self, company: str) -> List[str]:
-        base = self._normalize_company_name(company)
-        if not base:
-            return []
-        tokens = base.split()
-        candidates = [base[:MAX_FIELD_LEN]]
-        # First N words (5 -> 1)
-        max_n = min(5, len(tokens))
-        for n in range(max_n, 0, -1):
-            cand = " ".join(tokens[:n]).strip()
-            if cand and cand[:MAX_FIELD_LEN] not in candidates:
-                candidates.append(cand[:MAX_FIELD_LEN])
-        return candidates
\ No newline at end of file
+
+class SAPCRMLookupPool:
+    """Several SAPCRMLookup browser sessions working through one queue of companies.
+
+    The first session is started visibly so the user can complete SSO; the others
+    reuse its SSO ticket and must end up in server sessions of their own. A worker
+    whose session breaks (frame navigation fails or the driver dies) restarts it;
+    the company goes to a session that has not tried it yet, and is given up once
+    every live session has tried it.
+    """
+
+    def __init__(self, size: int = DEFAULT_POOL_SIZE, headless: bool = False, worker_headless: bool = True,
+                 sold_to_cache: Optional[SoldToCache] = None, http_mode: bool = False, lookup_factory=None):
+        """
+        Args:
+            size: Number of browser sessions.
+            headless: Run the first (login) session headless.
+            worker_headless: Run the additional sessions headless.
+            sold_to_cache: Shared persistent result cache.
+            http_mode: Search over HTTP where possible (see SAPCRMLookup).
+            lookup_factory: Creates a session as lookup_factory(headless); defaults to SAPCRMLookup.
+        """
+        self.size = max(1, size)
+        self.headless = headless
+        self.worker_headless = worker_headless
+        self.sold_to_cache = sold_to_cache
+        self.lookup_factory = lookup_factory or (
+            lambda h: SAPCRMLookup(headless=h, sold_to_cache=sold_to_cache, http_mode=http_mode))
+        self.sessions: List[SAPCRMLookup] = []
+        self._cookies: List[dict] = []
+        self._primary_session_ids: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        primary = self.lookup_factory(self.headless)
+        primary.start()
+        primary.navigate_to_design_registrations()
+        cookies = primary.export_cookies()
+        self._cookies = sso_cookies(cookies)
+        self._primary_session_ids = server_session_ids(cookies)
+        self.sessions = [primary]
+        if self.size > 1 and not self._cookies:
+            print("⚠ SAP CRM: no SSO ticket cookie found; additional sessions must log in on their own")
+
+        for i in range(1, self.size):
+            try:
+                self.sessions.append(self._open_session())
+            except Exception as e:
+                print(f"⚠ SAP CRM: could not open browser session {i + 1} ({e}); continuing with {len(self.sessions)}")
+                break
+        print(f"SAP CRM: {len(self.sessions)} browser session(s) ready")
+
+    def stop(self) -> None:
+        for session in self.sessions:
+            session.stop()
+        self.sessions = []
+
+    def _open_session(self) -> SAPCRMLookup:
+        session = self.lookup_factory(self.worker_headless)
+        session.start()
+        try:
+            session.import_cookies(self._cookies)
+            session.navigate_to_design_registrations()
+            if server_session_ids(session.export_cookies()) & self._primary_session_ids:
+                raise RuntimeError("session shares the login session's server-side session")
+        except Exception:
+            session.stop()
+            raise
+        return session
+
+    def _recover(self, session: SAPCRMLookup) -> Optional[SAPCRMLookup]:
+        """Back to the search page, or a fresh session if that fails (None if both fail)."""
+        try:
+            session.navigate_to_design_registrations()
+            return session
+        except Exception:
+            pass
+        session.stop()
+        try:
+            return self._open_session()
+        except Exception as e:
+            print(f"⚠ SAP CRM: browser session could not be restarted ({e})")
+            return None
+
+    def lookup_many(self, companies: List[str], report=None) -> Dict[str, Optional[str]]:
+        """Sold-to-Party Name per company (in the order given), looked up in parallel.
+
+        report(company, sold_to) is called (serialized) as each result arrives.
+        Companies that no session could look up are returned as None.
+        """
+        if not self.sessions:
+            raise RuntimeError("Pool not started.")
+        companies = list(dict.fromkeys(companies))
+        pending: List[str] = list(companies)
+        tried: Dict[str, Set[int]] = {company: set() for company in companies}
+        attempts: Dict[str, int] = {company: 0 for company in companies}
+        alive: Set[int] = set(range(len(self.sessions)))
+        results: Dict[str, Optional[str]] = {}
+        in_flight = [0]
+        round_trips = [0]
+        changed = threading.Condition(self._lock)
+
+        # The helpers below run with the lock held
+        def finish(company: str, sold_to: Optional[str]) -> None:
+            results[company] = sold_to
+            if report is not None:
+                report(company, sold_to or "")
+            if len(results) % 10 == 0:
+                print(f"  Lookups completed: {len(results)}/{len(companies)}")
+
+        def takeable(company: str, index: int) -> bool:
+            if index not in tried[company]:
+                return True
+            return alive == {index} and attempts[company] < SINGLE_SESSION_ATTEMPTS
+
+        def give_up_untakeable() -> None:
+            for company in list(pending):
+                if not any(takeable(company, i) for i in alive):
+                    pending.remove(company)
+                    finish(company, None)
+
+        def worker(index: int) -> None:
+            session = self.sessions[index]
+            while True:
+                with changed:
+                    while True:
+                        company = next((c for c in pending if takeable(c, index)), None)
+                        if company is not None or (not pending and not in_flight[0]):
+                            break
+                        changed.wait()
+                    if company is None:
+                        return
+                    pending.remove(company)
+                    tried[company].add(index)
+                    attempts[company] += 1
+                    in_flight[0] += 1
+
+                trips = session.round_trips
+                try:
+                    result = session.lookup_result(company)
+                    failed = not result.completed
+                except Exception:
+                    result, failed = None, True
+
+                with changed:
+                    round_trips[0] += session.round_trips - trips
+                    in_flight[0] -= 1
+                    if failed:
+                        pending.append(company)
+                    else:
+                        finish(company, result.sold_to)
+                    changed.notify_all()
+                if not failed:
+                    continue
+
+                session = self._recover(session)
+                with changed:
+                    if session is None:
+                        alive.discard(index)
+                    else:
+                        self.sessions[index] = session
+                    give_up_untakeable()
+                    changed.notify_all()
+                if session is None:
+                    return
+
+        threads = [threading.Thread(target=worker, args=(i,), name=f"sap-crm-{i + 1}")
+                   for i in range(len(self.sessions))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Left over only if every session died
+        with changed:
+            for company in pending:
+                finish(company, None)
+        if companies:
+            print(f"SAP CRM: {round_trips[0]} searches for {len(companies)} companies"
+                  f" ({round_trips[0] / len(companies):.1f} per company)")
+        return {company: results.get(company) for company in companies}
@@ -0,0 +1,276 @@
+"""
+SAP CRM HTTP Search
+Runs Design Registration searches as plain HTTP requests with the cookies of an
+authenticated browser session, and parses the result list with html.parser.
+"""
+import re
+from datetime import datetime
+from html.parser import HTMLParser
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+try:
+    import requests
+    HAS_WEB = True
+except Exception:
+    HAS_WEB = False
+
+DEFAULT_TIMEOUT = 15.0
+
+# htmlbSubmitLib('htmlb', this, '<event type>', '<form id>', '<object id>', '<event id>', <param count>)
+_SUBMIT_RE = re.compile(
+    r"htmlbSubmitLib\(\s*'[^']*'\s*,\s*this\s*,\s*'([^']*)'\s*,\s*'([^']*)'\s*,\s*'([^']*)'\s*,\s*'([^']*)'\s*,\s*(\d+)"
+)
+
+DATE_FORMATS = ("%d.%m.%Y", "%d/%m/%Y", "%d-%m-%Y", "%Y-%m-%d")
+
+CUSTOMER_HEADERS = ["End Customer Name", "End Customer"]
+SOLD_TO_HEADERS = ["Sold-to-Party Name", "Sold-To Party Name", "Sold-To Party", "Sold-to-Party"]
+
+
+class ResultRow(NamedTuple):
+    registration_date: Optional[datetime]
+    status: str
+    sold_to: str
+    customer: Optional[str] = None   # End Customer Name (None if the list has no such column)
+
+
+class SearchTemplate(NamedTuple):
+    """The search form as the browser would submit it."""
+    action: str                      # absolute URL the form posts to
+    fields: List[Tuple[str, str]]    # form fields in document order
+    value_field: str                 # name of the End Customer Name value input
+    operator_field: str              # name of the hidden operator key input ("CP", "SW", ...)
+    search_onclick: str = ""         # onclick of the Search link (HTMLB event to fire)
+
+
+class ResultPage(NamedTuple):
+    rows: List[ResultRow]
+    has_next_page: bool
+    sort_event: str = ""         # onclick of the Registration Date header (sorts the list)
+    newest_first: bool = False   # rows are known to be sorted by Registration Date, newest first
+    next_event: str = ""         # onclick of the Forward link
+
+
+def parse_date(text: str) -> Optional[datetime]:
+    text = (text or "").strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def _normalize_header(text: str) -> str:
+    return " ".join((text or "").strip().lower().split())
+
+
+def header_index(headers: List[str], candidates: List[str]) -> Optional[int]:
+    """0-based index of the first header matching a candidate (exact, then partial)."""
+    normalized = [_normalize_header(h) for h in headers]
+    wanted = [_normalize_header(c) for c in candidates]
+    for i, text in enumerate(normalized):
+        if text in wanted:
+            return i
+    for i, text in enumerate(normalized):
+        if text and any(c in text or text in c for c in wanted):
+            return i
+    return None
+
+
+class _ResultListParser(HTMLParser):
+    """Collects the tables (header texts and body row texts) and the paging links of a page."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.tables: List[Dict[str, list]] = []
+        self.has_forward = False
+        self.forward_event = ""
+        self.no_result = False
+        self._stack: List[Dict[str, list]] = []
+        self._row: Optional[List[str]] = None
+        self._cell: Optional[List[str]] = None
+        self._cell_is_header = False
+        self._cell_onclick = ""
+        self._link: Optional[List[str]] = None
+        self._link_disabled = False
+        self._link_onclick = ""
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "table":
+            self._stack.append({"headers": [], "rows": []})
+        elif tag == "tr" and self._stack:
+            self._row = []
+        elif tag in ("td", "th") and self._row is not None:
+            self._cell = []
+            self._cell_is_header = tag == "th"
+            self._cell_onclick = attrs.get("onclick") or ""
+        elif tag == "a":
+            if self._cell is not None and self._cell_is_header and not self._cell_onclick:
+                self._cell_onclick = attrs.get("onclick") or ""
+            self._link = []
+            self._link_onclick = attrs.get("onclick") or ""
+            self._link_disabled = ("disabled" in attrs or attrs.get("aria-disabled") == "true"
+                                   or "disabled" in (attrs.get("class") or "").lower())
+
+    def handle_endtag(self, tag):
+        if tag in ("td", "th") and self._cell is not None and self._row is not None:
+            text = " ".join("".join(self._cell).split())
+            self._row.append(("th" if self._cell_is_header else "td", text, self._cell_onclick))
+            self._cell = None
+        elif tag == "tr" and self._row is not None and self._stack:
+            table = self._stack[-1]
+            if any(kind == "th" for kind, _, _ in self._row) and not table["headers"]:
+                table["headers"] = [text for _, text, _ in self._row]
+                table["header_events"] = [onclick for _, _, onclick in self._row]
+            elif any(kind == "td" for kind, _, _ in self._row):
+                table["rows"].append([text for _, text, _ in self._row])
+            self._row = None
+        elif tag == "table" and self._stack:
+            self.tables.append(self._stack.pop())
+        elif tag == "a" and self._link is not None:
+            text = "".join(self._link).strip()
+            if (text == ">" or "forward" in text.lower()) and not self._link_disabled:
+                self.has_forward = True
+                self.forward_event = self._link_onclick
+            self._link = None
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell.append(data)
+        if self._link is not None:
+            self._link.append(data)
+        if "No result found" in data:
+            self.no_result = True
+
+
+def parse_result_page(html: str) -> Optional[ResultPage]:
+    """Rows of the Design Registration result list, or None if the page has no result list."""
+    parser = _ResultListParser()
+    parser.feed(html)
+    parser.close()
+
+    for table in parser.tables:
+        headers = table["headers"]
+        date_col = header_index(headers, ["Registration Date"])
+        if date_col is None:
+            continue
+        status_col = header_index(headers, ["Registration Status", "Status"])
+        sold_col = header_index(headers, SOLD_TO_HEADERS)
+        if status_col is None or sold_col is None:
+            return None
+        customer_col = header_index(headers, CUSTOMER_HEADERS)
+        rows = []
+        for cells in table["rows"]:
+            if len(cells) > max(date_col, status_col, sold_col, customer_col or 0):
+                customer = cells[customer_col] if customer_col is not None else None
+                rows.append(ResultRow(parse_date(cells[date_col]), cells[status_col], cells[sold_col], customer))
+        return ResultPage(rows, parser.has_forward, table["header_events"][date_col],
+                          next_event=parser.forward_event)
+
+    return ResultPage([], False) if parser.no_result else None
+
+
+def latest_approved(rows: List[ResultRow]) -> Optional[str]:
+    """Sold-to-Party Name of the most recent Approved registration among rows."""
+    best_date, best_sold = None, None
+    for row in rows:
+        dt = row.registration_date
+        if row.status.strip().lower() == "approved" and dt and (best_date is None or dt > best_date):
+            best_date, best_sold = dt, row.sold_to
+    return best_sold
+
+
+def is_newest_first(rows: List[ResultRow], newest: Optional[datetime] = None) -> bool:
+    """Whether rows are in descending Registration Date order, starting at the newest
+    date known to be in the list (if given)."""
+    dates = [row.registration_date for row in rows if row.registration_date]
+    if not dates or (newest is not None and dates[0] < newest):
+        return False
+    return all(a >= b for a, b in zip(dates, dates[1:]))
+
+
+class SAPHttpSearch:
+    """Submit the captured Design Registration search form over HTTP."""
+
+    def __init__(self, template: SearchTemplate, cookies: List[dict] = (), timeout: float = DEFAULT_TIMEOUT,
+                 session=None):
+        """
+        Args:
+            template: Search form captured from the browser (SAPCRMLookup.capture_search_template).
+            cookies: Browser cookies (WebDriver.get_cookies() format).
+            timeout: Request timeout in seconds.
+            session: requests.Session to use (one is created if None).
+        """
+        if session is None and not HAS_WEB:
+            raise RuntimeError("requests is not installed")
+        self.template = template
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        for cookie in cookies:
+            self.session.cookies.set(cookie["name"], cookie["value"],
+                                     domain=cookie.get("domain"), path=cookie.get("path", "/"))
+
+    def form_data(self, term: str, operator_code: str, onclick: Optional[str] = None) -> List[Tuple[str, str]]:
+        """Form fields for one search: the criterion set and the Search event fired
+        (or the HTMLB event of onclick, e.g. a column header)."""
+        event: Dict[str, str] = {}
+        match = _SUBMIT_RE.search(self.template.search_onclick if onclick is None else onclick)
+        if match:
+            event_type, form_id, object_id, event_id, count = match.groups()
+            event = {
+                "onInputProcessing": "htmlb",
+                "htmlbevt_ty": event_type,
+                "htmlbevt_frm": form_id,
+                "htmlbevt_oid": object_id,
+                "htmlbevt_id": event_id,
+                "htmlbevt_cnt": count,
+            }
+        overrides = {self.template.value_field: term, self.template.operator_field: operator_code, **event}
+
+        data = []
+        for name, value in self.template.fields:
+            if name in overrides:
+                value = overrides.pop(name)
+            data.append((name, value))
+        data.extend(overrides.items())
+        return data
+
+    def search(self, term: str, operator_code: str = "CP") -> Optional[ResultPage]:
+        """First result page for term, or None if the response is not a result list
+        (e.g. the session expired or the page layout changed)."""
+        return self._post(self.form_data(term, operator_code))
+
+    def search_newest_first(self, term: str, operator_code: str = "CP") -> Optional[ResultPage]:
+        """Like search(), but a result list with more pages is sorted by Registration
+        Date on the server (newest_first is set if that worked)."""
+        page = self.search(term, operator_code)
+        if page is None or not page.has_next_page or not page.sort_event:
+            return page
+        newest = max((row.registration_date for row in page.rows if row.registration_date), default=None)
+        # The header toggles between ascending and descending
+        for _ in range(2):
+            sorted_page = self._post(self.form_data(term, operator_code, page.sort_event))
+            if sorted_page is None:
+                return page
+            if is_newest_first(sorted_page.rows, newest):
+                return sorted_page._replace(newest_first=True)
+            page = sorted_page if sorted_page.sort_event else page
+        return page
+
+    def next_page(self, term: str, operator_code: str, page: ResultPage) -> Optional[ResultPage]:
+        """The result page after page (None if there is none or it could not be read)."""
+        if not page.has_next_page or not page.next_event:
+            return None
+        following = self._post(self.form_data(term, operator_code, page.next_event))
+        return following._replace(newest_first=page.newest_first) if following is not None else None
+
+    def _post(self, data: List[Tuple[str, str]]) -> Optional[ResultPage]:
+        try:
+            response = self.session.post(self.template.action, data=data, timeout=self.timeout)
+            if response.status_code != 200:
+                return None
+            return parse_result_page(response.text)
+        except Exception:
+            return None
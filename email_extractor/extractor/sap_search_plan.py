@@ -0,0 +1,125 @@
+"""
+SAP Search Plan
+Answers the candidate searches of a company ("contains" the full name and its
+shorter prefixes, then "starts with" its first words) from as few SAP queries
+as possible: one broad "contains" query on the most distinctive word, with each
+candidate matched locally against the End Customer Name of the returned rows.
+Legal forms, titles, generic words and initials are never used as broad queries.
+Rows are either the complete result list or its newest registrations first.
+"""
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from .canonical import COMPANY_SUFFIX_SET, GENERIC_COMPANY_WORDS, canonicalize
+from .sap_http import ResultPage, latest_approved
+
+MAX_FIELD_LEN = 40
+
+CONTAINS = "CP"
+STARTS_WITH = "SW"
+OPERATOR_LABELS = {CONTAINS: "contains", STARTS_WITH: "starts with"}
+
+# Broad queries shorter than this match a large part of SAP ("H", "Dr")
+MIN_BROAD_WORD_LENGTH = 3
+# Legal forms not stripped by canonicalize() and name titles; too common to search for
+NON_DISTINCTIVE_WORDS = COMPANY_SUFFIX_SET | GENERIC_COMPANY_WORDS | frozenset({
+    "spa", "sas", "sarl", "sl", "sro", "spzoo", "oy", "ab", "as", "aps", "kk", "kft", "doo", "pte", "pty",
+    "pvt", "llp", "lp", "ug", "ev", "mbh", "dr", "ing", "prof", "dipl", "hc",
+})
+
+
+class Search(NamedTuple):
+    term: str
+    operator_code: str   # CONTAINS or STARTS_WITH
+
+
+def candidate_searches(company: str) -> List[Search]:
+    """Searches in priority order: contains the full name and its first 5..1 words,
+    then starts with the first 1..3 words."""
+    base = canonicalize(company).search
+    if not base:
+        return []
+    tokens = base.split()
+    searches = [Search(base[:MAX_FIELD_LEN], CONTAINS)]
+    for n in range(min(5, len(tokens)), 0, -1):
+        search = Search(" ".join(tokens[:n])[:MAX_FIELD_LEN], CONTAINS)
+        if search not in searches:
+            searches.append(search)
+    for n in range(1, min(3, len(tokens)) + 1):
+        searches.append(Search(" ".join(tokens[:n])[:MAX_FIELD_LEN], STARTS_WITH))
+    return searches
+
+
+def _fold(text: Optional[str]) -> str:
+    return " ".join((text or "").casefold().split())
+
+
+def is_distinctive(word: str) -> bool:
+    """Whether word narrows a "contains" search enough to be used as a broad query."""
+    folded = canonicalize(word).compact
+    return len(folded) >= MIN_BROAD_WORD_LENGTH and folded not in NON_DISTINCTIVE_WORDS
+
+
+def matches(search: Search, customer: Optional[str]) -> bool:
+    """Whether SAP would return a row with this End Customer Name for search."""
+    term, name = _fold(search.term), _fold(customer)
+    return name.startswith(term) if search.operator_code == STARTS_WITH else term in name
+
+
+def covers(broad: Search, search: Search) -> bool:
+    """Whether every row returned for search is also returned for the broad query."""
+    return broad.operator_code == CONTAINS and _fold(broad.term) in _fold(search.term)
+
+
+class SearchPlan:
+    """The candidate searches of one company and the broad queries that cover them.
+
+    The first broad query is "contains" the longest distinctive word of the
+    full name, which covers every candidate that includes it; the second is
+    "contains" the first word, which covers all of them, if that word is
+    distinctive. Candidates no broad query covers are searched one by one.
+    """
+
+    def __init__(self, company: str):
+        self.searches = candidate_searches(company)
+        self.broad: List[Search] = []
+        words = [w for w in self.searches[0].term.split() if is_distinctive(w)] if self.searches else []
+        if words:
+            longest = max(words, key=len)   # earliest of equally long words
+            first = self.searches[0].term.split()[0]
+            for word in (longest, first):
+                query = Search(word[:MAX_FIELD_LEN], CONTAINS)
+                if is_distinctive(word) and query not in self.broad:
+                    self.broad.append(query)
+
+    def resolve(self, fetch_rows: Callable[[Search], Optional[ResultPage]],
+                search_one: Callable[[Search], Optional[str]]) -> Tuple[Optional[str], Optional[str]]:
+        """(Sold-to-Party Name, matching search term) of the first candidate with an
+        Approved registration, or (None, None).
+
+        fetch_rows(query) returns the rows of a broad query: all of them
+        (has_next_page False) or the first of a list sorted newest first, or None
+        if neither could be read. An Approved match among such rows is the
+        candidate's latest; candidates they cannot settle are run one by one with
+        search_one(search), which returns the Sold-to-Party Name.
+        """
+        fetched: Dict[Search, Optional[ResultPage]] = {}
+        for search in self.searches:
+            query = next((q for q in self.broad if covers(q, search)), None)
+            if query is not None and query not in fetched:
+                page = fetch_rows(query)
+                # Rows can only be matched locally if they show the End Customer Name
+                # and are either complete or the newest ones
+                if page is not None and (any(row.customer is None for row in page.rows)
+                                         or (page.has_next_page and not page.newest_first)):
+                    page = None
+                fetched[query] = page
+
+            page = fetched.get(query)
+            sold_to = None
+            if page is not None:
+                sold_to = latest_approved([row for row in page.rows if matches(search, row.customer)])
+            if not sold_to and (page is None or page.has_next_page):
+                sold_to = search_one(search)
+            if sold_to:
+                return sold_to, search.term
+        return None, None
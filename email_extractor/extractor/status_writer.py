@@ -0,0 +1,265 @@
+"""
+Status Writer
+Writes status cells straight into the sheet XML of an .xlsx file, without loading
+the workbook into openpyxl.
+"""
+import os
+import re
+import tempfile
+import zipfile
+from typing import Dict, List, Optional, Tuple
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape, unescape
+
+from openpyxl.utils import column_index_from_string, get_column_letter
+
+_NS = {
+    "main": "http://schemas.openxmlformats.org/spreadsheetml/2006/main",
+    "rel": "http://schemas.openxmlformats.org/package/2006/relationships",
+    "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+}
+
+_ROW_RE = re.compile(r'<row\b[^>]*?\br="(\d+)"[^>]*?(?:/>|>(.*?)</row>)', re.DOTALL)
+_CELL_RE = re.compile(r'<c\b([^>]*?)(?:/>|>(.*?)</c>)', re.DOTALL)
+_ATTR_RE = re.compile(r'\b([\w:]+)="([^"]*)"')
+_REF_RE = re.compile(r"([A-Z]+)(\d+)")
+_TEXT_RE = re.compile(r"<t\b[^>]*>(.*?)</t>", re.DOTALL)
+_VALUE_RE = re.compile(r"<v>(.*?)</v>", re.DOTALL)
+_DIMENSION_RE = re.compile(r'<dimension ref="([A-Z]+\d+):([A-Z]+)(\d+)"')
+_SHEET_DATA_END = "</sheetData>"
+
+
+class StatusWriter:
+    """Collect status-cell updates for an .xlsx file and apply them in one pass.
+
+    Only the rows that change are rewritten in the sheet XML; every other part of
+    the workbook (styles, dropdowns, conditional formatting, other sheets) is
+    copied as is. Values are written as inline strings and keep the cell's style.
+
+    Usage:
+        writer = StatusWriter(path)
+        writer.set_many("Validation", "Form Submission Status", {0: "✓ Success"})
+        writer.save()
+    """
+
+    def __init__(self, xlsx_path):
+        self.path = str(xlsx_path)
+        # (sheet, column) -> {data row index (0 = first row below the header): value}
+        self._updates: Dict[Tuple[str, str], Dict[int, str]] = {}
+        self._create_columns = set()
+
+    def set(self, sheet_name: str, column_name: str, row_index: int, value) -> None:
+        self.set_many(sheet_name, column_name, {row_index: value})
+
+    def set_many(self, sheet_name: str, column_name: str, updates: Dict[int, str],
+                 create_column: bool = False) -> None:
+        """Stage values by data row index; create_column appends the column if it is missing."""
+        self._updates.setdefault((sheet_name, column_name), {}).update(updates)
+        if create_column:
+            self._create_columns.add((sheet_name, column_name))
+
+    def pending(self) -> int:
+        return sum(len(values) for values in self._updates.values())
+
+    def staged(self) -> Dict[Tuple[str, str], Dict[int, str]]:
+        """Copy of the updates that save() would write."""
+        return {key: dict(values) for key, values in self._updates.items()}
+
+    def save(self) -> Dict[Tuple[str, str], int]:
+        """Apply the staged updates atomically; returns the cells written per (sheet, column).
+
+        Raises KeyError for an unknown sheet or a missing column that may not be created.
+        """
+        if not self._updates:
+            return {}
+
+        written: Dict[Tuple[str, str], int] = {}
+        with zipfile.ZipFile(self.path) as zin:
+            sheet_paths = self._sheet_paths(zin)
+            shared_strings: Optional[List[str]] = None
+            patched: Dict[str, str] = {}
+
+            for (sheet_name, column_name), values in self._updates.items():
+                if sheet_name not in sheet_paths:
+                    raise KeyError(f"Sheet '{sheet_name}' not found")
+                part = sheet_paths[sheet_name]
+                xml = patched.get(part)
+                if xml is None:
+                    xml = zin.read(part).decode("utf-8")
+
+                headers = self._headers(xml)
+                if any(cell_type == "s" for _, cell_type, _ in headers.values()) and shared_strings is None:
+                    shared_strings = self._shared_strings(zin)
+                column = self._find_column(headers, column_name, shared_strings or [])
+                if column is None:
+                    if (sheet_name, column_name) not in self._create_columns:
+                        raise KeyError(f"Column '{column_name}' not found in sheet '{sheet_name}'")
+                    column = max(headers, default=0) + 1
+                    xml = self._patch_cells(xml, column, {1: column_name})
+
+                xml = self._patch_cells(xml, column, {index + 2: value for index, value in values.items()})
+                patched[part] = xml
+                written[(sheet_name, column_name)] = len(values)
+
+            tmp_path = self._write_copy(zin, patched)
+
+        # Swap in the patched copy only after the original is closed
+        try:
+            os.replace(tmp_path, self.path)
+        except Exception:
+            os.remove(tmp_path)
+            raise
+
+        self._updates.clear()
+        self._create_columns.clear()
+        return written
+
+    # Workbook structure
+    def _sheet_paths(self, zin: zipfile.ZipFile) -> Dict[str, str]:
+        """Sheet name -> worksheet part path inside the zip."""
+        workbook = ElementTree.fromstring(zin.read("xl/workbook.xml"))
+        rels = ElementTree.fromstring(zin.read("xl/_rels/workbook.xml.rels"))
+        targets = {rel.get("Id"): rel.get("Target") for rel in rels.findall("rel:Relationship", _NS)}
+
+        paths = {}
+        for sheet in workbook.findall("main:sheets/main:sheet", _NS):
+            target = targets.get(sheet.get(f"{{{_NS['r']}}}id"), "")
+            paths[sheet.get("name")] = target.lstrip("/") if target.startswith("/") else f"xl/{target}"
+        return paths
+
+    def _shared_strings(self, zin: zipfile.ZipFile) -> List[str]:
+        if "xl/sharedStrings.xml" not in zin.namelist():
+            return []
+        root = ElementTree.fromstring(zin.read("xl/sharedStrings.xml"))
+        return ["".join(t.text or "" for t in si.iter(f"{{{_NS['main']}}}t"))
+                for si in root.findall("main:si", _NS)]
+
+    def _headers(self, xml: str) -> Dict[int, Tuple[str, str, str]]:
+        """Column index -> (attributes, type, body) of the cells in row 1."""
+        match = _ROW_RE.search(xml)
+        if not match or match.group(1) != "1":
+            return {}
+        headers = {}
+        for cell in _CELL_RE.finditer(match.group(2) or ""):
+            attrs = dict(_ATTR_RE.findall(cell.group(1)))
+            ref = _REF_RE.match(attrs.get("r", ""))
+            if ref:
+                headers[column_index_from_string(ref.group(1))] = (cell.group(1), attrs.get("t", "n"), cell.group(2) or "")
+        return headers
+
+    @staticmethod
+    def _find_column(headers: Dict[int, Tuple[str, str, str]], column_name: str,
+                     shared_strings: List[str]) -> Optional[int]:
+        for col, (_, cell_type, body) in headers.items():
+            if cell_type == "s":
+                value = _VALUE_RE.search(body)
+                text = shared_strings[int(value.group(1))] if value else ""
+            elif cell_type == "inlineStr":
+                text = unescape("".join(_TEXT_RE.findall(body)))
+            else:
+                value = _VALUE_RE.search(body)
+                text = unescape(value.group(1)) if value else ""
+            if text == column_name:
+                return col
+        return None
+
+    # Patching
+    def _patch_cells(self, xml: str, column: int, values: Dict[int, str]) -> str:
+        """Set the given column of the given (1-based) rows, rewriting only those rows."""
+        letter = get_column_letter(column)
+        remaining = dict(values)
+
+        def patch_row(match):
+            row_num = int(match.group(1))
+            if row_num not in remaining:
+                return match.group(0)
+            cell_xml = self._cell_xml(letter, row_num, remaining.pop(row_num))
+            return self._with_cell(match.group(0), match.group(2), column, cell_xml)
+
+        xml = _ROW_RE.sub(patch_row, xml)
+
+        # Rows that do not exist yet are inserted in order
+        for row_num in sorted(remaining):
+            row_xml = f'<row r="{row_num}">{self._cell_xml(letter, row_num, remaining[row_num])}</row>'
+            xml = self._insert_row(xml, row_num, row_xml)
+
+        return self._widen_dimension(xml, column, max(values, default=1))
+
+    @staticmethod
+    def _cell_xml(letter: str, row_num: int, value, style: str = "") -> str:
+        text = "" if value is None else str(value)
+        style_attr = f' s="{style}"' if style else ""
+        if not text:
+            return f'<c r="{letter}{row_num}"{style_attr}/>'
+        return (f'<c r="{letter}{row_num}"{style_attr} t="inlineStr">'
+                f'<is><t xml:space="preserve">{escape(text)}</t></is></c>')
+
+    def _with_cell(self, row_xml: str, body: Optional[str], column: int, cell_xml: str) -> str:
+        """row_xml with cell_xml replacing (or inserted at the position of) the column's cell."""
+        if body is None:  # self-closing <row .../>
+            return row_xml[:-2] + f">{cell_xml}</row>"
+
+        open_tag = row_xml[:row_xml.index(">") + 1]
+        insert_at = len(body)
+        for cell in _CELL_RE.finditer(body):
+            attrs = dict(_ATTR_RE.findall(cell.group(1)))
+            ref = _REF_RE.match(attrs.get("r", ""))
+            if not ref:
+                continue
+            col = column_index_from_string(ref.group(1))
+            if col == column:
+                style = attrs.get("s", "")
+                if style:
+                    cell_xml = cell_xml.replace(f'r="{ref.group(0)}"', f'r="{ref.group(0)}" s="{style}"', 1)
+                body = body[:cell.start()] + cell_xml + body[cell.end():]
+                return f"{open_tag}{body}</row>"
+            if col > column:
+                insert_at = cell.start()
+                break
+        body = body[:insert_at] + cell_xml + body[insert_at:]
+        return f"{open_tag}{body}</row>"
+
+    @staticmethod
+    def _insert_row(xml: str, row_num: int, row_xml: str) -> str:
+        for match in _ROW_RE.finditer(xml):
+            if int(match.group(1)) > row_num:
+                return xml[:match.start()] + row_xml + xml[match.start():]
+        if "<sheetData/>" in xml:
+            return xml.replace("<sheetData/>", f"<sheetData>{row_xml}</sheetData>", 1)
+        end = xml.index(_SHEET_DATA_END)
+        return xml[:end] + row_xml + xml[end:]
+
+    @staticmethod
+    def _widen_dimension(xml: str, column: int, last_row: int) -> str:
+        match = _DIMENSION_RE.search(xml)
+        if not match:
+            return xml
+        max_col = max(column_index_from_string(match.group(2)), column)
+        max_row = max(int(match.group(3)), last_row)
+        ref = f'<dimension ref="{match.group(1)}:{get_column_letter(max_col)}{max_row}"'
+        return xml[:match.start()] + ref + xml[match.end():]
+
+    def _write_copy(self, zin: zipfile.ZipFile, patched: Dict[str, str]) -> str:
+        """Write a copy of the workbook with the patched parts next to the original."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(suffix=".xlsx", dir=directory)
+        os.close(fd)
+        try:
+            with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED) as zout:
+                for info in zin.infolist():
+                    if info.filename in patched:
+                        zout.writestr(info, patched[info.filename].encode("utf-8"))
+                    else:
+                        zout.writestr(info, zin.read(info.filename))
+        except Exception:
+            os.remove(tmp_path)
+            raise
+        return tmp_path
+
+
+def update_status_column(xlsx_path, sheet_name: str, column_name: str, updates: Dict[int, str],
+                         create_column: bool = False) -> int:
+    """Write one status column of one sheet; returns the number of cells written."""
+    writer = StatusWriter(xlsx_path)
+    writer.set_many(sheet_name, column_name, updates, create_column=create_column)
+    return sum(writer.save().values())
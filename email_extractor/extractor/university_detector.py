@@ -2,20 +2,17 @@
 University Detector
 Detects if a lead is from a university or educational institution.
 """
-import re
-import unicodedata
-from typing import Dict
+from typing import Dict, Optional
 import functools
 
-import tldextract
+import pandas as pd
 
-# Optional web check
-try:
-    import requests
-    from bs4 import BeautifulSoup
-    HAS_WEB = True
-except Exception:
-    HAS_WEB = False
+from .batch import text_column
+from .canonical import canonicalize
+from .domain_facts import DomainFacts, domain_facts, email_domain, email_domains
+from .keyword_matcher import PREFIX, WORD, KeywordMatcher
+from .rules import Rule, RulePipeline
+from .web_check import WebsiteChecker
 
 # Expanded academic keywords (EMEA-wide, normalized)
 CORE_ACADEMIC_WORDS = {
@@ -26,6 +23,13 @@ CORE_ACADEMIC_WORDS = {
     "academy", "akademia", "academia", "faculdade", "facultad", "faculte", "fakultaet", "fakultät",
 }
 
+# Word starts that mark academic compounds (Universitätsklinikum, Fachhochschulverbund);
+# a commercial indicator in the same name overrides them (see is_academic)
+ACADEMIC_COMPOUND_STEMS = {
+    "universit", "hochschul", "fachhochschul", "polytechn", "politecnic", "politechni",
+    "akadem", "academ", "fakultat", "fakultaet", "faculdad", "gymnasi",
+}
+
 COMMERCIAL_INDICATORS = {
     "gmbh", "ag", "ltd", "limited", "inc", "corp", "corporation", "llc",
     "consulting", "consultancy", "solutions", "services", "systems",
@@ -33,125 +37,161 @@ COMMERCIAL_INDICATORS = {
     "partners", "international", "global", "worldwide",
 }
 
-ACADEMIC_TLD_HINTS = {".edu"}  # direct .edu
-ACADEMIC_2LD_HINTS = {"ac", "edu", "uni"}  # e.g., ac.uk, edu.eg, uni.rostock.de (heuristic)
+# Legal forms that make a company name commercial
+COMMERCIAL_LEGAL_FORMS = {"gmbh", "ltd", "inc", "llc", "ag"}
+
+ACADEMIC = "academic"
+ACADEMIC_STEM = "academic_stem"
+COMMERCIAL = "commercial"
+LEGAL_FORM = "legal_form"
+
+KEYWORDS = KeywordMatcher(
+    [(word, ACADEMIC, WORD) for word in CORE_ACADEMIC_WORDS] +
+    [(stem, ACADEMIC_STEM, PREFIX) for stem in ACADEMIC_COMPOUND_STEMS] +
+    [(word, COMMERCIAL, WORD) for word in COMMERCIAL_INDICATORS] +
+    [(word, LEGAL_FORM, WORD) for word in COMMERCIAL_LEGAL_FORMS]
+)
+
+UNIVERSITY_RESULT_COLUMNS = ["is_university", "reason", "confidence"]
 
 
 def normalize_text(text: str) -> str:
-    if not text:
-        return ""
-    text = str(text)
-    text = (text
-            .replace("ä", "a").replace("ö", "o").replace("ü", "u")
-            .replace("Ä", "A").replace("Ö", "O").replace("Ü", "U")
-            .replace("ß", "ss"))
-    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
-    text = text.lower()
-    text = re.sub(r"[^a-z0-9]+", " ", text).strip()
-    text = re.sub(r"\s+", " ", text)
-    return text
+    return canonicalize(text).text
 
 
 def extract_domain(email: str) -> str:
-    if not email:
-        return ""
-    m = re.search(r'@([A-Za-z0-9.-]+)$', str(email).strip())
-    return m.group(1).lower() if m else ""
+    return email_domain(email)
+
+
+@functools.lru_cache(maxsize=8192)
+def keyword_categories(text: str) -> frozenset:
+    """Keyword categories (academic, academic_stem, commercial, legal_form) found in text, one scan."""
+    return KEYWORDS.categories(normalize_text(text)) if text else frozenset()
+
+
+def is_academic(categories: frozenset) -> bool:
+    """An academic word, or an academic word start without commercial words
+    ("Universitätsklinikum" but not "Academic Press Ltd")."""
+    return ACADEMIC in categories or (ACADEMIC_STEM in categories and COMMERCIAL not in categories)
 
 
 def contains_core_academic_word(text: str) -> bool:
-    if not text:
-        return False
-    words = set(normalize_text(text).split())
-    return any(w in words for w in CORE_ACADEMIC_WORDS)
+    return is_academic(keyword_categories(text))
 
 
 def has_academic_tld(domain: str) -> bool:
     """Heuristic: .edu; or second-level like ac.uk / edu.xx / uni.xx."""
-    if not domain:
-        return False
-    d = domain.lower()
-    # direct .edu
-    for t in ACADEMIC_TLD_HINTS:
-        if d.endswith(t):
-            return True
-    # second-level patterns like ac.uk / edu.eg
-    parts = d.split(".")
-    if len(parts) >= 3:
-        if parts[-2] in ACADEMIC_2LD_HINTS:
-            return True
-    return False
-
-
-@functools.lru_cache(maxsize=2048)
-def _web_check_is_academic(base_domain: str) -> bool:
-    """Fetch homepage and look for academic keywords (very conservative)."""
-    if not HAS_WEB or not base_domain:
-        return False
-    try:
-        url = f"https://{base_domain}"
-        resp = requests.get(url, timeout=2)
-        if resp.status_code >= 400:
-            return False
-        soup = BeautifulSoup(resp.text, "html.parser")
-        text = " ".join([
-            soup.title.get_text(" ", strip=True) if soup.title else "",
-            " ".join(h.get_text(" ", strip=True) for h in soup.find_all(["h1", "h2"])),
-            " ".join(p.get_text(" ", strip=True) for p in soup.find_all("p")[:2]),
-        ])
-        return contains_core_academic_word(text)
-    except Exception:
-        return False
+    return domain_facts(domain).is_academic_2ld
 
 
 class UniversityDetector:
     """Detect if a lead is from a university or educational institution."""
 
-    def __init__(self, validation_loader=None, enable_web_check: bool = False):
+    def __init__(self, validation_loader=None, enable_web_check: bool = False,
+                 web_checker: Optional[WebsiteChecker] = None):
+        """
+        Args:
+            validation_loader: ValidationDataLoader with academic domains and direct accounts.
+            enable_web_check: Also look at the homepage of otherwise undecided domains.
+            web_checker: Checker to use for the website check (default: a
+                         WebsiteChecker with the persistent verdict cache).
+        """
         self.validation_loader = validation_loader
         self.enable_web_check = enable_web_check
+        self.web_checker = web_checker
+        if enable_web_check and web_checker is None:
+            self.web_checker = WebsiteChecker(contains_core_academic_word)
+        self._web_verdicts: Dict[str, bool] = {}
+        self.rules = self._build_rules()
+
+    def is_university_many(self, companies, countries, emails) -> pd.DataFrame:
+        """Batched is_university over DataFrame columns.
+
+        Each distinct (company, email domain) pair is checked once; country is
+        accepted for signature parity but does not affect the verdict.
+
+        Returns:
+            DataFrame aligned with the input index with columns
+            is_university, reason, confidence, rule.
+        """
+        companies = text_column(companies)
+        emails = text_column(emails, index=companies.index)
+        keys = pd.DataFrame({
+            "company": companies,
+            "domain": email_domains(emails),
+        })
+        if self.enable_web_check:
+            self._prefetch_websites(keys)
+        return self.rules.evaluate_many(keys, UNIVERSITY_RESULT_COLUMNS)
+
+    def _prefetch_websites(self, keys: pd.DataFrame) -> None:
+        """Fetch, in parallel, the homepages the website check will ask for."""
+        domains = set()
+        for company, domain in keys.drop_duplicates().itertuples(index=False, name=None):
+            ctx = self.rules.reaches("website_check", company=company, domain=domain)
+            if ctx is not None and ctx["reg_domain"] and ctx["reg_domain"] not in self._web_verdicts:
+                domains.add(ctx["reg_domain"])
+        if domains:
+            print(f"Checking {len(domains)} websites for academic content...")
+            self._web_verdicts.update(self.web_checker.check_many(domains))
 
     def is_university(self, company: str, country: str, email: str) -> Dict[str, str]:
-        domain = extract_domain(email)
-
-        # Get registered domain (example: mail.cs.ox.ac.uk -> ox.ac.uk)
-        reg_domain = ""
-        if domain:
-            ext = tldextract.extract(domain)
-            if ext.registered_domain:
-                reg_domain = ext.registered_domain.lower()
-
-        # 1) Strong: CSV academic domains
-        if self.validation_loader:
-            if self.validation_loader.is_academic_domain(domain) or \
-               (reg_domain and self.validation_loader.is_academic_domain(reg_domain)):
-                name = self.validation_loader.get_academic_name(domain) or \
-                       self.validation_loader.get_academic_name(reg_domain)
-                reason = f"Academic domain in database: {reg_domain or domain}"
-                if name:
-                    reason += f" ({name})"
-                return {"is_university": True, "reason": reason, "confidence": "high"}
-
+        return self.rules.evaluate(company=company, domain=extract_domain(email))
+
+    def _website_is_academic(self, domain: str) -> bool:
+        verdict = self._web_verdicts.get(domain)
+        if verdict is None:
+            verdict = self._web_verdicts[domain] = self.web_checker.check(domain)
+        return verdict
+
+    def _build_rules(self) -> RulePipeline:
+        """University detection rules, first match wins."""
+        loader = self.validation_loader
+
+        def domain_info(ctx) -> DomainFacts:
+            # Parsed once per domain (example: mail.cs.ox.ac.uk -> ox.ac.uk)
+            return domain_facts(ctx["domain"])
+
+        def in_academic_database(ctx) -> bool:
+            return bool(loader) and (
+                loader.is_academic_domain(ctx["domain"]) or
+                bool(ctx["reg_domain"]) and loader.is_academic_domain(ctx["reg_domain"])
+            )
+
+        def academic_database_outcome(ctx) -> Dict:
+            name = loader.get_academic_name(ctx["domain"]) or loader.get_academic_name(ctx["reg_domain"])
+            reason = f"Academic domain in database: {ctx['site']}"
+            if name:
+                reason += f" ({name})"
+            return {"is_university": True, "reason": reason, "confidence": "high"}
+
+        return RulePipeline("university_detection", [
+            # 1) Strong: CSV academic domains
+            Rule("academic_domain_database", in_academic_database, academic_database_outcome),
             # Direct accounts override
-            if self.validation_loader.is_direct_account(company):
-                return {"is_university": False, "reason": f"Known commercial company: {company}", "confidence": "high"}
-
-        # 2) Heuristic: academic TLDs and 2LDs
-        if has_academic_tld(domain) or (reg_domain and has_academic_tld(reg_domain)):
-            return {"is_university": True, "reason": f"Academic TLD pattern: {reg_domain or domain}", "confidence": "medium"}
-
-        # 3) Company name contains academic keyword
-        if contains_core_academic_word(company):
-            return {"is_university": True, "reason": f"Company name contains academic keyword: {company}", "confidence": "medium"}
-
-        # 4) Optional web check (slow; cached; conservative)
-        if self.enable_web_check and reg_domain and _web_check_is_academic(reg_domain):
-            return {"is_university": True, "reason": f"Website indicates academic institution: {reg_domain}", "confidence": "low"}
-
-        # 5) Commercial indicators reduce likelihood
-        norm_company = normalize_text(company)
-        if any(token in norm_company for token in {"gmbh", "ltd", "inc", "llc", "ag"}):
-            return {"is_university": False, "reason": f"Contains commercial indicators: {company}", "confidence": "medium"}
-
-        # Default: not a university
-        return {"is_university": False, "reason": "No clear university indicators", "confidence": "high"}
\ No newline at end of file
+            Rule("direct_account", lambda c: bool(loader) and loader.is_direct_account(c["company"]),
+                 {"is_university": False, "reason": "Known commercial company: {company}", "confidence": "high"}),
+            # 2) Heuristic: academic TLDs and 2LDs
+            Rule("academic_tld",
+                 lambda c: c["facts"].is_academic_2ld,
+                 {"is_university": True, "reason": "Academic TLD pattern: {site}", "confidence": "medium"}),
+            # 3) Company name contains academic keyword
+            Rule("academic_keyword", lambda c: is_academic(c["keywords"]),
+                 {"is_university": True, "reason": "Company name contains academic keyword: {company}", "confidence": "medium"}),
+            # 4) Optional web check (fetched in parallel by is_university_many; cached on disk; conservative)
+            Rule("website_check",
+                 lambda c: self.enable_web_check and bool(c["reg_domain"]) and self._website_is_academic(c["reg_domain"]),
+                 {"is_university": True, "reason": "Website indicates academic institution: {reg_domain}", "confidence": "low"}),
+            # 5) Commercial indicators reduce likelihood
+            Rule("commercial_indicator",
+                 lambda c: LEGAL_FORM in c["keywords"],
+                 {"is_university": False, "reason": "Contains commercial indicators: {company}", "confidence": "medium"}),
+            # Default: not a university
+            Rule("no_indicators", None,
+                 {"is_university": False, "reason": "No clear university indicators", "confidence": "high"}),
+        ], derived={
+            "facts": domain_info,
+            "reg_domain": lambda c: c["facts"].registered_domain,
+            "site": lambda c: c["reg_domain"] or c["domain"],
+            "keywords": lambda c: keyword_categories(c["company"]),
+        })
@@ -3,18 +3,52 @@ Validation Data Loader
 Loads files containing validation rules for lead processing.
 """
 import os
-from typing import Set, Dict, Optional
+import threading
+from typing import Set, Dict, FrozenSet, NamedTuple, Optional, Tuple
 import pandas as pd
 
+from .batch import text_column
+from .domain_facts import email_domain, email_domains
+from .fuzzy_index import NGramIndex
+from .rules import Rule, RulePipeline
+
+VALIDATION_RESULT_COLUMNS = ["is_valid", "reason", "validation_type"]
+
+VALIDATION_FILE_EXTENSIONS = (".csv", ".xlsx")
+
+# Minimum fuzzy score for a company to be flagged as a possible direct account
+# (only exact matches are rejected as direct accounts)
+DEFAULT_DIRECT_ACCOUNT_THRESHOLD = 0.85
+
+
+class ValidationIndex(NamedTuple):
+    """Immutable snapshot of every validation list; swapped in whole on reload."""
+    academic_domains: FrozenSet[str]
+    academic_domain_names: Dict[str, str]  # domain -> institution name (if provided)
+    excluded_domains: FrozenSet[str]
+    direct_accounts: FrozenSet[str]
+    blacklisted_countries: FrozenSet[str]
+    freemail_domains: FrozenSet[str]
+    direct_account_index: NGramIndex
+
 
 class ValidationDataLoader:
-    """Load and manage validation data from CSV/XLSX files."""
+    """Load and manage validation data from CSV/XLSX files.
 
-    def __init__(self, data_folder: Optional[str] = None):
+    Lookups always read the current ValidationIndex snapshot. load_all() (or the
+    background watcher started with start_watching()) builds a complete new
+    snapshot before swapping it in, so readers never see a half-built list; a file
+    that cannot be read keeps the values of the previous snapshot.
+    """
+
+    def __init__(self, data_folder: Optional[str] = None,
+                 direct_account_threshold: Optional[float] = DEFAULT_DIRECT_ACCOUNT_THRESHOLD):
         """
         Args:
             data_folder: Path to folder containing validation files.
                          If None, resolves to the repo-level 'validation_data' folder.
+            direct_account_threshold: Minimum fuzzy score (0-1) for a company to be flagged
+                         as a possible direct account; None disables fuzzy matching.
         """
         # Resolve default to the project root's validation_data
         if data_folder is None:
@@ -25,38 +59,147 @@ class ValidationDataLoader:
             data_folder = os.path.join(repo_root, "validation_data")
 
         self.data_folder = data_folder
+        self.direct_account_threshold = direct_account_threshold
+        self.version = 0
 
-        self.academic_domains: Set[str] = set()
-        self.academic_domain_names: Dict[str, str] = {}  # domain -> institution name (if provided)
-        self.excluded_domains: Set[str] = set()
-        self.direct_accounts: Set[str] = set()
-        self.blacklisted_countries: Set[str] = set()
-        self.freemail_domains: Set[str] = set()
+        self._index = ValidationIndex(frozenset(), {}, frozenset(), frozenset(), frozenset(), frozenset(),
+                                      NGramIndex([]))
+        self._reload_lock = threading.Lock()
+        self._signature: Tuple = ()
+        self._watcher: Optional[threading.Thread] = None
+        self._stop_watching = threading.Event()
 
         self.load_all()
+        self.rules = self._build_rules()
+
+    # Current snapshot views
+    @property
+    def academic_domains(self) -> FrozenSet[str]:
+        return self._index.academic_domains
+
+    @property
+    def academic_domain_names(self) -> Dict[str, str]:
+        return self._index.academic_domain_names
+
+    @property
+    def excluded_domains(self) -> FrozenSet[str]:
+        return self._index.excluded_domains
+
+    @property
+    def direct_accounts(self) -> FrozenSet[str]:
+        return self._index.direct_accounts
+
+    @property
+    def blacklisted_countries(self) -> FrozenSet[str]:
+        return self._index.blacklisted_countries
+
+    @property
+    def freemail_domains(self) -> FrozenSet[str]:
+        return self._index.freemail_domains
 
     def load_all(self):
-        print(f"Loading validation data from: {self.data_folder}")
+        """Build a fresh snapshot from the data folder and swap it in."""
+        with self._reload_lock:
+            print(f"Loading validation data from: {self.data_folder}")
+            signature = self._file_signature()
+            previous = self._index
+            academic_domains: Set[str] = set()
+            academic_domain_names: Dict[str, str] = {}
+            excluded_domains: Set[str] = set()
+            direct_accounts: Set[str] = set()
+            blacklisted_countries: Set[str] = set()
+            freemail_domains: Set[str] = set()
+            try:
+                self._load_domains("academic_domains", academic_domains, academic_domain_names, previous)
+                self._load_simple("excluded_domains", excluded_domains, previous.excluded_domains)
+                self._load_simple("direct_accounts", direct_accounts, previous.direct_accounts)
+                self._load_simple("blacklisted_countries", blacklisted_countries, previous.blacklisted_countries)
+                self._load_simple("freemail_domains", freemail_domains, previous.freemail_domains)
+
+                print(f"✓ Loaded validation data:")
+                print(f"  - Academic domains: {len(academic_domains)}")
+                print(f"  - Excluded domains: {len(excluded_domains)}")
+                print(f"  - Direct accounts: {len(direct_accounts)}")
+                print(f"  - Blacklisted countries: {len(blacklisted_countries)}")
+                print(f"  - Freemail domains: {len(freemail_domains)}")
+            except Exception as e:
+                print(f"⚠ Warning: Could not load all validation data: {e}")
+                print("  Continuing with available data...")
+
+            self._index = ValidationIndex(
+                academic_domains=frozenset(academic_domains),
+                academic_domain_names=academic_domain_names,
+                excluded_domains=frozenset(excluded_domains),
+                direct_accounts=frozenset(direct_accounts),
+                blacklisted_countries=frozenset(blacklisted_countries),
+                freemail_domains=frozenset(freemail_domains),
+                direct_account_index=NGramIndex(sorted(direct_accounts)),
+            )
+            self._signature = signature
+            self.version += 1
+
+    # Hot reload
+    def start_watching(self, interval: float = 2.0):
+        """Poll the data folder in a daemon thread and reload when a file changes.
+
+        A change is applied once the folder has been stable for one poll, so a
+        file that is still being written is not picked up half-way.
+        """
+        if self._watcher and self._watcher.is_alive():
+            return
+        self._stop_watching.clear()
+        self._watcher = threading.Thread(
+            target=self._watch_loop, args=(interval,), name="validation-data-watcher", daemon=True
+        )
+        self._watcher.start()
+
+    def stop_watching(self):
+        self._stop_watching.set()
+        if self._watcher:
+            self._watcher.join(timeout=5)
+            self._watcher = None
+
+    def _watch_loop(self, interval: float):
+        pending = None
+        while not self._stop_watching.wait(interval):
+            try:
+                current = self._file_signature()
+                if current == self._signature:
+                    pending = None
+                elif current == pending:
+                    print("\nValidation data changed on disk, reloading...")
+                    self.load_all()
+                    pending = None
+                else:
+                    pending = current
+            except Exception as e:
+                print(f"⚠ Warning: Validation data watcher error: {e}")
+
+    def _file_signature(self) -> Tuple:
+        """(name, mtime, size) of every validation file; changes when any file does."""
         try:
-            self._load_domains("academic_domains", self.academic_domains, self.academic_domain_names)
-            self._load_simple("excluded_domains", self.excluded_domains)
-            self._load_simple("direct_accounts", self.direct_accounts)
-            self._load_simple("blacklisted_countries", self.blacklisted_countries)
-            self._load_simple("freemail_domains", self.freemail_domains)
-
-            print(f"✓ Loaded validation data:")
-            print(f"  - Academic domains: {len(self.academic_domains)}")
-            print(f"  - Excluded domains: {len(self.excluded_domains)}")
-            print(f"  - Direct accounts: {len(self.direct_accounts)}")
-            print(f"  - Blacklisted countries: {len(self.blacklisted_countries)}")
-            print(f"  - Freemail domains: {len(self.freemail_domains)}")
-        except Exception as e:
-            print(f"⚠ Warning: Could not load all validation data: {e}")
-            print("  Continuing with available data...")
+            entries = sorted(
+                e for e in os.listdir(self.data_folder) if e.lower().endswith(VALIDATION_FILE_EXTENSIONS)
+            )
+        except OSError:
+            return ()
+        signature = []
+        for name in entries:
+            try:
+                st = os.stat(os.path.join(self.data_folder, name))
+                signature.append((name, st.st_mtime_ns, st.st_size))
+            except OSError:
+                continue
+        return tuple(signature)
 
-    def _load_simple(self, base_name: str, target_set: Set[str]):
-        """Load a CSV/XLSX with 'Option Values' column into a set."""
-        df = self._read_file(base_name)
+    def _load_simple(self, base_name: str, target_set: Set[str], previous: FrozenSet[str] = frozenset()):
+        """Load a CSV/XLSX with 'Option Values' column into a set (previous values if it cannot be read)."""
+        try:
+            df = self._read_file(base_name)
+        except Exception as e:
+            print(f"  ⚠ Error reading {base_name}: {e}; keeping the {len(previous)} values loaded before")
+            target_set.update(previous)
+            return
         if df is None:
             print(f"  ⊘ {base_name}: file not found")
             return
@@ -73,9 +216,18 @@ class ValidationDataLoader:
         )
         target_set.update(values)
 
-    def _load_domains(self, base_name: str, target_set: Set[str], name_map: Dict[str, str]):
+    def _load_domains(self, base_name: str, target_set: Set[str], name_map: Dict[str, str],
+                      previous: Optional[ValidationIndex] = None):
         """Load academic domains with optional institution names (Option Name)."""
-        df = self._read_file(base_name)
+        try:
+            df = self._read_file(base_name)
+        except Exception as e:
+            kept = previous.academic_domains if previous else frozenset()
+            print(f"  ⚠ Error reading {base_name}: {e}; keeping the {len(kept)} values loaded before")
+            if previous:
+                target_set.update(previous.academic_domains)
+                name_map.update(previous.academic_domain_names)
+            return
         if df is None:
             print(f"  ⊘ {base_name}: file not found")
             return
@@ -99,16 +251,17 @@ class ValidationDataLoader:
                     name_map[dom] = name
 
     def _read_file(self, base_name: str) -> Optional[pd.DataFrame]:
-        """Read <base_name>.csv or <base_name>.xlsx from data_folder."""
+        """Read <base_name>.csv or <base_name>.xlsx from data_folder.
+
+        Returns None if neither exists; read errors (e.g. a file locked by Excel or
+        half-written) are raised.
+        """
         csv_path = os.path.join(self.data_folder, f"{base_name}.csv")
         xlsx_path = os.path.join(self.data_folder, f"{base_name}.xlsx")
-        try:
-            if os.path.exists(csv_path):
-                return pd.read_csv(csv_path)
-            if os.path.exists(xlsx_path):
-                return pd.read_excel(xlsx_path)
-        except Exception as e:
-            print(f"  ⊘ Error reading {base_name}: {e}")
+        if os.path.exists(csv_path):
+            return pd.read_csv(csv_path)
+        if os.path.exists(xlsx_path):
+            return pd.read_excel(xlsx_path)
         return None
 
     # Lookups
@@ -117,49 +270,98 @@ class ValidationDataLoader:
         d = (domain or "").strip().lower()
         if not d:
             return False
-        if d in self.academic_domains:
+        academic_domains = self.academic_domains
+        if d in academic_domains:
             return True
         # Suffix match for subdomains: check if any academic domain is a suffix of d
-        return any(d == ad or d.endswith("." + ad) for ad in self.academic_domains)
+        return any(d == ad or d.endswith("." + ad) for ad in academic_domains)
 
     def get_academic_name(self, domain: str) -> str:
         """Return mapped institution name for a domain if known."""
         d = (domain or "").strip().lower()
-        if d in self.academic_domain_names:
-            return self.academic_domain_names[d]
+        names = self.academic_domain_names
+        if d in names:
+            return names[d]
         # Try suffix matches
-        for ad, name in self.academic_domain_names.items():
+        for ad, name in names.items():
             if d.endswith("." + ad):
                 return name
         return ""
 
     def is_excluded_domain(self, domain: str) -> bool:
         d = (domain or "").strip().lower()
-        return d in self.excluded_domains or any(d.endswith("." + ed) for ed in self.excluded_domains)
+        excluded_domains = self.excluded_domains
+        return d in excluded_domains or any(d.endswith("." + ed) for ed in excluded_domains)
 
     def is_direct_account(self, company: str) -> bool:
-        return (company or "").strip().lower() in self.direct_accounts
+        """True only for an exact (normalized) direct account match."""
+        match = self.match_direct_account(company)
+        return match is not None and match[1] >= 1.0
+
+    def match_direct_account(self, company: str) -> Optional[Tuple[str, float]]:
+        """Return (direct account, score) for an exact or fuzzy match, else None."""
+        c = (company or "").strip().lower()
+        if not c:
+            return None
+        index = self._index
+        if c in index.direct_accounts:
+            return c, 1.0
+        threshold = 1.0 if self.direct_account_threshold is None else self.direct_account_threshold
+        return index.direct_account_index.best_match(c, threshold)
 
     def is_blacklisted_country(self, country: str) -> bool:
         return (country or "").strip().lower() in self.blacklisted_countries
 
     def is_freemail_domain(self, domain: str) -> bool:
         d = (domain or "").strip().lower()
-        return d in self.freemail_domains or any(d.endswith("." + fd) for fd in self.freemail_domains)
+        freemail_domains = self.freemail_domains
+        return d in freemail_domains or any(d.endswith("." + fd) for fd in freemail_domains)
 
     def validate_lead(self, company: str, country: str, email: str):
         """Maintains original interface if called from other modules."""
-        domain = ""
-        if email and "@" in email:
-            domain = email.split("@")[-1].lower().strip()
-        if self.is_blacklisted_country(country):
-            return {"is_valid": False, "reason": f"Blacklisted country: {country}", "validation_type": "Country"}
-        if self.is_direct_account(company):
-            return {"is_valid": False, "reason": f"Direct account: {company}", "validation_type": "Direct Account"}
-        if self.is_excluded_domain(domain):
-            return {"is_valid": False, "reason": f"Excluded domain: {domain}", "validation_type": "Excluded Domain"}
-        if self.is_academic_domain(domain):
-            return {"is_valid": False, "reason": f"Academic domain: {domain}", "validation_type": "Academic"}
-        if self.is_freemail_domain(domain):
-            return {"is_valid": True, "reason": f"Freemail provider: {domain}", "validation_type": "Freemail"}
-        return {"is_valid": True, "reason": "", "validation_type": "Valid"}
\ No newline at end of file
+        return self.rules.evaluate(company=company, country=country, domain=email_domain(email))
+
+    def validate_many(self, companies, countries, emails) -> pd.DataFrame:
+        """Batched validate_lead over DataFrame columns.
+
+        Each distinct (company, country, domain) key is evaluated once and the
+        result is broadcast back to every row sharing it.
+
+        Returns:
+            DataFrame aligned with the input index with columns
+            is_valid, reason, validation_type, rule.
+        """
+        companies = text_column(companies)
+        emails = text_column(emails, index=companies.index)
+        keys = pd.DataFrame({
+            "company": companies,
+            "country": text_column(countries, index=companies.index),
+            "domain": email_domains(emails),
+        })
+        return self.rules.evaluate_many(keys, VALIDATION_RESULT_COLUMNS)
+
+    def _build_rules(self) -> RulePipeline:
+        """Lead validation rules, first match wins."""
+        return RulePipeline("lead_validation", [
+            Rule("blacklisted_country", lambda c: self.is_blacklisted_country(c["country"]),
+                 {"is_valid": False, "reason": "Blacklisted country: {country}", "validation_type": "Country"}),
+            Rule("direct_account", lambda c: c["direct_account"] is not None and c["direct_account"][1] >= 1.0,
+                 {"is_valid": False, "reason": "Direct account: {company}", "validation_type": "Direct Account"}),
+            Rule("excluded_domain", lambda c: self.is_excluded_domain(c["domain"]),
+                 {"is_valid": False, "reason": "Excluded domain: {domain}", "validation_type": "Excluded Domain"}),
+            Rule("academic_domain", lambda c: self.is_academic_domain(c["domain"]),
+                 {"is_valid": False, "reason": "Academic domain: {domain}", "validation_type": "Academic"}),
+            Rule("freemail_domain", lambda c: self.is_freemail_domain(c["domain"]),
+                 {"is_valid": True, "reason": "Freemail provider: {domain}", "validation_type": "Freemail"}),
+            # Near matches are only flagged for the reviewer
+            Rule("possible_direct_account", lambda c: c["direct_account"] is not None,
+                 self._possible_direct_account_outcome),
+            Rule("valid", None,
+                 {"is_valid": True, "reason": "", "validation_type": "Valid"}),
+        ], derived={"direct_account": lambda c: self.match_direct_account(c["company"])})
+
+    @staticmethod
+    def _possible_direct_account_outcome(ctx) -> Dict:
+        account, score = ctx["direct_account"]
+        reason = f"Possible direct account: {ctx['company']} (matches {account.upper()}, score {score:.2f})"
+        return {"is_valid": True, "reason": reason, "validation_type": "Possible Direct Account"}
@@ -15,7 +15,8 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import Select
 from selenium.common.exceptions import TimeoutException
-from openpyxl import load_workbook
+
+from .workbook_reader import WorkbookReader
 
 class WebFormAutomation:
     """Automate filling web forms from Excel data."""
@@ -37,6 +38,7 @@ class WebFormAutomation:
             "failed": 0
         }
         self.excel_path = None
+        self.reader = None
         self.status_updates = {}
     
     def start_browser(self):
@@ -95,7 +97,11 @@ class WebFormAutomation:
         print(f"Processing {sheet_name} Sheet")
         print(f"{'='*60}\n")
         
-        df = pd.read_excel(excel_path, sheet_name=sheet_name)
+        self.reader = WorkbookReader(excel_path)
+        df = self.reader.sheet(sheet_name)
+        if df is None:
+            print(f"⊘ Sheet '{sheet_name}' not found, skipping...")
+            return
         total_rows = len(df)
         print(f"Total rows: {total_rows}\n")
         
@@ -112,7 +118,10 @@ class WebFormAutomation:
                 self.stats["skipped"] += 1
                 continue
             
-            link = str(row.get("PreMQL review/validation link", "")).strip()
+            # Prefer the link resolved at extraction time (skips the tracking redirects)
+            link = str(row.get("PreMQL Final URL", "")).strip()
+            if not link.startswith("http"):
+                link = str(row.get("PreMQL review/validation link", "")).strip()
             if not link or link == "nan" or not link.startswith("http"):
                 print(f"⊘ Skipping - Invalid or missing link")
                 self.status_updates[sheet_name][excel_row] = "Skipped - No Link"
@@ -153,27 +162,13 @@ class WebFormAutomation:
         print(f"\nUpdating {sheet_name} sheet in Excel...")
         
         try:
-            wb = load_workbook(self.excel_path)
-            ws = wb[sheet_name]
-            
-            status_col = None
-            for col in range(1, ws.max_column + 1):
-                cell_value = ws.cell(row=1, column=col).value
-                if cell_value == "Form Submission Status":
-                    status_col = col
-                    break
-            
-            if status_col is None:
-                print("  ⊘ Could not find 'Form Submission Status' column")
-                return
-            
-            for excel_row, status in self.status_updates[sheet_name].items():
-                excel_write_row = excel_row + 2
-                ws.cell(row=excel_write_row, column=status_col, value=status)
-            
-            wb.save(self.excel_path)
-            print(f"  ✓ Updated {len(self.status_updates[sheet_name])} rows in Excel")
+            writer = self.reader.status_writer()
+            writer.set_many(sheet_name, "Form Submission Status", self.status_updates[sheet_name])
+            updated = sum(self.reader.save_status(writer).values())
+            print(f"  ✓ Updated {updated} rows in Excel")
             
+        except KeyError:
+            print("  ⊘ Could not find 'Form Submission Status' column")
         except Exception as e:
             print(f"  ✗ Error updating Excel: {e}")
     
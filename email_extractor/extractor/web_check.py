@@ -0,0 +1,139 @@
+"""
+Website Checker
+Concurrent, bounded homepage fetches for the academic website check, with verdicts
+kept in a persistent disk cache.
+"""
+import html
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Optional
+
+from .disk_cache import DiskCache
+
+try:
+    import requests
+    HAS_WEB = True
+except Exception:
+    HAS_WEB = False
+
+DAY = 24 * 60 * 60
+
+WEB_CHECK_NAMESPACE = "web_check"
+
+HOUR = 60 * 60
+
+# Verdict lifetimes: positives rarely change; negatives are retried sooner. Failed
+# fetches (HTTP errors, timeouts) say nothing about the site and are retried next run.
+POSITIVE_TTL = 90 * DAY
+NEGATIVE_TTL = 30 * DAY
+ERROR_TTL = 1 * HOUR
+
+DEFAULT_MAX_BYTES = 64 * 1024
+DEFAULT_TIMEOUT = 2.0
+DEFAULT_WORKERS = 8
+
+# Only the parts of the page the verdict looks at: title, h1/h2 and the first paragraphs
+_TITLE_RE = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+_HEADING_RE = re.compile(r"<h[12][^>]*>(.*?)</h[12]>", re.IGNORECASE | re.DOTALL)
+_PARAGRAPH_RE = re.compile(r"<p(?:\s[^>]*)?>(.*?)</p>", re.IGNORECASE | re.DOTALL)
+_SCRIPT_RE = re.compile(r"<(script|style)[^>]*>.*?</\1>", re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
+def extract_page_text(page: str, paragraphs: int = 2) -> str:
+    """Title, h1/h2 headings and the first paragraphs of an HTML page as plain text."""
+    page = _SCRIPT_RE.sub(" ", page)
+    parts = _TITLE_RE.findall(page)[:1] + _HEADING_RE.findall(page) + _PARAGRAPH_RE.findall(page)[:paragraphs]
+    text = " ".join(_TAG_RE.sub(" ", part) for part in parts)
+    return " ".join(html.unescape(text).split())
+
+
+class WebsiteChecker:
+    """Decide from a domain's homepage whether it looks academic.
+
+    Only the first max_bytes of each page are downloaded. check_many() fetches the
+    domains missing from the cache in parallel; verdicts are cached on disk, so
+    later runs start warm. Failed fetches count as "not academic" but are only
+    cached for ERROR_TTL.
+    """
+
+    def __init__(self, classify: Callable[[str], bool], cache: Optional[DiskCache] = None,
+                 max_workers: int = DEFAULT_WORKERS, max_bytes: int = DEFAULT_MAX_BYTES,
+                 timeout: float = DEFAULT_TIMEOUT, url_template: str = "https://{domain}"):
+        """
+        Args:
+            classify: Verdict on the extracted page text (e.g. academic keyword check).
+            cache: Verdict cache; None uses the default on-disk cache.
+            max_workers: Maximum number of concurrent fetches.
+            max_bytes: Bytes read from each page before giving up on the rest.
+            timeout: Connect/read timeout per request in seconds.
+            url_template: Homepage URL for a domain ("{domain}" is replaced).
+        """
+        self.classify = classify
+        self.cache = cache if cache is not None else DiskCache(WEB_CHECK_NAMESPACE, POSITIVE_TTL)
+        self.max_workers = max_workers
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.url_template = url_template
+        self._local = threading.local()
+
+    def check(self, domain: str) -> bool:
+        """Verdict for one domain (cached)."""
+        return self.check_many([domain]).get(domain, False)
+
+    def check_many(self, domains: Iterable[str]) -> Dict[str, bool]:
+        """Verdicts for several domains; uncached ones are fetched concurrently."""
+        domains = [d for d in dict.fromkeys(domains) if d]
+        verdicts = {domain: bool(value) for domain, value in self.cache.get_many(domains).items()}
+        missing = [d for d in domains if d not in verdicts]
+        if not missing or not HAS_WEB:
+            return verdicts
+
+        workers = max(1, min(self.max_workers, len(missing)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="web-check") as pool:
+            fetched = list(pool.map(self._fetch_verdict, missing))
+
+        by_ttl: Dict[float, Dict[str, bool]] = {}
+        for domain, verdict in zip(missing, fetched):
+            ttl = ERROR_TTL if verdict is None else POSITIVE_TTL if verdict else NEGATIVE_TTL
+            by_ttl.setdefault(ttl, {})[domain] = bool(verdict)
+            verdicts[domain] = bool(verdict)
+        try:
+            for ttl, values in by_ttl.items():
+                self.cache.set_many(values, ttl)
+        except Exception as e:
+            print(f"⚠ Could not store website check results: {e}")
+        return verdicts
+
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def _fetch_verdict(self, domain: str) -> Optional[bool]:
+        """True/False from the page, None if the page could not be read."""
+        page = self.fetch_head(domain)
+        if page is None:
+            return None
+        return bool(self.classify(extract_page_text(page)))
+
+    def fetch_head(self, domain: str) -> Optional[str]:
+        """First max_bytes of the domain's homepage as text, or None on failure
+        (transport error or an HTTP 4xx/5xx answer)."""
+        url = self.url_template.format(domain=domain)
+        try:
+            with self._session().get(url, timeout=self.timeout, stream=True) as resp:
+                if resp.status_code >= 400:
+                    return None
+                chunks = []
+                size = 0
+                for chunk in resp.iter_content(chunk_size=8192):
+                    chunks.append(chunk)
+                    size += len(chunk)
+                    if size >= self.max_bytes:
+                        break
+                return b"".join(chunks)[:self.max_bytes].decode(resp.encoding or "utf-8", errors="replace")
+        except Exception:
+            return None
@@ -0,0 +1,81 @@
+"""
+Workbook Merge
+Merges a re-extraction into the existing output workbook of the same date range,
+matching rows by EntryID.
+"""
+import os
+from typing import Dict, Iterable, List, Optional, Set
+
+import pandas as pd
+
+from .excel_writer import (
+    REVIEW_INPUT_COLUMNS, REVIEW_STATUS_COLUMNS,
+    VALIDATION_INPUT_COLUMNS, VALIDATION_STATUS_COLUMNS,
+)
+
+MERGE_SHEETS = ("Validation", "Review")
+
+# Reviewer inputs and tool-written statuses: always kept from the existing workbook
+PRESERVED_COLUMNS = list(dict.fromkeys(
+    VALIDATION_INPUT_COLUMNS + REVIEW_INPUT_COLUMNS + VALIDATION_STATUS_COLUMNS + REVIEW_STATUS_COLUMNS
+    + ["Status"]
+))
+
+
+# Reviewer inputs per sheet; a row without any (and no submitted form) is still undecided
+SHEET_INPUT_COLUMNS = {"Validation": VALIDATION_INPUT_COLUMNS, "Review": REVIEW_INPUT_COLUMNS}
+
+
+def load_existing(path: str, sheet_names: Iterable[str] = MERGE_SHEETS) -> Dict[str, pd.DataFrame]:
+    """Sheets of an existing output workbook with their cell types (numbers and dates
+    stay typed, EntryID is text, empty cells are NaN)."""
+    if not os.path.exists(path):
+        return {}
+    with pd.ExcelFile(path) as workbook:
+        return {name: workbook.parse(name, dtype={"EntryID": str})
+                for name in sheet_names if name in workbook.sheet_names}
+
+
+def undecided_rows(frame: pd.DataFrame, sheet: str) -> pd.Series:
+    """Rows with no reviewer input and no submitted form."""
+    columns = [c for c in SHEET_INPUT_COLUMNS.get(sheet, []) + ["Form Submission Status"] if c in frame.columns]
+    filled = frame[columns].fillna("").astype(str).apply(lambda col: col.str.strip()).ne("")
+    return ~filled.any(axis=1)
+
+
+def entry_ids(frames: Dict[str, pd.DataFrame]) -> Set[str]:
+    """EntryIDs of all rows in the given sheets."""
+    ids: Set[str] = set()
+    for frame in frames.values():
+        if "EntryID" in frame.columns:
+            ids.update(str(x).strip() for x in frame["EntryID"].dropna() if str(x).strip())
+    return ids
+
+
+def new_emails(emails: List, known_ids: Set[str]) -> List:
+    """Outlook items whose EntryID is not in known_ids."""
+    return [item for item in emails if (getattr(item, "EntryID", "") or "") not in known_ids]
+
+
+def merge_sheet(existing: Optional[pd.DataFrame], new: pd.DataFrame,
+                refreshed: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """Existing rows (in their order) followed by the new rows.
+
+    Args:
+        existing: Sheet read from the existing workbook (None if it had no such sheet).
+        new: Rows extracted in this run; rows whose EntryID is already present are dropped.
+        refreshed: Recomputed columns for the existing rows (same index as existing);
+                   preserved columns are never overwritten.
+    """
+    if existing is None or existing.empty:
+        return new
+    existing = existing.copy()
+    if refreshed is not None:
+        for column in refreshed.columns:
+            if column not in PRESERVED_COLUMNS:
+                existing[column] = refreshed[column]
+
+    if not new.empty and "EntryID" in new.columns:
+        new = new[~new["EntryID"].astype(str).str.strip().isin(entry_ids({"": existing}))]
+    columns = list(existing.columns) + [c for c in new.columns if c not in existing.columns]
+    return pd.concat([existing, new], ignore_index=True).reindex(columns=columns)
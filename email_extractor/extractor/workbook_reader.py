@@ -0,0 +1,106 @@
+"""
+Workbook Reader
+Reads the sheets of a reviewed workbook in one pass and keeps the parsed frames
+cached until the file changes.
+"""
+import os
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+import pandas as pd
+
+from .run_store import record_workbook_statuses
+from .status_writer import StatusWriter
+
+DEFAULT_SHEETS = ("Validation", "Review")
+
+# abspath -> (file signature, {sheet name: frame or None if the sheet is missing})
+_CACHE: Dict[str, Tuple[Tuple, Dict[str, Optional[pd.DataFrame]]]] = {}
+_CACHE_LOCK = threading.Lock()
+
+
+def _signature(path: str) -> Tuple:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class WorkbookReader:
+    """Shared, cached access to the sheets of one workbook.
+
+    All requested sheets are parsed from a single open of the file. Frames are
+    cached per file and reused while the file's mtime and size are unchanged;
+    status updates saved through save_status() are applied to the cached frames
+    as well, so the tools' own writes do not force a re-read.
+
+    A frame's index is the data row index (0 = first row below the header), which
+    is what StatusWriter expects. Treat returned frames as read-only.
+    """
+
+    def __init__(self, path, sheet_names: Iterable[str] = DEFAULT_SHEETS):
+        self.path = os.path.abspath(str(path))
+        self.sheet_names = tuple(sheet_names)
+
+    def sheet(self, name: str) -> Optional[pd.DataFrame]:
+        """Parsed sheet, or None if the workbook has no such sheet."""
+        return self.sheets((name,))[name]
+
+    def sheets(self, names: Optional[Iterable[str]] = None) -> Dict[str, Optional[pd.DataFrame]]:
+        """Several sheets at once (default: the reader's sheet names)."""
+        names = tuple(names or self.sheet_names)
+        signature = _signature(self.path)
+        with _CACHE_LOCK:
+            cached_signature, frames = _CACHE.get(self.path, ((), {}))
+            if cached_signature != signature:
+                frames = {}
+            missing = [n for n in dict.fromkeys(self.sheet_names + names) if n not in frames]
+            if missing:
+                frames = dict(frames)
+                frames.update(self._load(missing))
+                _CACHE[self.path] = (signature, frames)
+        return {name: frames[name] for name in names}
+
+    def _load(self, names) -> Dict[str, Optional[pd.DataFrame]]:
+        """Parse the given sheets from one open of the file."""
+        loaded: Dict[str, Optional[pd.DataFrame]] = {}
+        with pd.ExcelFile(self.path) as workbook:
+            for name in names:
+                loaded[name] = workbook.parse(name) if name in workbook.sheet_names else None
+        return loaded
+
+    def status_writer(self) -> StatusWriter:
+        return StatusWriter(self.path)
+
+    def save_status(self, writer: StatusWriter) -> Dict[Tuple[str, str], int]:
+        """Save the writer's staged updates and mirror them into the cached frames
+        and into the stored run the workbook was exported from."""
+        staged = writer.staged()
+        with _CACHE_LOCK:
+            before = _CACHE.get(self.path)
+            cache_was_current = before is not None and before[0] == _signature(self.path)
+            written = writer.save()
+            self._record_in_run_store(staged)
+            if not cache_was_current:
+                _CACHE.pop(self.path, None)
+                return written
+
+            frames = dict(before[1])
+            for (sheet_name, column_name), values in staged.items():
+                frame = frames.get(sheet_name)
+                if frame is None:
+                    continue
+                frame = frame.copy()
+                if column_name not in frame.columns:
+                    frame[column_name] = pd.Series(dtype=object)
+                frame[column_name] = frame[column_name].astype(object)
+                for index, value in values.items():
+                    if index in frame.index:
+                        frame.at[index, column_name] = value
+                frames[sheet_name] = frame
+            _CACHE[self.path] = (_signature(self.path), frames)
+        return written
+
+    def _record_in_run_store(self, staged) -> None:
+        try:
+            record_workbook_statuses(self.path, staged)
+        except Exception as e:
+            print(f"⚠ Could not record status updates in the run store: {e}")
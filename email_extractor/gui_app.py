@@ -18,6 +18,7 @@ class EmailExtractorGUI:
         self.root = root
         self.root.title("LM Automation - Email Extractor")
         self.root.geometry("900x700")
+        self.validation_loader = None
         
         # Create notebook (tabs)
         self.notebook = ttk.Notebook(root)
@@ -33,6 +34,9 @@ class EmailExtractorGUI:
         self.status_var = tk.StringVar(value="Ready")
         status_bar = ttk.Label(root, textvariable=self.status_var, relief=tk.SUNKEN, anchor=tk.W)
         status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+        
+        # Load validation data in the background and keep it current
+        self.refresh_validation_data(notify=False)
     
     def create_extract_tab(self):
         """Create Extract Emails tab."""
@@ -287,10 +291,37 @@ For help and documentation, see USER_GUIDE.md"""
         self.log_message(self.automate_log, "\nTo run: python automate_forms.py")
         messagebox.showinfo("Info", "Please run automate_forms.py from command line.")
     
-    def refresh_validation_data(self):
-        """Refresh validation data."""
-        messagebox.showinfo("Info", "Validation data will be reloaded on next extraction.")
-        self.log_message(self.extract_log, "Validation data will be refreshed on next run.")
+    def refresh_validation_data(self, notify: bool = True):
+        """Reload validation data now; the watcher keeps it current afterwards."""
+        folder = self.validation_folder_var.get().strip() or "validation_data"
+        if not os.path.isabs(folder):
+            repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            folder = os.path.join(repo_root, folder)
+        
+        def run():
+            try:
+                from extractor.validation_data import ValidationDataLoader
+                loader = self.validation_loader
+                if loader and os.path.normpath(loader.data_folder) == os.path.normpath(folder):
+                    loader.load_all()
+                else:
+                    if loader:
+                        loader.stop_watching()
+                    loader = ValidationDataLoader(folder)
+                    loader.start_watching()
+                    self.validation_loader = loader
+                message = (f"Validation data loaded (v{loader.version}): "
+                           f"{len(loader.direct_accounts)} direct accounts, "
+                           f"{len(loader.academic_domains)} academic domains. "
+                           f"Watching {folder} for changes.")
+                self.root.after(0, lambda: self.log_message(self.extract_log, message))
+                if notify:
+                    self.root.after(0, lambda: messagebox.showinfo("Info", message))
+            except Exception as e:
+                error = f"Error loading validation data: {e}"
+                self.root.after(0, lambda: self.log_message(self.extract_log, error))
+        
+        threading.Thread(target=run, daemon=True).start()
 
 def main():
     """Main entry point."""
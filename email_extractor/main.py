@@ -11,12 +11,57 @@ from extractor.parser import EmailParser
 from extractor.excel_writer import ExcelWriter
 from extractor.email_mover import EmailMover
 from extractor.domain_validator import DomainValidator
+from extractor.dns_check import DomainResolver
+from extractor.redirects import RedirectResolver
 from extractor.university_detector import UniversityDetector
 from extractor.validation_data import ValidationDataLoader
-from extractor.sap_crm import SAPCRMLookup  # <-- NEW
+from extractor.sap_crm import SAPCRMLookupPool
+from extractor.sap_cache import SoldToCache
+from extractor.rules import Rule, RulePipeline, print_rule_stats
+from extractor.run_store import RunStore
+from extractor.lead_history import LeadHistory, describe, find_duplicates
+from extractor.decision_index import CONFIDENCE_COLUMN, DECISION_COLUMNS, DecisionIndex
+from extractor.enrichment import PENDING_MARKER, BackgroundEnrichment
+from extractor.workbook_merge import entry_ids, load_existing, merge_sheet, new_emails, undecided_rows
 
 DEFAULT_FILTERS = ["Pre-MQL ready for review", "Pre-MQL ready for validation"]
 
+SOLD_TO_COLUMN = "Sold-to-Party Name"
+
+# Parallel SAP CRM browser sessions (keep low: each one is a full CRM UI session)
+SAP_BROWSER_SESSIONS = 3
+# Run SAP searches as direct HTTP requests with the browser's login (browser UI as fallback).
+# Off until benchmarks/sap_http_standin.py passes against pages recorded from the real CRM.
+SAP_HTTP_SEARCH = False
+
+# Leads seen before (earlier outputs or earlier in the same run)
+KNOWN_LEAD_STATUS = "Lead Already Known"
+KNOWN_LEAD_REASON = "Lead already known"
+
+# Statuses set by validation that later steps must not overwrite
+PROTECTED_STATUSES = ["University Contact", "Completed", "Academic", "Excluded Domain",
+                      "Direct Account", "Country", "Freemail", KNOWN_LEAD_STATUS]
+
+# Statuses the validation and university checks leave on a row; refreshed on merge while undecided
+CHECK_STATUSES = {"Not Started", "University Contact", "Academic", "Excluded Domain", "Direct Account", "Country"}
+
+# Status overrides; each outcome is the set of column updates to apply to the row
+STATUS_RULES = RulePipeline("status_override", [
+    Rule("protected_status", lambda c: c["status"] in PROTECTED_STATUSES, {}),
+    Rule("email_move_status", lambda c: c["move_status"] is not None,
+         lambda c: {"Status": c["move_status"][0], "Action Taken": c["move_status"][1]}),
+    Rule("no_status", lambda c: not c["status"],
+         {"Status": "Not Started", "Action Taken": "No action taken"}),
+    Rule("keep_status", None, {}),
+])
+
+REVIEW_STATUS_RULES = RulePipeline("review_status_override", [
+    Rule("protected_status", lambda c: c["status"] in PROTECTED_STATUSES, {}),
+    Rule("mass_market", lambda c: "mass market" in c["account_type"].lower(),
+         {"Status": "Mass Market", "Action Taken": "Identified as Mass Market account"}),
+    Rule("keep_status", None, {}),
+])
+
 
 def get_date_label(ranges):
     """Generate filename label from date ranges."""
@@ -67,6 +112,70 @@ def get_unique_path(directory, base_name):
         counter += 1
 
 
+def choose_output_path(output_dir, date_label):
+    """Output workbook for this run and the sheets to merge into it.
+
+    If a workbook for the same dates exists, the user can merge the new emails into
+    it (default) instead of writing a numbered copy.
+    """
+    path = os.path.join(output_dir, f"{date_label}_PreMQL.xlsx")
+    if not os.path.exists(path):
+        return path, {}
+
+    answer = input(f"\n{os.path.basename(path)} exists. Merge new emails into it? [Y/n]: ").strip().lower()
+    if answer not in ("", "y", "yes"):
+        return get_unique_path(output_dir, f"{date_label}_PreMQL"), {}
+    try:
+        existing = load_existing(path)
+    except Exception as e:
+        print(f"⚠ Could not read {os.path.basename(path)} ({e}); writing a new copy instead")
+        return get_unique_path(output_dir, f"{date_label}_PreMQL"), {}
+    print(f"Merging into {os.path.basename(path)} "
+          f"({sum(len(frame) for frame in existing.values())} existing rows)")
+    return path, existing
+
+
+def refresh_computed_columns(existing, domain_validator, parser):
+    """Recompute the domain, validation and university columns of the existing rows of each sheet.
+
+    Returns the recomputed columns per sheet. Status and Action Taken are preserved
+    columns; they are updated here (in place) only for undecided rows whose status
+    came from the checks, so reviewer work and later statuses are kept.
+    """
+    refreshed = {}
+    for name, frame in existing.items():
+        if frame.empty or "Company" not in frame.columns or "Email Address" not in frame.columns:
+            continue
+        leads = frame.reindex(columns=["Company", "Country", "Email Address"]).fillna("").astype(str)
+        results = domain_validator.validate_many(leads["Company"], leads["Email Address"])
+        columns = {
+            "Company Domain Validation": results["status"].values,
+            "Domain Resolvable": results["resolvable"].values,
+        }
+
+        rows = leads.to_dict("records")
+        parser.apply_checks(rows)
+        checked = pd.DataFrame(rows, index=frame.index)
+        for column in ("Validation Status", "Validation Reason"):
+            if column in checked.columns:
+                columns[column] = checked[column].fillna("").values
+        refreshed[name] = pd.DataFrame(columns, index=frame.index)
+
+        if "Status" in frame.columns:
+            blank = pd.Series("", index=frame.index)
+            status = checked.get("Status", blank).fillna("").replace("", "Not Started")
+            action = checked.get("Action Taken", blank).fillna("").where(status != "Not Started", "No action taken")
+            current = frame["Status"].fillna("").astype(str)
+            changed = current.isin(CHECK_STATUSES) & undecided_rows(frame, name) & (current != status)
+            if changed.any():
+                frame["Status"] = frame["Status"].astype(object)
+                frame["Action Taken"] = frame.get("Action Taken", pd.Series("", index=frame.index)).astype(object)
+                frame.loc[changed, "Status"] = status[changed]
+                frame.loc[changed, "Action Taken"] = action[changed]
+                print(f"  {name}: status of {int(changed.sum())} undecided rows updated by the checks")
+    return refreshed
+
+
 def prefill_academic_university(df_validation: pd.DataFrame, df_review: pd.DataFrame):
     """Prefill actions for Academic/University rows."""
     academic_statuses = {"academic", "university contact"}
@@ -84,48 +193,164 @@ def prefill_academic_university(df_validation: pd.DataFrame, df_review: pd.DataF
         df_review.loc[mask_rev, "Move to Folder"] = "Rejected Marketing"
 
 
-def enrich_with_sap_sold_to(df_validation: pd.DataFrame, df_review: pd.DataFrame):
-    """
-    Populate 'Sold-to-Party Name' for all rows with a Company by querying SAP CRM.
-    Applies to both sheets using a single browser session. Best effort (non-fatal on errors).
+def prefill_from_past_decisions(df_validation: pd.DataFrame, df_review: pd.DataFrame,
+                                output_dir: str, validation_loader=None):
+    """Prefill input columns from reviewers' past decisions for the same domain or company.
+
+    Only rows whose input columns are all empty are filled; the 'Prefill Confidence'
+    column records the precedent. Best effort (non-fatal on errors).
     """
+    skip_domain = validation_loader.is_freemail_domain if validation_loader else None
     try:
-        # Collect unique company names across both sheets
-        companies = set()
-        for df in (df_validation, df_review):
-            if df is not None and not df.empty and "Company" in df.columns:
-                companies.update(str(x).strip() for x in df["Company"].dropna() if str(x).strip())
-
-        if not companies:
-            print("\nNo company names to lookup in SAP CRM.")
-            return
+        index = DecisionIndex()
+        indexed = index.refresh(output_dir)
+        if indexed:
+            print(f"Decision index: indexed {indexed} new or changed workbooks")
+        recalls = {name: index.recall(df, name, skip_domain)
+                   for name, df in (("Validation", df_validation), ("Review", df_review)) if not df.empty}
+    except Exception as e:
+        print(f"\n⚠ Decision recall failed (continuing without it): {e}")
+        return
 
-        print(f"\nSAP CRM: Looking up Sold-to-Party Name for {len(companies)} unique company names...")
-        lookup = SAPCRMLookup(headless=False)  # headless=False to allow SSO/UI
-        lookup.start()
+    prefilled = 0
+    for name, df in (("Validation", df_validation), ("Review", df_review)):
+        if name not in recalls:
+            continue
+        columns = DECISION_COLUMNS[name]
+        for column in columns + [CONFIDENCE_COLUMN]:
+            if column not in df.columns:
+                df[column] = ""
+        undecided = df[columns].fillna("").astype(str).apply(lambda col: col.str.strip()).eq("").all(axis=1).tolist()
+        entry_ids = df["EntryID"].fillna("").astype(str).tolist() if "EntryID" in df.columns else [""] * len(df)
+        recorded = {}
+        for position, recall in enumerate(recalls[name]):
+            if recall is None or not undecided[position]:
+                continue
+            row = df.index[position]
+            for column, value in recall.decision.items():
+                df.at[row, column] = value
+            df.at[row, CONFIDENCE_COLUMN] = recall.marker
+            recorded[entry_ids[position]] = recall.decision
+            prefilled += 1
         try:
-            lookup.navigate_to_design_registrations()
-            result_map = {}
-            count = 0
-            for company in sorted(companies):
-                sold_to = lookup.lookup(company)
-                result_map[company] = sold_to or ""
-                count += 1
-                if count % 10 == 0:
-                    print(f"  Lookups completed: {count}/{len(companies)}")
+            index.record_prefills(name, recorded)
+        except Exception as e:
+            print(f"⚠ Could not record prefilled decisions: {e}")
+    index.close()
+
+    if prefilled:
+        print(f"\n✓ Prefilled {prefilled} rows from past reviewer decisions (see '{CONFIDENCE_COLUMN}')")
+
+
+def mark_known_leads(df: pd.DataFrame, output_dir: str):
+    """Flag leads seen in earlier outputs and duplicates within this run.
+
+    Flagged rows get the "Lead already known" reject reason prefilled and are
+    skipped by the SAP enrichment. Rows with a protected status are left alone.
+    Best effort (non-fatal on errors).
+    """
+    try:
+        history = LeadHistory()
+        try:
+            indexed = history.refresh(output_dir)
+            if indexed:
+                print(f"Lead history: indexed {indexed} new or changed sources")
+            known = history.find_known(df)
         finally:
-            lookup.stop()
+            history.close()
+        duplicates = find_duplicates(df)
+    except Exception as e:
+        print(f"\n⚠ Lead history check failed (continuing without it): {e}")
+        return
+
+    statuses = df["Status"].fillna("").astype(str).tolist()
+    received = df["ReceivedTime"].fillna("").astype(str).tolist() if "ReceivedTime" in df.columns else [""] * len(df)
+    notes = {}
+    for i in range(len(df)):
+        if statuses[i] in PROTECTED_STATUSES:
+            continue
+        if known[i] is not None:
+            notes[i] = describe(known[i])
+        elif duplicates[i] is not None:
+            first = received[duplicates[i]]
+            notes[i] = "Lead already known - duplicate in this run" + (f" (first received {first})" if first else "")
+
+    if not notes:
+        return
+    rows = df.index[list(notes)]
+    df.loc[rows, "Status"] = KNOWN_LEAD_STATUS
+    df.loc[rows, "Action Taken"] = list(notes.values())
+    df.loc[rows, "Valid Company → Reject Reason"] = KNOWN_LEAD_REASON
+    df.loc[rows, "Reject Reason"] = KNOWN_LEAD_REASON
+    repeats = sum(1 for i in notes if known[i] is not None)
+    print(f"\n✓ Flagged {len(notes)} known leads ({repeats} from earlier runs, "
+          f"{len(notes) - repeats} duplicates in this run)")
 
-        # Apply results back to DataFrames
-        for df in (df_validation, df_review):
-            if df is not None and not df.empty:
-                df["Sold-to-Party Name"] = df.get("Sold-to-Party Name", "")
-                df["Sold-to-Party Name"] = df["Company"].apply(lambda c: result_map.get(str(c).strip(), "") if pd.notna(c) else "")
 
-        print("SAP CRM: Sold-to-Party Name column populated.")
+def sap_lookup_targets(sheets):
+    """sheet -> company -> data row indexes that still need a Sold-to-Party Name.
 
+    Rows whose email domain does not resolve and already known leads are skipped.
+    """
+    targets = {}
+    for name, df in sheets.items():
+        if df is None or df.empty or "Company" not in df.columns:
+            continue
+        sold_to = df[SOLD_TO_COLUMN].fillna("").astype(str) if SOLD_TO_COLUMN in df.columns else pd.Series("", index=df.index)
+        eligible = sold_to.str.strip().isin(["", PENDING_MARKER])
+        if "Domain Resolvable" in df.columns:
+            eligible &= df["Domain Resolvable"] != "No"
+        if "Status" in df.columns:
+            eligible &= df["Status"] != KNOWN_LEAD_STATUS
+        eligible = eligible.tolist()
+        for position, company in enumerate(df["Company"]):
+            company = str(company).strip() if pd.notna(company) else ""
+            if eligible[position] and company:
+                targets.setdefault(name, {}).setdefault(company, []).append(position)
+    return targets
+
+
+def mark_pending(sheets, targets):
+    """Show the pending marker in the Sold-to-Party Name cells awaiting a lookup."""
+    for name, rows_by_company in targets.items():
+        df = sheets[name]
+        if SOLD_TO_COLUMN not in df.columns:
+            df[SOLD_TO_COLUMN] = ""
+        df[SOLD_TO_COLUMN] = df[SOLD_TO_COLUMN].astype(object)
+        column = df.columns.get_loc(SOLD_TO_COLUMN)
+        for rows in rows_by_company.values():
+            df.iloc[rows, column] = PENDING_MARKER
+
+
+def run_sap_lookups(companies, report):
+    """Look up the Sold-to-Party Name of each company: cached results first (seeded from
+    past workbooks), then SAP CRM for the rest, with up to SAP_BROWSER_SESSIONS parallel
+    browser sessions (SAPCRMLookupPool)."""
+    sold_to_cache = SoldToCache()
+    try:
+        seeded = sold_to_cache.seed_from_workbooks(ensure_output_dir(), skip_values=[PENDING_MARKER])
+        if seeded:
+            print(f"SAP CRM: cached {seeded} Sold-to names from past workbooks")
     except Exception as e:
-        print(f"\nSAP CRM lookup failed (continuing without it): {e}")
+        print(f"⚠ Could not seed the SAP cache from past workbooks: {e}")
+
+    cached = sold_to_cache.get_many(companies)
+    for company, sold_to in cached.items():
+        report(company, sold_to or "")
+    companies = [c for c in companies if c not in cached]
+    print(f"\nSAP CRM: {len(cached)} companies answered from cache, {len(companies)} to look up")
+    if not companies:
+        return
+
+    print(f"SAP CRM: Looking up Sold-to-Party Name for {len(companies)} unique company names...")
+    # The first browser is visible to allow SSO/UI; the others log in with its SSO ticket
+    pool = SAPCRMLookupPool(size=min(SAP_BROWSER_SESSIONS, len(companies)), headless=False,
+                            sold_to_cache=sold_to_cache, http_mode=SAP_HTTP_SEARCH)
+    pool.start()
+    try:
+        pool.lookup_many(sorted(companies), report)
+    finally:
+        pool.stop()
 
 
 def main():
@@ -143,9 +368,9 @@ def main():
 
     # Initialize components
     outlook = OutlookClient()
-    domain_validator = DomainValidator(validation_loader)
+    domain_validator = DomainValidator(validation_loader, domain_resolver=DomainResolver())
     university_detector = UniversityDetector(validation_loader)
-    parser = EmailParser(university_detector, validation_loader)
+    parser = EmailParser(university_detector, validation_loader, redirect_resolver=RedirectResolver())
 
     # Select store and folder
     store = outlook.select_store()
@@ -159,6 +384,11 @@ def main():
     date_input = input("Date(s): ").strip()
     date_ranges = outlook.parse_date_input(date_input)
 
+    # Output workbook (merge into an existing one for the same dates)
+    output_dir = ensure_output_dir()
+    date_label = get_date_label(date_ranges)
+    filename, existing = choose_output_path(output_dir, date_label)
+
     # Get subject filters
     use_default = input("\nUse default subject filters? [Y/n]: ").strip().lower()
     if use_default in ("", "y", "yes"):
@@ -179,8 +409,14 @@ def main():
         print("No matching emails found.")
         return
 
+    if existing:
+        emails = new_emails(emails, entry_ids(existing))
+        if not emails:
+            print("No new emails since the last run; the workbook is up to date.")
+            return
+
     print(f"Found {len(emails)} emails. Parsing...")
-    rows = [parser.parse_email(email) for email in emails]
+    rows = parser.parse_emails(emails)
 
     # Move emails if requested - INITIALIZE status_map BEFORE if statement
     status_map = {}
@@ -201,32 +437,22 @@ def main():
             status_map[i] = ("Not Started", "Email moving was not requested")
 
     # Update rows with status (preserve protected statuses)
-    protected_statuses = ["University Contact", "Completed", "Academic", "Excluded Domain",
-                          "Direct Account", "Country", "Freemail"]
-
     for i, row in enumerate(rows):
-        current_status = row.get("Status", "")
-        if current_status not in protected_statuses:
-            if i in status_map:
-                status, action = status_map[i]
-                row["Status"] = status
-                row["Action Taken"] = action
-            elif not current_status:
-                row["Status"] = "Not Started"
-                row["Action Taken"] = "No action taken"
+        updates = STATUS_RULES.evaluate(status=row.get("Status", ""), move_status=status_map.get(i))
+        updates.pop("rule")
+        row.update(updates)
 
     # Create DataFrame
     df = pd.DataFrame(rows)
 
     # Validate company domains
     print("\nValidating company domains...")
-    validation_results = []
-    for _, row in df.iterrows():
-        company = row.get("Company", "")
-        email = row.get("Email Address", "")
-        result = domain_validator.validate_domain(company, email)
-        validation_results.append(result["status"])
-    df["Company Domain Validation"] = validation_results
+    domain_results = domain_validator.validate_many(df["Company"], df["Email Address"])
+    df["Company Domain Validation"] = domain_results["status"]
+    df["Domain Resolvable"] = domain_results["resolvable"]
+
+    # Flag repeats of earlier leads and duplicates within this run
+    mark_known_leads(df, output_dir)
 
     # Split by subject type
     df_validation = df[df["Subject"].str.contains("validation", case=False, na=False)].copy()
@@ -236,37 +462,66 @@ def main():
         print("No emails matched 'validation' or 'review' subjects.")
         return
 
-    # Prefill actions for Academic/University
+    # Prefill actions for Academic/University, then from past decisions
     prefill_academic_university(df_validation, df_review)
-
-    # Enrich with SAP CRM Sold-to-Party Name for both sheets
-    enrich_with_sap_sold_to(df_validation, df_review)
+    prefill_from_past_decisions(df_validation, df_review, output_dir, validation_loader)
 
     # Mark Mass Market accounts in Review sheet
     if not df_review.empty:
-        mask = df_review["Account Type"].str.contains("mass market", case=False, na=False)
-        mass_market_updated = 0
-        for idx in df_review[mask].index:
-            current_status = df_review.at[idx, "Status"]
-            if current_status not in protected_statuses:
-                df_review.at[idx, "Status"] = "Mass Market"
-                df_review.at[idx, "Action Taken"] = "Identified as Mass Market account"
-                mass_market_updated += 1
+        keys = pd.DataFrame({
+            "status": df_review["Status"].fillna("").astype(str),
+            "account_type": df_review["Account Type"].fillna("").astype(str),
+        })
+        decided = REVIEW_STATUS_RULES.evaluate_many(keys, ["Status", "Action Taken"])
+        mask = decided["rule"] == "mass_market"
+        df_review.loc[mask, ["Status", "Action Taken"]] = decided.loc[mask, ["Status", "Action Taken"]]
+        mass_market_updated = int(mask.sum())
         if mass_market_updated > 0:
             print(f"\n✓ Identified {mass_market_updated} Mass Market accounts in Review sheet")
 
-    # Save to Excel
-    output_dir = ensure_output_dir()
-    date_label = get_date_label(date_ranges)
-    filename = get_unique_path(output_dir, f"{date_label}_PreMQL")
+    # Add the new rows to the existing workbook's rows (inputs and statuses kept)
+    new_rows = len(df_validation) + len(df_review)
+    if existing:
+        refreshed = refresh_computed_columns(existing, domain_validator, parser)
+        df_validation = merge_sheet(existing.get("Validation"), df_validation, refreshed.get("Validation"))
+        df_review = merge_sheet(existing.get("Review"), df_review, refreshed.get("Review"))
+
+    # SAP CRM Sold-to-Party Names are filled in after the workbook is published
+    sheets = {"Validation": df_validation, "Review": df_review}
+    sap_targets = sap_lookup_targets(sheets)
+    mark_pending(sheets, sap_targets)
+
+    # Archive the run, then export it to Excel
+    run_store = RunStore()
+    run_id = run_store.start_run(date_label)
+    run_store.save_sheet(run_id, "Validation", df_validation)
+    run_store.save_sheet(run_id, "Review", df_review)
 
     writer = ExcelWriter()
-    writer.write_workbook(df_validation, df_review, filename)
+    writer.export_run(run_store, run_id, filename)
+    run_store.close()
 
-    print(f"\n✓ Saved to: {filename}")
+    print(f"\n✓ Saved to: {filename}" + (f" ({new_rows} new rows merged)" if existing else ""))
+    print(f"  - Run {run_id} archived in: {run_store.path}")
     print(f"  - Validation sheet: {len(df_validation)} rows")
     print(f"  - Review sheet: {len(df_review)} rows")
 
+    # Phase 2: SAP enrichment patches the published workbook as results arrive
+    if sap_targets:
+        enrichment = BackgroundEnrichment(filename, SOLD_TO_COLUMN, sap_targets, run_sap_lookups,
+                                          label="SAP CRM")
+        print(f"\nThe workbook can be reviewed now; '{SOLD_TO_COLUMN}' shows '{PENDING_MARKER}' "
+              f"until its lookup finishes.")
+        enrichment.start()
+        while not enrichment.join():
+            input(f"\nClose {os.path.basename(filename)} in Excel and press Enter to save the SAP results...")
+            enrichment.save()
+    else:
+        print("\nNo company names to lookup in SAP CRM.")
+
+    print_rule_stats(validation_loader.rules, university_detector.rules, domain_validator.rules,
+                     STATUS_RULES, REVIEW_STATUS_RULES)
+
 
 if __name__ == "__main__":
     try:
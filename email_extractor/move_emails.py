@@ -10,9 +10,10 @@ from typing import Dict, Optional
 from datetime import datetime, timedelta
 
 import pandas as pd
-from openpyxl import load_workbook
 import win32com.client
 
+from extractor.workbook_reader import WorkbookReader
+
 # Canonical names and aliases
 FOLDER_ALIASES = {
     "arrow": ["arrow"],
@@ -200,20 +201,21 @@ class SmartEmailMover:
         print("EMAIL MOVING AUTOMATION")
         print("=" * 60 + "\n")
 
-        for sheet_name in ("Validation", "Review"):
-            try:
-                df = pd.read_excel(excel_path, sheet_name=sheet_name)
-            except Exception:
+        reader = WorkbookReader(excel_path)
+        status_updates: Dict[str, Dict[int, str]] = {}
+        for sheet_name, df in reader.sheets().items():
+            if df is None:
                 print(f"⊘ Sheet '{sheet_name}' not found, skipping...")
                 continue
 
             print(f"\nProcessing {sheet_name} Sheet ({len(df)} rows)")
             print("-" * 60)
-            self._process_sheet(df, sheet_name, source_folder, excel_path)
+            status_updates[sheet_name] = self._process_sheet(df, sheet_name, source_folder)
 
+        self._update_excel_status(reader, status_updates)
         self._print_summary()
 
-    def _process_sheet(self, df: pd.DataFrame, sheet_name: str, source_folder, excel_path: Path):
+    def _process_sheet(self, df: pd.DataFrame, sheet_name: str, source_folder) -> Dict[int, str]:
         status_updates: Dict[int, str] = {}
 
         for index, row in df.iterrows():
@@ -259,32 +261,21 @@ class SmartEmailMover:
                 status_updates[index] = f"Failed - Could not move to {move_to}"
                 self.stats["failed"] += 1
 
-        self._update_excel_status(excel_path, sheet_name, status_updates)
+        return status_updates
 
-    def _update_excel_status(self, excel_path: Path, sheet_name: str, status_updates: Dict[int, str]):
-        if not status_updates:
+    def _update_excel_status(self, reader: WorkbookReader, status_updates: Dict[str, Dict[int, str]]):
+        """Write Email Move Status for all sheets in one pass over the workbook."""
+        writer = reader.status_writer()
+        for sheet_name, updates in status_updates.items():
+            if updates:
+                writer.set_many(sheet_name, "Email Move Status", updates, create_column=True)
+        if not writer.pending():
             return
 
         print("\n  Updating Excel with move status...")
         try:
-            wb = load_workbook(excel_path)
-            ws = wb[sheet_name]
-
-            status_col = None
-            for col in range(1, ws.max_column + 1):
-                if ws.cell(row=1, column=col).value == "Email Move Status":
-                    status_col = col
-                    break
-
-            if status_col is None:
-                status_col = ws.max_column + 1
-                ws.cell(row=1, column=status_col, value="Email Move Status")
-
-            for excel_row, status in status_updates.items():
-                ws.cell(row=excel_row + 2, column=status_col, value=status)
-
-            wb.save(excel_path)
-            print(f"  ✓ Updated {len(status_updates)} rows in Excel")
+            updated = sum(reader.save_status(writer).values())
+            print(f"  ✓ Updated {updated} rows in Excel")
         except Exception as e:
             print(f"  ✗ Error updating Excel: {e}")
 